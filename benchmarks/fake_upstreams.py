@@ -0,0 +1,180 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+from collections import Counter
+from urllib.parse import urlsplit, parse_qs
+from solders.hash import Hash
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+
+def new_mint() -> str:
+    return str(Pubkey.from_bytes(os.urandom(32)))
+
+class FakeUpstreams:
+    """
+    One local HTTP/1.1 server standing in for Jupiter (token list, quote,
+    swap, price), RugCheck, Solana JSON-RPC and the Telegram Bot API.
+
+    Routes live under /jupiter, /rugcheck, /rpc and /telegram. Every request
+    waits `latency` +- `jitter` seconds and fails with `error_rate`
+    probability (HTTP 500, or 429 with retry_after for Telegram). `add_burst`
+    lists new mints on the next token-list request; `pass_rate` is the share
+    of mints RugCheck passes. Quotes report constant-product price impact
+    against a per-mint reserve, so some mints fail the liquidity check.
+    Prices random-walk on every price request.
+    """
+
+    def __init__(self, latency=0.02, jitter=0.01, error_rate=0.0, pass_rate=0.5, initial_tokens=2000, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.pass_rate = pass_rate
+        self.rng = random.Random(seed)
+        self.tokens = [new_mint() for _ in range(initial_tokens)]
+        self.token_list_version = 0
+        self.prices = {}
+        self.requests = Counter()
+        self.errors = Counter()
+        self.server = None
+        self.base_url = None
+        self.handlers = set()
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self.base_url
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            for task in list(self.handlers):
+                task.cancel()
+            await asyncio.gather(*self.handlers, return_exceptions=True)
+            await self.server.wait_closed()
+            self.server = None
+
+    def add_burst(self, n: int) -> list:
+        mints = [new_mint() for _ in range(n)]
+        self.tokens.extend(mints)
+        self.token_list_version += 1
+        return mints
+
+    # --- HTTP plumbing ---
+
+    async def _serve(self, reader, writer):
+        task = asyncio.current_task()
+        self.handlers.add(task)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, target, _ = request_line.split(" ", 2)
+                headers = {}
+                for line in header_lines:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload, extra = await self._route(method, target, headers, body)
+                data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+                lines = [f"HTTP/1.1 {status} {'OK' if status < 400 else 'Error'}",
+                         "Content-Type: application/json", f"Content-Length: {len(data)}"]
+                lines += [f"{name}: {value}" for name, value in extra.items()]
+                writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + data)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.handlers.discard(task)
+            writer.close()
+
+    async def _route(self, method, target, headers, body):
+        url = urlsplit(target)
+        path, query = url.path, {k: v[0] for k, v in parse_qs(url.query).items()}
+        route = path.strip("/").split("/")[0]
+        self.requests[route] += 1
+
+        # Long-polls wait on their own schedule
+        if not path.endswith("/getUpdates"):
+            await asyncio.sleep(max(0.0, self.rng.gauss(self.latency, self.jitter)))
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.errors[route] += 1
+            if route == "telegram":
+                return 429, {"ok": False, "parameters": {"retry_after": 1}}, {}
+            return 500, {"error": "injected failure"}, {}
+
+        if route == "jupiter":
+            return self._jupiter(method, path, query, headers, body)
+        if route == "rugcheck":
+            return self._rugcheck(path)
+        if route == "rpc":
+            return 200, self._rpc(json.loads(body)), {}
+        if route == "telegram":
+            if path.endswith("/getUpdates"):
+                await asyncio.sleep(min(float(query.get("timeout", 0)), 1.0))
+                return 200, {"ok": True, "result": []}, {}
+            return 200, {"ok": True, "result": {}}, {}
+        return 404, {"error": "no route"}, {}
+
+    # --- Upstreams ---
+
+    def _jupiter(self, method, path, query, headers, body):
+        if path.endswith("/tokens"):
+            etag = f'"v{self.token_list_version}"'
+            if headers.get("if-none-match") == etag:
+                return 304, b"", {"ETag": etag}
+            listing = [{"address": mint, "symbol": mint[:4], "decimals": 6} for mint in self.tokens]
+            return 200, listing, {"ETag": etag}
+        if path.endswith("/quote"):
+            amount = int(query.get("amount", 0))
+            # Constant-product impact against a stable per-mint reserve of 1e10..1e13 raw units
+            reserve = 10 ** (10 + hashlib.sha256(query.get("outputMint", "").encode()).digest()[1] % 4)
+            return 200, {
+                "inputMint": query.get("inputMint"),
+                "outputMint": query.get("outputMint"),
+                "inAmount": str(amount),
+                "outAmount": str(amount * 1000),
+                "priceImpactPct": str(amount / (amount + reserve)),
+                "routePlan": [],
+            }, {}
+        if path.endswith("/swap"):
+            return 200, {"swapTransaction": "AQ==", "lastValidBlockHeight": 1000}, {}
+        if path.endswith("/price"):
+            data = {}
+            for mint in query.get("ids", "").split(","):
+                price = self.prices.get(mint, 1e-6) * self.rng.lognormvariate(0.0, 0.05)
+                self.prices[mint] = price
+                data[mint] = {"id": mint, "price": str(price)}
+            return 200, {"data": data}, {}
+        return 404, {"error": "no route"}, {}
+
+    def _rugcheck(self, path):
+        mint = path.split("/")[-2]
+        # Stable per mint, so a cached verdict agrees with a fresh one
+        passed = hashlib.sha256(mint.encode()).digest()[0] < 256 * self.pass_rate
+        return 200, {"score": 50 if passed else 5000, "risks": []}, {}
+
+    def _rpc(self, request):
+        method, params = request.get("method"), request.get("params") or []
+        context = {"slot": 1000, "apiVersion": "1.18.0"}
+        if method == "getBalance":
+            result = {"context": context, "value": 100 * 10**9}
+        elif method == "getLatestBlockhash":
+            result = {"context": context, "value": {"blockhash": str(Hash.new_unique()), "lastValidBlockHeight": 1150}}
+        elif method == "getRecentPrioritizationFees":
+            result = [{"slot": 1000 - i, "prioritizationFee": self.rng.randrange(0, 50_000)} for i in range(150)]
+        elif method == "getSignatureStatuses":
+            status = {"slot": 1000, "confirmations": None, "err": None, "status": {"Ok": None}, "confirmationStatus": "confirmed"}
+            result = {"context": context, "value": [status for _ in params[0]]}
+        elif method == "sendTransaction":
+            result = str(Signature.new_unique())
+        elif method == "getTokenAccountsByOwner":
+            result = {"context": context, "value": []}
+        else:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": -32601, "message": "Method not found"}}
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
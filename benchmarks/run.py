@@ -0,0 +1,299 @@
+"""
+End-to-end benchmarks for BotEngine against local upstream stand-ins.
+
+    python -m benchmarks.run --burst 500 --positions 1000 --latency 0.02 --error-rate 0.01
+
+Runs from the repository root. Every upstream (Jupiter, RugCheck, Solana
+RPC, Telegram) is served by benchmarks.fake_upstreams on 127.0.0.1, and all
+state files go to a temporary directory, so nothing touches the network or
+data/. Scenarios:
+
+  scan    seed the token list, list `--burst` new mints and time scan_cycle.
+          Reports mints screened per second and the p50/p99 decision latency
+          (submit -> rejected or bought) per mint.
+  manage  open `--positions` positions and time `--cycles` runs of
+          manage_positions_cycle (p50/p99 per cycle).
+  memory  heap held by the in-memory position book, per 1k positions.
+
+Each run is written to benchmarks/results/<timestamp>-<commit>.json and
+compared with `--baseline` (or the newest earlier result with the same
+parameters); metrics that moved the wrong way by more than `--threshold`
+are flagged and the exit status is 1.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+from solders.keypair import Keypair
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.config.config import Config
+from src.utils.logger import logger
+from benchmarks.fake_upstreams import FakeUpstreams
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Direction each metric should move: +1 higher is better, -1 lower is better
+METRICS = {
+    "scan_mints_per_sec": 1,
+    "scan_decision_p50_ms": -1,
+    "scan_decision_p99_ms": -1,
+    "manage_cycle_p50_ms": -1,
+    "manage_cycle_p99_ms": -1,
+    "memory_kib_per_1k_positions": -1,
+}
+
+def point_config_at(base_url: str, data_dir: Path):
+    """Route every client to the fakes and every state file to `data_dir`."""
+    from src.clients.jupiter_client import JupiterClient
+    from src.clients.rugcheck_client import RugCheckClient
+
+    JupiterClient.TOKEN_LIST_URL = f"{base_url}/jupiter/tokens"
+    JupiterClient.QUOTE_API_URL = f"{base_url}/jupiter/quote"
+    JupiterClient.PRICE_API_URL = f"{base_url}/jupiter/price"
+    RugCheckClient.BASE_URL = f"{base_url}/rugcheck"
+
+    Config.RPC_URL = f"{base_url}/rpc"
+    Config.SOLANA_PRIVATE_KEY = str(Keypair())
+    Config.TELEGRAM_BOT_TOKEN = "bench"
+    Config.CHAT_ID = "1"
+    Config.TAX_VAULT_ADDRESS = None
+    Config.POOL_DETECTOR_ENABLED = False
+    Config.PRICE_TTL = 0  # Every manage cycle goes to the price API
+    Config.HTTP2_ENABLED = False  # The fakes speak HTTP/1.1
+
+    Config.DATA_DIR = data_dir
+    Config.TRADES_LOG = data_dir / "trades.csv"
+    Config.TRADES_BINARY_LOG = data_dir / "trades.bin"
+    Config.TRADE_STORE_FILE = data_dir / "trades.db"
+    Config.MINT_INDEX_FILE = data_dir / "known_mints.idx"
+    Config.RUGCHECK_CACHE_FILE = data_dir / "rugcheck_cache.json"
+    Config.TAX_LEDGER_FILE = data_dir / "tax_ledger.json"
+
+def build_engine(base_url: str):
+    from src.engine.bot import BotEngine
+    engine = BotEngine()
+    engine.telegram.base_url = f"{base_url}/telegram/bot{engine.telegram.token}"
+    engine.running = True
+    engine.jupiter.open()
+    engine.rugcheck.open()
+    return engine
+
+def percentile_ms(samples, q) -> float:
+    return float(np.percentile(samples, q) * 1000) if len(samples) else 0.0
+
+def track_decisions(engine) -> dict:
+    """
+    Wrap the pipeline stages so each mint's decision time is recorded:
+    from submit until it is rejected (screen or quote) or bought.
+    """
+    submitted, decided = {}, []
+    submit, screen, quote, execute = engine.pipeline.submit, engine.screen_token, engine.quote_token, engine.execute_trade
+
+    def done(mint):
+        started = submitted.pop(mint, None)
+        if started is not None:
+            decided.append(time.perf_counter() - started)
+
+    async def timed_submit(mint):
+        submitted.setdefault(mint, time.perf_counter())
+        return await submit(mint)
+
+    async def timed_screen(mint):
+        ok = False
+        try:
+            ok = await screen(mint)
+            return ok
+        finally:
+            if not ok:
+                done(mint)
+
+    async def timed_quote(mint):
+        order = None
+        try:
+            order = await quote(mint)
+            return order
+        finally:
+            if not order:
+                done(mint)
+
+    async def timed_execute(mint, quote_response, position_size):
+        try:
+            return await execute(mint, quote_response, position_size)
+        finally:
+            done(mint)
+
+    engine.pipeline.submit = timed_submit
+    engine.screen_token = timed_screen
+    engine.quote_token = timed_quote
+    engine.execute_trade = timed_execute
+    return {"decided": decided}
+
+async def bench_scan(fakes, engine, burst: int) -> dict:
+    await engine.scan_cycle()  # First scan only seeds the index
+    tracker = track_decisions(engine)
+    fakes.add_burst(burst)
+
+    started = time.perf_counter()
+    await engine.scan_cycle()
+    elapsed = time.perf_counter() - started
+
+    decided = tracker["decided"]
+    return {
+        "scan_mints_screened": len(decided),
+        "scan_bought": len(engine.positions),
+        "scan_seconds": elapsed,
+        "scan_mints_per_sec": len(decided) / elapsed if elapsed else 0.0,
+        "scan_decision_p50_ms": percentile_ms(decided, 50),
+        "scan_decision_p99_ms": percentile_ms(decided, 99),
+    }
+
+def open_positions(store, count: int, entry_price: float = 1e-6):
+    from benchmarks.fake_upstreams import new_mint
+    for _ in range(count):
+        store.open(new_mint(), {
+            "entry_price": entry_price,
+            "amount": 1_000_000.0,
+            "highest_price": entry_price,
+            "sold_tier_1": False,
+            "sold_tier_2": False,
+            "sold_tier_3": False,
+            "timestamp": time.time(),
+        })
+
+async def bench_manage(engine, positions: int, cycles: int) -> dict:
+    open_positions(engine.store, positions - len(engine.positions))
+    durations = []
+    for _ in range(cycles):
+        started = time.perf_counter()
+        await engine.manage_positions_cycle()
+        durations.append(time.perf_counter() - started)
+    return {
+        "manage_positions_start": positions,
+        "manage_positions_end": len(engine.positions),
+        "manage_cycle_p50_ms": percentile_ms(durations, 50),
+        "manage_cycle_p99_ms": percentile_ms(durations, 99),
+    }
+
+def bench_memory(data_dir: Path, positions: int) -> dict:
+    from src.engine.position_store import PositionStore
+    store = PositionStore(data_dir / "memory_positions.json")
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    open_positions(store, positions)
+    store.flush()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    store.shutdown()
+
+    # Flushed first so journal lines still queued on the writer aren't counted
+    held = sum(stat.size_diff for stat in after.compare_to(before, "filename") if stat.size_diff > 0)
+    return {"memory_kib_per_1k_positions": held / 1024 / positions * 1000}
+
+async def run_benchmarks(args, data_dir: Path) -> dict:
+    fakes = FakeUpstreams(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                          pass_rate=args.pass_rate, initial_tokens=args.initial_tokens, seed=args.seed)
+    base_url = await fakes.start()
+    point_config_at(base_url, data_dir)
+    engine = build_engine(base_url)
+    try:
+        metrics = await bench_scan(fakes, engine, args.burst)
+        metrics.update(await bench_manage(engine, args.positions, args.cycles))
+    finally:
+        await engine.shutdown()
+        await fakes.close()
+    metrics.update(bench_memory(data_dir, args.positions))
+    metrics["upstream_requests"] = dict(fakes.requests)
+    metrics["upstream_errors"] = dict(fakes.errors)
+    return metrics
+
+def git_version() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+def find_baseline(params: dict, exclude: Path = None):
+    """Newest stored result run with the same parameters."""
+    for path in sorted(RESULTS_DIR.glob("*.json"), reverse=True):
+        if path == exclude:
+            continue
+        try:
+            result = json.loads(path.read_text())
+        except Exception:
+            continue
+        if result.get("params") == params:
+            return path, result
+    return None, None
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Rows of (metric, baseline, current, change, regressed)."""
+    rows = []
+    for name, direction in METRICS.items():
+        old, new = baseline["metrics"].get(name), current["metrics"].get(name)
+        if old is None or new is None:
+            continue
+        change = (new - old) / old if old else 0.0
+        rows.append((name, old, new, change, change * direction < -threshold))
+    return rows
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the engine against local fake upstreams.")
+    parser.add_argument("--burst", type=int, default=500, help="New mints listed at once")
+    parser.add_argument("--positions", type=int, default=1000)
+    parser.add_argument("--cycles", type=int, default=20, help="manage_positions_cycle runs")
+    parser.add_argument("--latency", type=float, default=0.02, help="Mean upstream latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.005, help="Latency std dev (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--pass-rate", type=float, default=0.5, help="Share of mints RugCheck passes")
+    parser.add_argument("--initial-tokens", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=RESULTS_DIR)
+    parser.add_argument("--baseline", type=Path, help="Result file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change that counts as a regression")
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--verbose", action="store_true", help="Show engine warnings (injected errors are noisy)")
+    args = parser.parse_args(argv)
+
+    logger.setLevel(logging.WARNING if args.verbose else logging.CRITICAL)
+    params = {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "threshold", "no_save", "verbose")}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        metrics = asyncio.run(run_benchmarks(args, Path(tmp)))
+
+    result = {"version": git_version(), "timestamp": datetime.now().isoformat(), "params": params, "metrics": metrics}
+    print(json.dumps(result, indent=2))
+
+    path = None
+    if not args.no_save:
+        args.output.mkdir(parents=True, exist_ok=True)
+        path = args.output / f"{datetime.now():%Y%m%dT%H%M%S}-{result['version']}.json"
+        path.write_text(json.dumps(result, indent=2))
+        print(f"Saved {path}")
+
+    if args.baseline:
+        baseline_path, baseline = args.baseline, json.loads(args.baseline.read_text())
+    else:
+        baseline_path, baseline = find_baseline(params, exclude=path)
+    if baseline is None:
+        print("No baseline with the same parameters; nothing to compare.")
+        return 0
+
+    print(f"Compared with {baseline_path} ({baseline.get('version')}):")
+    regressed = False
+    for name, old, new, change, bad in compare(result, baseline, args.threshold):
+        regressed |= bad
+        print(f"  {name:32} {old:12.2f} -> {new:12.2f}  {change:+7.1%}{'  REGRESSION' if bad else ''}")
+    return 1 if regressed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
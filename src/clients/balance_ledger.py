@@ -0,0 +1,110 @@
+import time
+from src.config.config import Config
+from src.engine.money_manager import PositionAllocator
+from src.utils.logger import logger
+
+class _Entry:
+    __slots__ = ("amount", "reason", "signature", "created_at", "confirmed_at")
+
+    def __init__(self, amount, reason, signature):
+        self.amount = amount
+        self.reason = reason
+        self.signature = signature
+        self.created_at = time.time()
+        self.confirmed_at = None
+
+class BalanceLedger:
+    """
+    In-process view of the wallet's SOL balance.
+
+    Buys, sells, tax transfers and fees are applied locally as they happen,
+    so sizing a position needs no RPC call. Each change stays pending until
+    its transaction is confirmed (or Config.LEDGER_PENDING_TTL passes without
+    a confirmation). A reconcile replaces the balance with the chain's value
+    plus every change the chain can't have seen yet: changes still pending,
+    and changes confirmed after the balance was requested. Funds for
+    in-flight buys are held by the allocator and excluded from `available`.
+    """
+
+    def __init__(self):
+        self.balance = None  # SOL; None until the first reconcile
+        self.entries = []
+        self.allocator = PositionAllocator()
+        self.last_reconciled = None
+        self.last_drift = 0.0
+
+    @property
+    def synced(self) -> bool:
+        return self.balance is not None
+
+    @property
+    def reserved(self) -> float:
+        return self.allocator.reserved
+
+    @property
+    def available(self) -> float:
+        return max((self.balance or 0.0) - self.reserved, 0.0)
+
+    # --- Reservations for in-flight orders ---
+
+    def reserve_position(self) -> float:
+        """Size a position off the unreserved balance and hold it. 0.0 if too small."""
+        if self.balance is None:
+            return 0.0
+        return self.allocator.reserve(self.balance)
+
+    def release(self, amount: float):
+        self.allocator.release(amount)
+
+    # --- Local changes ---
+
+    def debit(self, amount: float, reason: str, signature: str = None):
+        self._record(-amount, reason, signature)
+
+    def credit(self, amount: float, reason: str, signature: str = None):
+        self._record(amount, reason, signature)
+
+    def _record(self, amount, reason, signature):
+        if self.balance is not None:
+            self.balance += amount
+        self.entries.append(_Entry(amount, reason, signature))
+
+    def pending_signatures(self) -> list:
+        return [e.signature for e in self.entries if e.signature and e.confirmed_at is None]
+
+    def confirm(self, signature: str, failed: bool = False):
+        """Mark a transaction as landed. A failed one is backed out; the next reconcile picks up its fee."""
+        for entry in self.entries:
+            if entry.signature == signature and entry.confirmed_at is None:
+                if failed:
+                    self.entries.remove(entry)
+                    if self.balance is not None:
+                        self.balance -= entry.amount
+                    logger.warning(f"Transaction {signature} failed; backed out {entry.reason} of {entry.amount:+.6f} SOL.")
+                else:
+                    entry.confirmed_at = time.time()
+                return
+
+    # --- Reconciliation ---
+
+    def reconcile(self, chain_balance: float, requested_at: float):
+        """
+        Adopt the chain balance fetched by a request sent at `requested_at`.
+        Returns the drift between the local view and the chain.
+        """
+        now = time.time()
+        # Drop changes the chain has seen, and pending ones that never confirmed
+        self.entries = [
+            e for e in self.entries
+            if (e.confirmed_at is None and now - e.created_at < Config.LEDGER_PENDING_TTL)
+            or (e.confirmed_at is not None and e.confirmed_at > requested_at)
+        ]
+        unseen = sum(e.amount for e in self.entries)
+        expected = chain_balance + unseen
+        drift = expected - self.balance if self.balance is not None else 0.0
+        if abs(drift) > Config.LEDGER_DRIFT_WARN:
+            logger.warning(f"Balance ledger drifted by {drift:+.6f} SOL; adopting chain balance.")
+        self.balance = expected
+        self.last_drift = drift
+        self.last_reconciled = now
+        return drift
@@ -0,0 +1,31 @@
+import httpx
+from src.config.config import Config
+from src.utils.logger import logger
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+def build_async_client(timeout: float, **transport_kwargs) -> httpx.AsyncClient:
+    """
+    Build a long-lived AsyncClient with keep-alive pooling.
+    HTTP/2 is used when enabled and the `h2` package is installed, so
+    concurrent requests to one host share a single multiplexed connection.
+    Certificates are verified unless Config.HTTP_VERIFY_TLS is off. Extra
+    kwargs go to the transport (e.g. local_address).
+    """
+    http2 = Config.HTTP2_ENABLED and HTTP2_AVAILABLE
+    if Config.HTTP2_ENABLED and not HTTP2_AVAILABLE:
+        logger.warning("HTTP/2 requested but 'h2' is not installed. Falling back to HTTP/1.1.")
+
+    limits = httpx.Limits(
+        max_connections=Config.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=Config.HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=Config.HTTP_KEEPALIVE_EXPIRY
+    )
+    if not Config.HTTP_VERIFY_TLS:
+        logger.warning("TLS certificate verification is disabled (HTTP_VERIFY_TLS=false).")
+    transport = httpx.AsyncHTTPTransport(http2=http2, limits=limits, retries=1, verify=Config.HTTP_VERIFY_TLS, **transport_kwargs)
+    return httpx.AsyncClient(transport=transport, timeout=httpx.Timeout(timeout, connect=Config.HTTP_CONNECT_TIMEOUT))
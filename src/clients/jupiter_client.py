@@ -1,18 +1,40 @@
-import httpx
 import base64
 import socket
 from src.utils.logger import logger
 from src.config.config import Config
+from src.clients.http_pool import build_async_client
+from src.utils.json_stream import JsonKeyStream
+from src.utils.mint_index import MintIndex
+from src.utils.metrics import track_upstream
 
 class JupiterClient:
     QUOTE_API_URL = "https://quote-api.jup.ag/v6"
     TOKEN_LIST_URL = "https://token.jup.ag/all"
+    PRICE_API_URL = "https://api.jup.ag/price/v2"
+    SOL_MINT = "So11111111111111111111111111111111111111112"
+    USDC_MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+    USDC_DECIMALS = 6
 
     def __init__(self):
-        self.known_tokens = set()
-        # Create a custom transport that forces IPv4
-        # We bind to 0.0.0.0 to ensure system selects default IPv4 interface
-        self.transport = httpx.AsyncHTTPTransport(local_address="0.0.0.0")
+        # Persisted across restarts, so the first scan after a deploy already detects new mints
+        self.known_tokens = MintIndex(Config.MINT_INDEX_FILE)
+        self.client = None
+        # Validators from the last full token-list download
+        self.etag = None
+        self.last_modified = None
+
+    def open(self):
+        """Create the pooled client. Safe to call more than once."""
+        if self.client is None:
+            # Bind to 0.0.0.0 to force IPv4 (system selects default IPv4 interface)
+            self.client = build_async_client(Config.JUPITER_TIMEOUT, local_address="0.0.0.0")
+        return self.client
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        self.known_tokens.close()
 
     async def get_quote(self, input_mint: str, output_mint: str, amount: int, slippage_bps: int = 50):
         url = f"{self.QUOTE_API_URL}/quote"
@@ -25,17 +47,20 @@ class JupiterClient:
             "asLegacyTransaction": "false" # Use versioned
         }
         
-        async with httpx.AsyncClient(transport=self.transport, verify=False) as client:
-            try:
+        client = self.open()
+        try:
+            with track_upstream("jupiter", "quote") as call:
                 resp = await client.get(url, params=params)
-                if resp.status_code == 200:
-                    return resp.json()
-                else:
-                    logger.warning(f"Jupiter quote failed: {resp.text}")
-                    return None
-            except Exception as e:
-                logger.error(f"Jupiter quote error: {e}")
+                if resp.status_code != 200:
+                    call.fail()
+            if resp.status_code == 200:
+                return resp.json()
+            else:
+                logger.warning(f"Jupiter quote failed: {resp.text}")
                 return None
+        except Exception as e:
+            logger.error(f"Jupiter quote error: {e}")
+            return None
 
     async def get_swap_transaction(self, quote_response: dict, user_pubkey: str):
         url = f"{self.QUOTE_API_URL}/swap"
@@ -47,41 +72,94 @@ class JupiterClient:
             "dynamicComputeUnitLimit": True, 
             "prioritizationFeeLamports": "auto"
         }
-        async with httpx.AsyncClient(transport=self.transport, verify=False) as client:
-            try:
+        client = self.open()
+        try:
+            with track_upstream("jupiter", "swap") as call:
                 resp = await client.post(url, json=payload)
-                if resp.status_code == 200:
-                    return resp.json().get("swapTransaction")
-                else:
-                    logger.error(f"Jupiter swap build failed: {resp.text}")
-                    return None
-            except Exception as e:
-                logger.error(f"Jupiter swap error: {e}")
+                if resp.status_code != 200:
+                    call.fail()
+            if resp.status_code == 200:
+                return resp.json().get("swapTransaction")
+            else:
+                logger.error(f"Jupiter swap build failed: {resp.text}")
+                return None
+        except Exception as e:
+            logger.error(f"Jupiter swap error: {e}")
+            return None
+
+    async def get_prices(self, mints, vs_token: str = SOL_MINT):
+        """
+        Fetch prices for up to Config.PRICE_BATCH_SIZE mints in one request.
+        Returns {mint: price} for the mints the API could price, or None on failure.
+        """
+        client = self.open()
+        params = {"ids": ",".join(mints), "vsToken": vs_token}
+        try:
+            with track_upstream("jupiter", "price") as call:
+                resp = await client.get(self.PRICE_API_URL, params=params)
+                if resp.status_code != 200:
+                    call.fail()
+            if resp.status_code == 200:
+                data = resp.json().get("data") or {}
+                prices = {}
+                for mint, entry in data.items():
+                    if entry and entry.get("price") is not None:
+                        prices[mint] = float(entry["price"])
+                return prices
+            else:
+                logger.warning(f"Jupiter price fetch failed: {resp.status_code}")
                 return None
+        except Exception as e:
+            logger.error(f"Jupiter price error: {e}")
+            return None
 
     async def scan_new_tokens(self):
         """
         Fetch token list and identify new additions.
+        The request is conditional (ETag / Last-Modified), so an unchanged
+        list costs a 304 and no parsing. A changed list is streamed and only
+        the `address` fields are pulled out of it.
         """
-        async with httpx.AsyncClient(transport=self.transport, verify=False) as client:
-            try:
-                resp = await client.get(self.TOKEN_LIST_URL)
-                if resp.status_code == 200:
-                    tokens = resp.json()
-                    current_mints = {t['address'] for t in tokens}
-                    
-                    if not self.known_tokens:
-                        self.known_tokens = current_mints
-                        logger.info(f"Initialized scan with {len(current_mints)} tokens.")
+        client = self.open()
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        try:
+            # Timed through the end of the body, which is most of a full download
+            with track_upstream("jupiter", "token_list") as call:
+                async with client.stream("GET", self.TOKEN_LIST_URL, headers=headers) as resp:
+                    if resp.status_code == 304:
+                        return []
+                    if resp.status_code != 200:
+                        call.fail()
+                        logger.warning(f"Token list fetch failed: {resp.status_code}")
                         return []
-                    
-                    new_mints = current_mints - self.known_tokens
-                    self.known_tokens = current_mints
-                    
-                    if new_mints:
-                        logger.info(f"Found {len(new_mints)} new tokens.")
-                        return list(new_mints)
-                    return []
-            except Exception as e:
-                logger.error(f"Token scan failed: {e}")
+
+                    parser = JsonKeyStream("address")
+                    new_mints = {}
+                    async for chunk in resp.aiter_bytes():
+                        for mint in parser.feed(chunk):
+                            if mint not in self.known_tokens:
+                                new_mints[mint] = None
+
+                    # Only trust the validators once the whole body has been read
+                    self.etag = resp.headers.get("ETag")
+                    self.last_modified = resp.headers.get("Last-Modified")
+
+            initializing = not self.known_tokens
+            self.known_tokens.update(new_mints)
+
+            if initializing:
+                logger.info(f"Initialized scan with {len(new_mints)} tokens.")
                 return []
+            
+            if new_mints:
+                logger.info(f"Found {len(new_mints)} new tokens.")
+                return list(new_mints)
+            return []
+        except Exception as e:
+            logger.error(f"Token scan failed: {e}")
+            return []
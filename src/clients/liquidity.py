@@ -0,0 +1,116 @@
+import asyncio
+import time
+from src.config.config import Config
+from src.utils.logger import logger
+
+def fit_reserve(sizes, impacts, min_impact: float = 0.0):
+    """
+    Fit the quote-side reserve R of a constant-product pool to probe results.
+
+    Buying x into a pool with reserve R moves the price by x / (x + R), so
+    each probe gives R = x * (1 - impact) / impact. The per-probe estimates
+    are averaged with inverse-variance weights (impact^4 / x^2): an impact
+    rounded to a few digits says little about R when it is tiny. Probes with
+    impacts below `min_impact` only bound R from below; if no probe is
+    measurable, that bound is returned. None if there is nothing to fit.
+    """
+    estimates, weights, floor = [], [], None
+    for size, impact in zip(sizes, impacts):
+        if impact is None or not size > 0 or impact >= 1:
+            continue
+        if impact < max(min_impact, 1e-12):
+            bound = size * (1 - min_impact) / min_impact if min_impact > 0 else float("inf")
+            floor = bound if floor is None else max(floor, bound)
+            continue
+        estimates.append(size * (1 - impact) / impact)
+        weights.append(impact ** 4 / size ** 2)
+    if not estimates:
+        return floor
+    reserve = sum(r * w for r, w in zip(estimates, weights)) / sum(weights)
+    return reserve if floor is None else max(reserve, floor)
+
+class LiquidityEstimate:
+    """Pool depth in USD (both sides, so 2x the fitted USDC reserve) and when it was measured."""
+    __slots__ = ("depth_usd", "fetched_at")
+
+    def __init__(self, depth_usd, fetched_at: float):
+        self.depth_usd = depth_usd
+        self.fetched_at = fetched_at
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+class LiquidityEstimator:
+    """
+    Pool depth of a mint from Jupiter buy quotes at several sizes.
+
+    One USDC -> mint quote per Config.LIQUIDITY_PROBE_SIZES_USD is sent
+    concurrently, so an estimate costs one parallel round-trip, and the
+    reported price impacts are fitted with `fit_reserve`. Estimates are
+    cached per mint (Config.LIQUIDITY_TTL, or LIQUIDITY_ERROR_TTL when no
+    quote was usable), and concurrent lookups of one mint share the probes.
+    """
+
+    def __init__(self, jupiter, sizes_usd=None):
+        self.jupiter = jupiter
+        self.sizes_usd = tuple(sizes_usd or Config.LIQUIDITY_PROBE_SIZES_USD)
+        self.cache = {}
+        self.inflight = {}  # mint -> Task shared by concurrent lookups
+
+    async def get_depth(self, mint: str):
+        """Estimated pool depth in USD, or None if the mint couldn't be quoted."""
+        entry = self.cache.get(mint)
+        if entry is not None:
+            ttl = Config.LIQUIDITY_TTL if entry.depth_usd is not None else Config.LIQUIDITY_ERROR_TTL
+            if entry.age < ttl:
+                return entry.depth_usd
+
+        task = self.inflight.get(mint)
+        if task is None:
+            task = asyncio.create_task(self._probe_and_cache(mint))
+            self.inflight[mint] = task
+            task.add_done_callback(lambda _: self.inflight.pop(mint, None))
+        # Shielded so one caller being cancelled doesn't cancel the probes for the others
+        return await asyncio.shield(task)
+
+    async def _probe_and_cache(self, mint: str):
+        depth = await self._probe(mint)
+        if len(self.cache) >= Config.LIQUIDITY_CACHE_MAX_ENTRIES:
+            self.prune()
+        self.cache[mint] = LiquidityEstimate(depth, time.time())
+        return depth
+
+    async def _probe(self, mint: str):
+        jupiter = self.jupiter
+        scale = 10 ** jupiter.USDC_DECIMALS
+        quotes = await asyncio.gather(
+            *(jupiter.get_quote(jupiter.USDC_MINT, mint, int(size * scale)) for size in self.sizes_usd),
+            return_exceptions=True,
+        )
+        sizes, impacts = [], []
+        for size, quote in zip(self.sizes_usd, quotes):
+            # No route at a size (or a failed request) just drops that probe
+            if not isinstance(quote, dict):
+                continue
+            try:
+                if int(quote.get("outAmount") or 0) <= 0:
+                    continue
+                impacts.append(abs(float(quote.get("priceImpactPct"))))
+            except (TypeError, ValueError):
+                continue
+            sizes.append(size)
+
+        reserve = fit_reserve(sizes, impacts, Config.LIQUIDITY_MIN_IMPACT)
+        if reserve is None:
+            logger.warning(f"No usable liquidity probes for {mint}")
+            return None
+        return 2 * reserve
+
+    def prune(self):
+        """Drop expired estimates, then the oldest ones if the cache is still full."""
+        keep = Config.LIQUIDITY_CACHE_MAX_ENTRIES // 2
+        fresh = {mint: e for mint, e in self.cache.items() if e.age < Config.LIQUIDITY_TTL}
+        if len(fresh) > keep:
+            fresh = dict(sorted(fresh.items(), key=lambda item: item[1].fetched_at)[-keep:])
+        self.cache = fresh
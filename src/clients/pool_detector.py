@@ -0,0 +1,147 @@
+import asyncio
+import json
+from collections import OrderedDict
+import websockets
+from src.config.config import Config
+from src.utils.logger import logger
+
+class PoolDetector:
+    """
+    Push-based new-pool detection over the RPC websocket.
+
+    Subscribes to logs mentioning each AMM program in Config.POOL_PROGRAMS and
+    watches for its pool-creation log line. For each hit, the pool's mint
+    accounts are read from the initialize instruction of the transaction
+    (`resolve`). The mint that is not a quote asset (SOL, USDC...) is handed
+    to `on_mint`. Mints are checked against `known`, the same MintIndex the
+    token-list scanner uses, so each source skips what the other already
+    found; new ones are written to it in batches every
+    Config.POOL_DETECTOR_FLUSH_INTERVAL, since an index write rewrites the
+    file. The connection is re-established with exponential backoff.
+    """
+
+    def __init__(self, solana, known, on_mint, ws_url: str = None, programs: dict = None, resolve=None):
+        self.solana = solana
+        self.known = known
+        self.on_mint = on_mint
+        self.ws_url = ws_url or Config.WS_URL
+        self.programs = programs or Config.POOL_PROGRAMS
+        self.resolve = resolve or self.solana.get_pool_mints
+        self.subscriptions = {}  # subscription id -> program id
+        self.recent_signatures = OrderedDict()
+        self.pending = set()
+        self.unsaved = set()  # Detected mints not yet written to `known`
+        self.task = None
+        self.flusher = None
+        self.connected = asyncio.Event()
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+            self.flusher = asyncio.create_task(self._flush_periodically())
+        return self.task
+
+    async def close(self):
+        for task in (self.task, self.flusher):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self.task = self.flusher = None
+        for task in list(self.pending):
+            task.cancel()
+        await asyncio.gather(*self.pending, return_exceptions=True)
+        self.flush()
+
+    def flush(self):
+        """Write detected mints to the index with one merge."""
+        if not self.unsaved:
+            return
+        batch, self.unsaved = self.unsaved, set()
+        try:
+            self.known.update(batch)
+        except Exception as e:
+            logger.error(f"Failed to save {len(batch)} detected mints: {e}")
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(Config.POOL_DETECTOR_FLUSH_INTERVAL)
+            self.flush()
+
+    async def run(self):
+        backoff = 1.0
+        while True:
+            try:
+                async with websockets.connect(self.ws_url, ping_interval=20, max_size=None) as ws:
+                    await self._subscribe(ws)
+                    self.connected.set()
+                    backoff = 1.0
+                    logger.info(f"Pool detector subscribed to {len(self.programs)} programs.")
+                    async for message in ws:
+                        self._handle_message(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Pool detector connection lost: {e}")
+            self.connected.clear()
+            self.subscriptions.clear()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, Config.POOL_DETECTOR_MAX_BACKOFF)
+
+    async def _subscribe(self, ws):
+        programs = list(self.programs)
+        for request_id, program_id in enumerate(programs, 1):
+            await ws.send(json.dumps({
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": "logsSubscribe",
+                "params": [{"mentions": [program_id]}, {"commitment": "confirmed"}]
+            }))
+        # Map subscription ids to programs from the confirmations
+        while len(self.subscriptions) < len(programs):
+            reply = json.loads(await ws.recv())
+            if "id" in reply and "result" in reply:
+                self.subscriptions[reply["result"]] = programs[reply["id"] - 1]
+            elif "error" in reply:
+                raise RuntimeError(f"logsSubscribe rejected: {reply['error']}")
+            else:
+                self._handle_message(reply)
+
+    def _handle_message(self, message):
+        msg = json.loads(message) if isinstance(message, (str, bytes)) else message
+        if msg.get("method") != "logsNotification":
+            return
+        params = msg.get("params", {})
+        program_id = self.subscriptions.get(params.get("subscription"))
+        value = params.get("result", {}).get("value", {})
+        if program_id is None or value.get("err") is not None:
+            return
+
+        marker, discriminator, mint_indices = self.programs[program_id]
+        # The whole line, not a prefix: other programs log "Instruction: InitializeAccount3" etc.
+        prefix = marker + " "
+        if not any(line == marker or line.startswith(prefix) for line in value.get("logs") or []):
+            return
+
+        signature = value.get("signature")
+        if not signature or signature in self.recent_signatures:
+            return
+        self.recent_signatures[signature] = None
+        while len(self.recent_signatures) > 10_000:
+            self.recent_signatures.popitem(last=False)
+
+        # Resolve off the read loop so a slow getTransaction never stalls the socket
+        task = asyncio.create_task(self._resolve_and_emit(signature, program_id, discriminator, mint_indices))
+        self.pending.add(task)
+        task.add_done_callback(self.pending.discard)
+
+    async def _resolve_and_emit(self, signature, program_id, discriminator, mint_indices):
+        try:
+            mints = await self.resolve(signature, program_id, discriminator, mint_indices)
+            for mint in mints:
+                if mint in Config.QUOTE_MINTS or mint in self.unsaved or mint in self.known:
+                    continue
+                self.unsaved.add(mint)
+                logger.info(f"New pool detected for {mint} (tx {signature[:16]}...)")
+                await self.on_mint(mint)
+        except Exception as e:
+            logger.error(f"Failed to process pool event {signature}: {e}")
@@ -0,0 +1,66 @@
+import asyncio
+import time
+from src.config.config import Config
+from src.utils.logger import logger
+
+class PriceQuote:
+    """A cached price in SOL with the time it was fetched."""
+    __slots__ = ("price", "fetched_at")
+
+    def __init__(self, price: float, fetched_at: float):
+        self.price = price
+        self.fetched_at = fetched_at
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    @property
+    def stale(self) -> bool:
+        return self.age > Config.PRICE_STALE_AFTER
+
+class PriceFeed:
+    """
+    Batched price oracle for held mints.
+
+    Prices come from the Jupiter price API in multi-ID requests of
+    Config.PRICE_BATCH_SIZE mints, with all batches sent concurrently, so a
+    full pass costs O(batches) requests. Results are kept in a TTL cache; if a
+    refresh fails, the last known price is served and its `stale` flag tells
+    the caller how far to trust it.
+    """
+
+    def __init__(self, jupiter):
+        self.jupiter = jupiter
+        self.cache = {}
+
+    async def get_prices(self, mints, max_age: float = None) -> dict:
+        """
+        Return {mint: PriceQuote} for every mint with a known price.
+        Cached prices younger than max_age (default Config.PRICE_TTL) are reused.
+        """
+        if max_age is None:
+            max_age = Config.PRICE_TTL
+        now = time.time()
+        to_fetch = [m for m in dict.fromkeys(mints) if m not in self.cache or now - self.cache[m].fetched_at >= max_age]
+
+        if to_fetch:
+            size = Config.PRICE_BATCH_SIZE
+            batches = [to_fetch[i:i + size] for i in range(0, len(to_fetch), size)]
+            results = await asyncio.gather(*(self.jupiter.get_prices(batch) for batch in batches), return_exceptions=True)
+            fetched_at = time.time()
+            failed = 0
+            for result in results:
+                if not isinstance(result, dict):
+                    failed += 1
+                    continue
+                for mint, price in result.items():
+                    self.cache[mint] = PriceQuote(price, fetched_at)
+            if failed:
+                logger.warning(f"{failed}/{len(batches)} price batches failed; serving cached prices.")
+
+        return {m: self.cache[m] for m in mints if m in self.cache}
+
+    def forget(self, mint: str):
+        """Drop a mint we no longer hold."""
+        self.cache.pop(mint, None)
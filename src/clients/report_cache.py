@@ -0,0 +1,101 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from src.config.config import Config
+from src.utils.logger import logger
+
+class ReportCache:
+    """
+    LRU cache of RugCheck verdicts with a TTL per verdict.
+
+    Passing and failing reports are cached for different lengths of time;
+    errors and 404s are cached briefly as negative entries (report None), so a
+    mint that just failed is not re-queried on every scan. Only the fields
+    the engine reads (score, risks) are kept, and the number of entries is
+    capped at `entry_limit`. Expiry uses wall-clock time so the cache can be
+    persisted and reloaded.
+    """
+
+    PASS = "pass"
+    FAIL = "fail"
+    NOT_FOUND = "not_found"
+    ERROR = "error"
+
+    def __init__(self, path=None, entry_limit: int = None):
+        self.path = Path(path) if path else None
+        self.entry_limit = entry_limit or Config.RUGCHECK_CACHE_ENTRY_LIMIT
+        self.entries = OrderedDict()  # mint -> (verdict, report, expires_at)
+        self.dirty = False
+        self.last_saved = time.time()
+        self.hits = 0
+        self.misses = 0
+        if self.path:
+            self.load()
+
+    @staticmethod
+    def ttl_for(verdict: str) -> float:
+        return {
+            ReportCache.PASS: Config.RUGCHECK_PASS_TTL,
+            ReportCache.FAIL: Config.RUGCHECK_FAIL_TTL,
+            ReportCache.NOT_FOUND: Config.RUGCHECK_NOT_FOUND_TTL,
+        }.get(verdict, Config.RUGCHECK_ERROR_TTL)
+
+    def get(self, mint: str):
+        """Return (hit, report). A negative entry is a hit with report None."""
+        entry = self.entries.get(mint)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        verdict, report, expires_at = entry
+        if expires_at <= time.time():
+            del self.entries[mint]
+            self.misses += 1
+            return False, None
+        self.entries.move_to_end(mint)
+        self.hits += 1
+        return True, report
+
+    def put(self, mint: str, verdict: str, report: dict = None):
+        if report is not None:
+            report = {"score": report.get("score"), "risks": report.get("risks", [])}
+        self.entries[mint] = (verdict, report, time.time() + self.ttl_for(verdict))
+        self.entries.move_to_end(mint)
+        while len(self.entries) > self.entry_limit:
+            self.entries.popitem(last=False)
+        self.dirty = True
+
+    # --- Persistence ---
+
+    def load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r') as f:
+                rows = json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load RugCheck cache: {e}")
+            return
+        now = time.time()
+        for mint, verdict, report, expires_at in rows[-self.entry_limit:]:
+            if expires_at > now:
+                self.entries[mint] = (verdict, report, expires_at)
+
+    def snapshot(self):
+        """Copy the entries on the event loop; write the copy with `write` off it."""
+        self.dirty = False
+        self.last_saved = time.time()
+        return [[mint, verdict, report, expires_at] for mint, (verdict, report, expires_at) in self.entries.items()]
+
+    def write(self, rows):
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(rows, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Failed to save RugCheck cache: {e}")
+
+    def save_due(self) -> bool:
+        return self.path is not None and self.dirty and time.time() - self.last_saved >= Config.RUGCHECK_CACHE_SAVE_INTERVAL
@@ -1,40 +1,104 @@
-import httpx
+import asyncio
 from src.utils.logger import logger
 from src.config.config import Config
+from src.clients.http_pool import build_async_client
+from src.clients.report_cache import ReportCache
+from src.utils.metrics import track_upstream
 
 class RugCheckClient:
     BASE_URL = "https://api.rugcheck.xyz/v1"
 
+    def __init__(self, cache_path=None):
+        self.client = None
+        self.cache = ReportCache(cache_path or Config.RUGCHECK_CACHE_FILE)
+        self.inflight = {}  # mint -> Task shared by concurrent lookups
+        # One save at a time: ReportCache.write always goes through the same temp file
+        self.save_lock = asyncio.Lock()
+        self.save_task = None  # Background save started by a lookup
+
+    def open(self):
+        """Create the pooled client. Safe to call more than once."""
+        if self.client is None:
+            self.client = build_async_client(Config.RUGCHECK_TIMEOUT)
+        return self.client
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        if self.save_task is not None:
+            await asyncio.gather(self.save_task, return_exceptions=True)
+        await self.save()
+
+    async def save(self):
+        """Write the cache off the event loop if it changed. Saves are serialized."""
+        async with self.save_lock:
+            if self.cache.dirty:
+                await asyncio.to_thread(self.cache.write, self.cache.snapshot())
+
     async def get_token_report(self, mint: str):
         """
         Fetch token report from RugCheck.
-        Returns a dict with 'is_safe' (bool) and 'score' (int).
+        Returns a dict with 'score' (int) and 'risks', or None on failure.
+        Verdicts (including failures) are served from the cache while fresh, and
+        concurrent lookups of one mint share a single request.
         """
+        hit, report = self.cache.get(mint)
+        if hit:
+            return report
+
+        task = self.inflight.get(mint)
+        if task is None:
+            task = asyncio.create_task(self._fetch_and_cache(mint))
+            self.inflight[mint] = task
+            task.add_done_callback(lambda _: self.inflight.pop(mint, None))
+        # Shielded so one caller being cancelled doesn't cancel the lookup for the others
+        return await asyncio.shield(task)
+
+    async def _fetch_and_cache(self, mint: str):
+        verdict, report = await self._fetch_report(mint)
+        self.cache.put(mint, verdict, report)
+        # Saved in the background: callers sharing this lookup don't wait on disk or the save lock
+        if self.cache.save_due() and (self.save_task is None or self.save_task.done()):
+            self.save_task = asyncio.create_task(self.save())
+        return report
+
+    async def _fetch_report(self, mint: str):
+        """Returns (verdict, report) where verdict is a ReportCache constant."""
         url = f"{self.BASE_URL}/tokens/{mint}/report"
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(url, timeout=10)
-                if resp.status_code == 200:
-                    data = resp.json()
-                    score = data.get("score", 1000) # Default to high risk if missing
-                    
-                    # User requirement: Trust Score > 90.
-                    # Assumption: RugCheck Score (0-bad?, or 0-good?)
-                    # If RugCheck Score is Risk (0=Good), then Trust > 90 means Risk < 10 (approx).
-                    # Let's assume Risk Score < 500 is generally "Safeish", but for "Trust > 90", we want VERY safe.
-                    # We will treat score <= 100 as "Trust > 90" equivalent for now, or just return the raw score and let strategy decide.
-                    
-                    return {
-                        "score": score,
-                        "risks": data.get("risks", []),
-                        "raw": data
-                    }
-                else:
-                    logger.warning(f"RugCheck failed for {mint}: {resp.status_code}")
-                    return None
+            client = self.open()
+            with track_upstream("rugcheck", "report") as call:
+                resp = await client.get(url)
+                # A missing report is a valid answer, not an upstream failure
+                if resp.status_code not in (200, 404):
+                    call.fail()
+            if resp.status_code == 200:
+                data = resp.json()
+                score = data.get("score", 1000) # Default to high risk if missing
+                
+                # User requirement: Trust Score > 90.
+                # Assumption: RugCheck Score (0-bad?, or 0-good?)
+                # If RugCheck Score is Risk (0=Good), then Trust > 90 means Risk < 10 (approx).
+                # Let's assume Risk Score < 500 is generally "Safeish", but for "Trust > 90", we want VERY safe.
+                # We will treat score <= 100 as "Trust > 90" equivalent for now, or just return the raw score and let strategy decide.
+                
+                report = {
+                    "score": score,
+                    "risks": data.get("risks", []),
+                    "raw": data
+                }
+                verdict = ReportCache.PASS if self.is_trustable(report) else ReportCache.FAIL
+                return verdict, report
+            elif resp.status_code == 404:
+                logger.warning(f"RugCheck has no report for {mint}")
+                return ReportCache.NOT_FOUND, None
+            else:
+                logger.warning(f"RugCheck failed for {mint}: {resp.status_code}")
+                return ReportCache.ERROR, None
         except Exception as e:
             logger.error(f"RugCheck error for {mint}: {e}")
-            return None
+            return ReportCache.ERROR, None
 
     def is_trustable(self, report: dict) -> bool:
         """
@@ -1,26 +1,35 @@
 import base58
+import json
+import time
 from solana.rpc.async_api import AsyncClient
 from solana.rpc.types import TxOpts, TokenAccountOpts
 from solders.transaction import Transaction
+from solders.message import Message
 from solders.keypair import Keypair
 from solders.pubkey import Pubkey
+from solders.signature import Signature
 from solders.system_program import TransferParams, transfer
-from solders.compute_budget import set_compute_unit_price
+from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
 from spl.token.instructions import close_account, CloseAccountParams, get_associated_token_address
 from spl.token.constants import TOKEN_PROGRAM_ID
+from src.clients.balance_ledger import BalanceLedger
+from src.clients.tx_prefetch import BlockhashCache, PriorityFeeEstimator
 from src.config.config import Config
 from src.utils.logger import logger
+from src.utils.metrics import track_upstream
 
 class SolanaClient:
     def __init__(self):
         self.rpc_url = Config.RPC_URL
         self.client = AsyncClient(self.rpc_url)
         self.keypair = None
+        self.ledger = BalanceLedger()
+        self.blockhashes = BlockhashCache(self.client)
+        self.fees = PriorityFeeEstimator(self.rpc_url)
         if Config.SOLANA_PRIVATE_KEY:
             try:
                 # Check if key is list of integers (JSON format)
                 if "[" in Config.SOLANA_PRIVATE_KEY and "]" in Config.SOLANA_PRIVATE_KEY:
-                    import json
                     key_bytes = bytes(json.loads(Config.SOLANA_PRIVATE_KEY))
                     self.keypair = Keypair.from_bytes(key_bytes)
                 else:
@@ -29,16 +38,55 @@ class SolanaClient:
             except Exception as e:
                 logger.error(f"Failed to load private key: {e}")
 
+    async def close(self):
+        await self.fees.close()
+        await self.client.close()
+
     async def get_sol_balance(self) -> float:
         if not self.keypair:
             return 0.0
         try:
-            resp = await self.client.get_balance(self.keypair.pubkey())
+            with track_upstream("rpc", "getBalance"):
+                resp = await self.client.get_balance(self.keypair.pubkey())
             return resp.value / 1e9
         except Exception as e:
             logger.error(f"Error getting SOL balance: {e}")
             return 0.0
 
+    async def reconcile_balance(self) -> bool:
+        """
+        Settle confirmations for the ledger's pending transactions, then adopt
+        the on-chain balance. Leaves the ledger untouched if either RPC fails.
+        """
+        if not self.keypair:
+            self.ledger.reconcile(0.0, time.time())
+            return True
+        try:
+            pending = self.ledger.pending_signatures()
+            if pending:
+                with track_upstream("rpc", "getSignatureStatuses"):
+                    resp = await self.client.get_signature_statuses([Signature.from_string(s) for s in pending])
+                for signature, status in zip(pending, resp.value):
+                    if status is not None and status.confirmation_status is not None:
+                        self.ledger.confirm(signature, failed=status.err is not None)
+
+            requested_at = time.time()
+            with track_upstream("rpc", "getBalance"):
+                resp = await self.client.get_balance(self.keypair.pubkey())
+            self.ledger.reconcile(resp.value / 1e9, requested_at)
+            return True
+        except Exception as e:
+            logger.error(f"Balance reconcile failed: {e}")
+            return False
+
+    def fee_accounts(self) -> list:
+        """Accounts our transactions write to, for sampling the fees paid to lock them."""
+        accounts = [str(self.keypair.pubkey())] if self.keypair else []
+        if Config.TAX_VAULT_ADDRESS:
+            accounts.append(Config.TAX_VAULT_ADDRESS)
+        accounts.extend(Config.PRIORITY_FEE_ACCOUNTS)
+        return accounts
+
     async def get_token_accounts(self):
         """Get all token accounts for the wallet."""
         if not self.keypair:
@@ -49,6 +97,44 @@ class SolanaClient:
         resp = await self.client.get_token_accounts_by_owner(self.keypair.pubkey(), opts)
         return resp.value
 
+    async def get_pool_mints(self, signature: str, program_id: str, discriminator: bytes, mint_indices) -> list:
+        """
+        Read the mint accounts of a pool-creation instruction.
+        Looks for the first instruction (top-level or inner) of `program_id`
+        whose data starts with `discriminator` and returns its accounts at
+        `mint_indices`. Other instructions of the program (swaps, deposits)
+        have different account layouts and are skipped.
+        """
+        try:
+            with track_upstream("rpc", "getTransaction"):
+                resp = await self.client.get_transaction(
+                    Signature.from_string(signature), encoding="jsonParsed", max_supported_transaction_version=0
+                )
+        except Exception as e:
+            logger.error(f"Failed to fetch transaction {signature}: {e}")
+            return []
+        tx = resp.value
+        if tx is None:
+            return []
+
+        instructions = list(tx.transaction.transaction.message.instructions)
+        meta = tx.transaction.meta
+        if meta and meta.inner_instructions:
+            for inner in meta.inner_instructions:
+                instructions.extend(inner.instructions)
+
+        for ix in instructions:
+            accounts = getattr(ix, "accounts", None)
+            if accounts is None or str(ix.program_id) != program_id:
+                continue
+            try:
+                data = base58.b58decode(ix.data)
+            except ValueError:
+                continue
+            if data.startswith(discriminator) and max(mint_indices) < len(accounts):
+                return [str(accounts[i]) for i in mint_indices]
+        return []
+
     async def transfer_sol(self, to_address: str, amount_sol: float):
         """Send SOL to an address (e.g. Tax Vault)."""
         if not self.keypair:
@@ -62,25 +148,101 @@ class SolanaClient:
                 lamports=lamports
             ))
             
-            # Add compute budget for speed
-            cb_ix = set_compute_unit_price(1000) # Dynamic? Start with static low
-            
-            # Create Transaction (Legacy or V0? Jupiter uses Versioned usually, here Legacy is fine for SOL transfer)
-            recent_blockhash = await self.client.get_latest_blockhash()
-            txn = Transaction()
-            txn.add(cb_ix)
-            txn.add(ix)
-            txn.recent_blockhash = recent_blockhash.value.blockhash
-            txn.sign(self.keypair)
-            
-            resp = await self.client.send_transaction(txn)
+            # Priority fee and blockhash come from the background refreshers: no RPC before signing
+            cu_price = self.fees.estimate()
+            instructions = [
+                set_compute_unit_limit(Config.TRANSFER_COMPUTE_UNITS),
+                set_compute_unit_price(cu_price),
+                ix,
+            ]
+            blockhash, _ = await self.blockhashes.get()
+            txn = Transaction.new_signed_with_payer(instructions, self.keypair.pubkey(), [self.keypair], blockhash)
+
+            with track_upstream("rpc", "sendTransaction"):
+                resp = await self.client.send_transaction(txn)
+            fee = Config.TX_BASE_FEE_SOL + cu_price * Config.TRANSFER_COMPUTE_UNITS / 1e15
+            self.ledger.debit(amount_sol + fee, "transfer", str(resp.value))
             logger.info(f"Sent {amount_sol} SOL to {to_address}. Sig: {resp.value}")
             return True
         except Exception as e:
             logger.error(f"Transfer failed: {e}")
             return False
 
-    async def close_empty_accounts(self):
-        """Find and close empty token accounts to reclaim rent."""
-        # Implementation depends on parsing token accounts
-        pass
+    async def find_empty_token_accounts(self, exclude_mints=()) -> list:
+        """
+        List closable token accounts with one jsonParsed getTokenAccountsByOwner.
+        Returns [(account, mint, lamports)] for initialized zero-balance accounts.
+        """
+        if not self.keypair:
+            return []
+        opts = TokenAccountOpts(program_id=TOKEN_PROGRAM_ID)
+        with track_upstream("rpc", "getTokenAccountsByOwner"):
+            resp = await self.client.get_token_accounts_by_owner_json_parsed(self.keypair.pubkey(), opts)
+        empty = []
+        for keyed in resp.value:
+            parsed = keyed.account.data.parsed
+            if isinstance(parsed, str):
+                parsed = json.loads(parsed)
+            info = parsed.get("info", {})
+            # Frozen accounts can't be closed
+            if info.get("state") != "initialized" or info.get("tokenAmount", {}).get("amount") != "0":
+                continue
+            if info.get("mint") in exclude_mints:
+                continue
+            empty.append((keyed.pubkey, info.get("mint"), keyed.account.lamports))
+        return empty
+
+    def _pack_close_transactions(self, accounts, blockhash, cu_price) -> list:
+        """
+        Greedily pack close_account instructions into as few transactions as
+        fit under Config.TX_MAX_SIZE. Returns [(transaction, accounts in it)].
+        """
+        owner = self.keypair.pubkey()
+
+        def build(batch, signed):
+            instructions = [
+                set_compute_unit_limit(Config.CLOSE_ACCOUNT_COMPUTE_UNITS * len(batch)),
+                set_compute_unit_price(cu_price),
+            ]
+            instructions += [
+                close_account(CloseAccountParams(program_id=TOKEN_PROGRAM_ID, account=account, dest=owner, owner=owner))
+                for account, _, _ in batch
+            ]
+            if signed:
+                return Transaction.new_signed_with_payer(instructions, owner, [self.keypair], blockhash)
+            # Same size as the signed form: signatures are fixed-width placeholders
+            return Transaction.new_unsigned(Message.new_with_blockhash(instructions, owner, blockhash))
+
+        packed, batch = [], []
+        for account in accounts:
+            if batch and len(bytes(build(batch + [account], signed=False))) > Config.TX_MAX_SIZE:
+                packed.append((build(batch, signed=True), batch))
+                batch = []
+            batch.append(account)
+        if batch:
+            packed.append((build(batch, signed=True), batch))
+        return packed
+
+    async def close_empty_accounts(self, exclude_mints=()) -> int:
+        """Find and close empty token accounts to reclaim rent. Returns the number closed."""
+        if not self.keypair:
+            return 0
+        try:
+            accounts = await self.find_empty_token_accounts(exclude_mints)
+            if not accounts:
+                return 0
+            cu_price = self.fees.estimate()
+            blockhash, _ = await self.blockhashes.get()
+            closed = 0
+            for txn, batch in self._pack_close_transactions(accounts, blockhash, cu_price):
+                with track_upstream("rpc", "sendTransaction"):
+                    resp = await self.client.send_transaction(txn)
+                rent = sum(lamports for _, _, lamports in batch) / 1e9
+                fee = Config.TX_BASE_FEE_SOL + cu_price * Config.CLOSE_ACCOUNT_COMPUTE_UNITS * len(batch) / 1e15
+                self.ledger.credit(rent - fee, "rent reclaim", str(resp.value))
+                closed += len(batch)
+                logger.info(f"Closed {len(batch)} empty token accounts, reclaiming {rent:.6f} SOL. Sig: {resp.value}")
+            return closed
+        except Exception as e:
+            logger.error(f"Failed to close empty accounts: {e}")
+            return 0
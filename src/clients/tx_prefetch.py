@@ -0,0 +1,103 @@
+import time
+import numpy as np
+from solana.rpc.commitment import Confirmed
+from src.clients.http_pool import build_async_client
+from src.config.config import Config
+from src.utils.logger import logger
+from src.utils.metrics import track_upstream
+
+class BlockhashCache:
+    """
+    Latest blockhash and its last valid block height, refreshed in the
+    background so signing a transaction doesn't wait on RPC. `get` only
+    fetches inline when the cached hash is older than Config.BLOCKHASH_MAX_AGE.
+    Blockhashes expire after about 150 blocks (~60s).
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.blockhash = None
+        self.last_valid_block_height = None
+        self.fetched_at = 0.0
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    async def refresh(self):
+        with track_upstream("rpc", "getLatestBlockhash"):
+            resp = await self.client.get_latest_blockhash(commitment=Confirmed)
+        self.blockhash = resp.value.blockhash
+        self.last_valid_block_height = resp.value.last_valid_block_height
+        self.fetched_at = time.time()
+
+    async def get(self):
+        """Return (blockhash, last_valid_block_height)."""
+        if self.blockhash is None or self.age > Config.BLOCKHASH_MAX_AGE:
+            await self.refresh()
+        return self.blockhash, self.last_valid_block_height
+
+class PriorityFeeEstimator:
+    """
+    Compute-unit price (micro-lamports) from recent network fees.
+
+    `sample` pulls getRecentPrioritizationFees (the last ~150 slots) and
+    merges it into a per-slot window covering Config.PRIORITY_FEE_WINDOW_SLOTS.
+    `estimate` picks the price by strategy:
+      percentile: the Config.PRIORITY_FEE_PERCENTILE-th percentile of the
+                  window, clamped to [PRIORITY_FEE_MIN, PRIORITY_FEE_MAX].
+      cap:        always PRIORITY_FEE_MAX, for fastest landing at a known cost.
+    With no samples yet it falls back to PRIORITY_FEE_DEFAULT.
+    """
+
+    PERCENTILE = "percentile"
+    CAP = "cap"
+
+    def __init__(self, rpc_url: str, strategy: str = None, percentile: float = None):
+        self.rpc_url = rpc_url
+        self.strategy = strategy or Config.PRIORITY_FEE_STRATEGY
+        self.percentile = percentile if percentile is not None else Config.PRIORITY_FEE_PERCENTILE
+        self.fees = {}  # slot -> micro-lamports per CU
+        self.client = None
+
+    def open(self):
+        if self.client is None:
+            self.client = build_async_client(Config.RPC_TIMEOUT)
+        return self.client
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def sample(self, accounts=None):
+        """Merge the node's recent fees into the window. `accounts` narrows to writers of those accounts."""
+        client = self.open()
+        payload = {"jsonrpc": "2.0", "id": 1, "method": "getRecentPrioritizationFees", "params": [accounts] if accounts else []}
+        try:
+            with track_upstream("rpc", "getRecentPrioritizationFees"):
+                resp = await client.post(self.rpc_url, json=payload)
+                resp.raise_for_status()
+            for row in resp.json().get("result") or []:
+                self.fees[row["slot"]] = row["prioritizationFee"]
+        except Exception as e:
+            logger.error(f"Failed to sample priority fees: {e}")
+            return
+        if self.fees:
+            newest = max(self.fees)
+            for slot in [s for s in self.fees if s <= newest - Config.PRIORITY_FEE_WINDOW_SLOTS]:
+                del self.fees[slot]
+
+    def percentiles(self, qs=(50, 75, 90)) -> dict:
+        if not self.fees:
+            return {}
+        values = np.percentile(np.fromiter(self.fees.values(), dtype=float), qs)
+        return {q: int(v) for q, v in zip(qs, values)}
+
+    def estimate(self) -> int:
+        if self.strategy == self.CAP:
+            return Config.PRIORITY_FEE_MAX
+        if not self.fees:
+            return Config.PRIORITY_FEE_DEFAULT
+        fee = self.percentiles((self.percentile,))[self.percentile]
+        return min(max(fee, Config.PRIORITY_FEE_MIN), Config.PRIORITY_FEE_MAX)
@@ -10,6 +10,7 @@ class Config:
     # Environment
     SOLANA_PRIVATE_KEY = os.getenv("SOLANA_PRIVATE_KEY")
     RPC_URL = os.getenv("RPC_URL", "https://api.mainnet-beta.solana.com")
+    WS_URL = os.getenv("WS_URL") or RPC_URL.replace("https://", "wss://", 1).replace("http://", "ws://", 1)
     TAX_VAULT_ADDRESS = os.getenv("TAX_VAULT_ADDRESS")
     TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
     CHAT_ID = os.getenv("CHAT_ID")
@@ -22,6 +23,135 @@ class Config:
     # Money Management
     POSITION_SIZE_PCT = 0.10
     TAX_RATE = 0.20
+    MIN_TRADE_SOL = 0.01
+    TX_BASE_FEE_SOL = 0.000005  # Signature fee charged per transaction
+
+    # Tax Settlement: accrue per sell, pay the vault in one transfer
+    TAX_SETTLE_THRESHOLD = 0.5        # SOL; settle as soon as this much is owed
+    TAX_SETTLE_INTERVAL = 3600        # Seconds; otherwise settle at least this often
+    TAX_SETTLE_CHECK_INTERVAL = 30
+    TAX_SETTLE_DEADLINE = 60
+
+    # Transaction Prefetch
+    BLOCKHASH_REFRESH_INTERVAL = 5    # Seconds; a blockhash is valid for ~60s
+    BLOCKHASH_MAX_AGE = 30            # Older cached hashes are re-fetched inline
+    PRIORITY_FEE_SAMPLE_INTERVAL = 10
+    PRIORITY_FEE_WINDOW_SLOTS = 450   # Rolling window (~3 min of slots)
+    PRIORITY_FEE_STRATEGY = os.getenv("PRIORITY_FEE_STRATEGY", "percentile")  # percentile | cap
+    PRIORITY_FEE_PERCENTILE = 75
+    PRIORITY_FEE_MIN = 1_000          # Micro-lamports per compute unit
+    PRIORITY_FEE_MAX = 2_000_000
+    PRIORITY_FEE_DEFAULT = 1_000      # Used before the first sample
+    # Writable accounts our transactions lock besides the wallet and the tax vault. Fees are sampled
+    # for these: without an account filter the node reports each slot's minimum, which is nearly always 0.
+    PRIORITY_FEE_ACCOUNTS = (
+        "JUP6LkbZbjS1jKKwapdHNy74zcZ3tLUZoi5QNyVTaV4",   # Jupiter v6 (swaps)
+        "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA",   # SPL Token
+    )
+    TRANSFER_COMPUTE_UNITS = 1_000    # A SOL transfer plus compute-budget instructions needs ~450
+    CLOSE_ACCOUNT_COMPUTE_UNITS = 3_000  # Per close_account instruction
+    TX_MAX_SIZE = 1232                # Bytes; a serialized transaction must fit one packet
+
+    # Rent Reclaim (closing empty token accounts)
+    RENT_RECLAIM_INTERVAL = 300       # Seconds between checks; only scans after a full exit
+    RENT_RECLAIM_JITTER = 30
+    RENT_RECLAIM_DEADLINE = 120
+
+    # Balance Ledger
+    LEDGER_PENDING_TTL = 90  # Seconds an unconfirmed change is trusted (~ blockhash lifetime)
+    LEDGER_DRIFT_WARN = 0.001  # SOL
+
+    # Push-based Pool Detection (RPC websocket logsSubscribe)
+    POOL_DETECTOR_ENABLED = os.getenv("POOL_DETECTOR_ENABLED", "false").lower() == "true"
+    POOL_DETECTOR_MAX_BACKOFF = 30
+    POOL_DETECTOR_FLUSH_INTERVAL = 10  # Seconds detected mints wait before one batched index write
+    # Program id -> (log line marking pool creation, leading instruction data bytes, account indices
+    # of the two pool mints). A log line matches when it equals the marker or continues it after a
+    # space, so "Instruction: InitializeAccount3" from the token program is not a pool creation.
+    POOL_PROGRAMS = {
+        "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8": (   # Raydium AMM v4
+            "Program log: initialize2: InitializeInstruction2", bytes([1]), (8, 9)),
+        "CPMMoo8L3F4NbTegBCKVNunggL7H1ZpdTHKxQB5qKP1C": (   # Raydium CPMM (Anchor "global:initialize")
+            "Program log: Instruction: Initialize", bytes([175, 175, 109, 31, 13, 152, 155, 237]), (4, 5)),
+    }
+    # Quote side of a pool; the other mint is the new token
+    QUOTE_MINTS = {
+        "So11111111111111111111111111111111111111112",   # wSOL
+        "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",  # USDC
+        "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB",  # USDT
+    }
+
+    # Scheduler (seconds): each job has its own interval, jitter and deadline
+    SCAN_INTERVAL = 60
+    SCAN_JITTER = 5
+    SCAN_DEADLINE = 120
+    POSITION_CHECK_INTERVAL = 3
+    POSITION_CHECK_JITTER = 0.5
+    POSITION_CHECK_DEADLINE = 20
+    BALANCE_RECONCILE_INTERVAL = 30
+    BALANCE_RECONCILE_JITTER = 3
+    BALANCE_RECONCILE_DEADLINE = 15
+    HOUSEKEEPING_INTERVAL = 300
+    HOUSEKEEPING_DEADLINE = 60
+
+    # Scan Pipeline
+    PIPELINE_SCREEN_WORKERS = 8   # RugCheck lookups in parallel
+    PIPELINE_QUOTE_WORKERS = 4    # Balance + Jupiter quote
+    PIPELINE_EXECUTE_WORKERS = 2  # Swap build / send
+    PIPELINE_QUEUE_SIZE = 32      # Per-stage backlog before the stage in front blocks
+
+    # HTTP Connection Pools (one long-lived client per upstream)
+    HTTP2_ENABLED = True
+    HTTP_MAX_CONNECTIONS = 20
+    HTTP_MAX_KEEPALIVE = 10
+    HTTP_KEEPALIVE_EXPIRY = 30.0  # Seconds an idle connection is kept open
+    HTTP_CONNECT_TIMEOUT = 5.0
+    # Verify upstream TLS certificates. Set false only behind an intercepting proxy whose CA isn't installed.
+    HTTP_VERIFY_TLS = os.getenv("HTTP_VERIFY_TLS", "true").lower() == "true"
+    JUPITER_TIMEOUT = 10.0
+    RPC_TIMEOUT = 10.0
+    RUGCHECK_TIMEOUT = 10.0
+
+    # RugCheck Report Cache (TTLs in seconds per verdict)
+    RUGCHECK_PASS_TTL = 600           # Passing tokens are re-checked reasonably often
+    RUGCHECK_FAIL_TTL = 6 * 3600      # Failed tokens rarely become trustworthy
+    RUGCHECK_NOT_FOUND_TTL = 300      # RugCheck may not have indexed a brand-new mint yet
+    RUGCHECK_ERROR_TTL = 30           # Transient errors and rate limits
+    RUGCHECK_CACHE_ENTRY_LIMIT = 50_000  # Cached mints (an entry count, not bytes); LRU beyond it
+    RUGCHECK_CACHE_SAVE_INTERVAL = 60
+
+    # Liquidity Probing (entries need MIN_LIQUIDITY_USD of pool depth; 0 disables the check)
+    LIQUIDITY_PROBE_SIZES_USD = (1_000, 5_000, 25_000)  # USDC buy quotes sent concurrently per mint
+    LIQUIDITY_MIN_IMPACT = 0.0001     # Smaller impacts are rounding noise, not a measurement
+    LIQUIDITY_TTL = 60                # Seconds a depth estimate is reused
+    LIQUIDITY_ERROR_TTL = 15          # No usable quote; retry soon
+    LIQUIDITY_CACHE_MAX_ENTRIES = 10_000
+
+    # Price Feed
+    PRICE_BATCH_SIZE = 100     # Mints per price API request
+    PRICE_TTL = 2.0            # Seconds a cached price is reused; below POSITION_CHECK_INTERVAL
+    PRICE_STALE_AFTER = 60.0   # Older prices are not used for sell decisions
+
+    # Position Journal
+    JOURNAL_MAX_BATCH = 256         # Entries per group commit
+    JOURNAL_FSYNC_INTERVAL = 0.2    # Max seconds an entry waits for its fsync
+    POSITION_SNAPSHOT_EVERY = 1000  # Journal entries between compacted snapshots
+
+    # Trade Log
+    TRADE_LOG_MAX_BATCH = 512       # Rows per group commit
+    TRADE_LOG_FLUSH_INTERVAL = 1.0  # Max seconds a row waits in the queue
+    TRADE_STORE_ENABLED = os.getenv("TRADE_STORE_ENABLED", "true").lower() == "true"  # SQLite store with rollups
+    TRADES_BINARY_SINK = os.getenv("TRADES_BINARY_SINK", "false").lower() == "true"
+
+    # Telegram Alerts
+    TELEGRAM_MIN_INTERVAL = 1.0      # Seconds between messages to one chat
+    TELEGRAM_MAX_PER_MINUTE = 20     # Telegram's group-chat limit
+    TELEGRAM_COALESCE_LINGER = 0.5   # Seconds to let a burst land before sending
+    TELEGRAM_DIGEST_THRESHOLD = 3    # Alerts of one kind per round that become a digest
+    TELEGRAM_DIGEST_PREVIEW = 3      # Alerts quoted in full inside a digest
+    TELEGRAM_QUEUE_LIMIT = 1000
+    TELEGRAM_POLL_TIMEOUT = 30       # Server-side long-poll wait for getUpdates
+    TELEGRAM_TIMEOUT = 10.0          # Per-request timeout on top of the long-poll wait
     
     # Sell Logic
     TIER_1_PCT = 0.20
@@ -40,10 +170,37 @@ class Config:
     USOR_TARGET_GAIN = 5.0
     USOR_TRAILING_STOP = 0.30
 
+    # Exit Ladders (see src/engine/exit_ladder.py). "standard" and "usor" are built
+    # from the settings above; these add or replace ladders and assign mints to them.
+    EXIT_LADDERS = {}                 # name -> {"rules": [...], "hold_reason": ...}
+    EXIT_LADDER_ASSIGNMENTS = {}      # mint -> ladder name
+    EXIT_LADDER_DEFAULT = os.getenv("EXIT_LADDER_DEFAULT", "standard")
+    EXIT_LADDERS_FILE = os.getenv("EXIT_LADDERS_FILE")  # JSON: {"ladders", "assignments", "default"}
+    EXIT_LADDER_WINDOW_YEARS = 10     # Years of lockdown windows compiled ahead
+
+    # Backtesting
+    BACKTEST_START_BALANCE = 10.0     # SOL; each token is staked POSITION_SIZE_PCT of this
+    BACKTEST_CHUNK_SIZE = 64          # Parameter combos evaluated per vectorized pass
+
+    # Metrics (Prometheus text format at http://METRICS_HOST:METRICS_PORT/metrics)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+
+    # Dashboard
+    DASHBOARD_BALANCE_TTL = 15        # Seconds a fetched wallet balance is shown before re-querying
+    DASHBOARD_RECENT_TRADES = 10
+    DASHBOARD_CURVE_POINTS = 2000     # PnL curve is downsampled to this many points
+
     # Paths
     BASE_DIR = Path(__file__).parent.parent.parent
     DATA_DIR = BASE_DIR / "data"
     TRADES_LOG = DATA_DIR / "trades.csv"
+    TRADES_BINARY_LOG = DATA_DIR / "trades.bin"
+    TRADE_STORE_FILE = DATA_DIR / "trades.db"
+    MINT_INDEX_FILE = DATA_DIR / "known_mints.idx"
+    RUGCHECK_CACHE_FILE = DATA_DIR / "rugcheck_cache.json"
+    TAX_LEDGER_FILE = DATA_DIR / "tax_ledger.json"
 
     @classmethod
     def validate(cls):
@@ -1,20 +1,43 @@
 import streamlit as st
 import pandas as pd
-import json
-import asyncio
 import sys
-import os
 from pathlib import Path
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from src.config.config import Config
-from src.clients.solana_client import SolanaClient
+from src.engine.tax_ledger import TaxLedger
+from src.dashboard.data_loader import BalanceReader, TradeTail, file_version, load_positions, positions_frame, positions_version
+from src.utils.trade_store import TradeStore
 
 # Page Config
 st.set_page_config(page_title="Skry R&D Dashboard", layout="wide")
 
+# Shared across reruns and sessions: one RPC client, one incremental trade reader
+@st.cache_resource
+def get_balance_reader():
+    return BalanceReader()
+
+@st.cache_resource
+def get_trade_tail():
+    return TradeTail(Config.TRADES_LOG)
+
+@st.cache_data(ttl=Config.DASHBOARD_BALANCE_TTL, show_spinner=False)
+def get_balance():
+    return get_balance_reader().get_balance()
+
+@st.cache_data(max_entries=1, show_spinner=False)
+def get_rollups(version):
+    # Keyed on the database files' (mtime, size); the rollup tables are tiny
+    store = TradeStore(Config.TRADE_STORE_FILE)
+    return store.summary(), store.daily(), store.tokens(limit=10), store.recent(Config.DASHBOARD_RECENT_TRADES)
+
+@st.cache_data(max_entries=1, show_spinner=False)
+def get_positions(version):
+    # Keyed on the files' (mtime, size), so the book is only re-read after a write
+    return load_positions(Config.DATA_DIR / "positions.json", version)
+
 # Password Protection
 def check_password():
     """Returns `True` if the user had the correct password."""
@@ -50,62 +73,57 @@ if check_password():
     # Sidebar
     st.sidebar.header("Status")
     
-    # Async Data Fetch
-    async def get_data():
-        client = SolanaClient()
-        balance = await client.get_sol_balance()
-        return balance
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    balance = loop.run_until_complete(get_data())
-    
+    balance = get_balance()
     st.sidebar.metric("Wallet Balance (SOL)", f"{balance:.4f}")
 
-    # Load Positions
-    positions_file = Config.DATA_DIR / "positions.json"
-    if positions_file.exists():
-        with open(positions_file, 'r') as f:
-            positions = json.load(f)
-    else:
-        positions = {}
+    # Load Positions (snapshot + journal written by the engine)
+    positions = get_positions(positions_version(Config.DATA_DIR / "positions.json"))
 
     st.sidebar.metric("Active Positions", len(positions))
 
+    use_store = Config.TRADE_STORE_ENABLED and Config.TRADE_STORE_FILE.exists()
+    if use_store:
+        db = str(Config.TRADE_STORE_FILE)
+        summary, daily, top_tokens, recent = get_rollups(file_version(db, db + "-wal"))
+    else:
+        # Only rows appended since the last rerun are parsed
+        trades = get_trade_tail()
+        trades.refresh()
+
     # Dashboard Main
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("Active Holdings")
         if positions:
-            df_pos = pd.DataFrame.from_dict(positions, orient='index')
+            df_pos = positions_frame(positions)
             st.dataframe(df_pos)
         else:
             st.info("No active positions.")
 
     with col2:
         st.subheader("Tax Vault")
-        # Calculate from trades.csv
-        trades_file = Config.TRADES_LOG
-        if trades_file.exists():
-            df_trades = pd.read_csv(trades_file)
-            if 'Type' in df_trades.columns:
-                tax_txs = df_trades[df_trades['Reason'].str.contains("Tax", na=False)]
-                # Assuming we log Tax deposits? Or we calculate from PnL?
-                # Let's assume we logged Tax deposits as 'SELL' or 'TAX' type?
-                # If we didn't log them explicitly in CSVLogger, we might miss it.
-                # But we can sum PnL and apply 20%.
-                total_pnl = df_trades['PnL_SOL'].sum()
-                est_tax = total_pnl * 0.20 if total_pnl > 0 else 0
-                st.metric("Est. Tax Liability (20%)", f"{est_tax:.4f} SOL")
-                
-                st.subheader("Recent Trades")
-                st.dataframe(df_trades.tail(10))
+        has_trades = summary["buys"] + summary["sells"] > 0 if use_store else trades.rows > 0
+        if has_trades:
+            total_pnl = summary["realized_pnl"] if use_store else trades.total_pnl
+            est_tax = total_pnl * Config.TAX_RATE if total_pnl > 0 else 0
+            st.metric(f"Est. Tax Liability ({Config.TAX_RATE:.0%})", f"{est_tax:.4f} SOL")
+            tax_state = TaxLedger.read(Config.TAX_LEDGER_FILE)
+            st.metric("Tax Paid to Vault", f"{tax_state.get('total_paid', 0.0):.4f} SOL")
+            st.metric("Tax Accrued (unsettled)", f"{tax_state.get('accrued', 0.0):.4f} SOL")
+            if use_store:
+                st.metric("Win Rate", f"{summary['win_rate']:.0%} of {int(summary['sells'])} sells")
+
+            st.subheader("Recent Trades")
+            st.dataframe(pd.DataFrame(recent) if use_store else trades.recent_frame())
         else:
             st.info("No trade history.")
 
-    # P/L Curve (Mock or Real)
+    # P/L Curve
     st.subheader("Performance Curve")
-    if trades_file.exists() and not df_trades.empty:
-        df_trades['Cumulative_PnL'] = df_trades['PnL_SOL'].cumsum()
-        st.line_chart(df_trades['Cumulative_PnL'])
+    if use_store and daily:
+        st.line_chart(pd.DataFrame(daily).set_index("date")["cumulative_pnl"])
+        st.subheader("Top Tokens")
+        st.dataframe(pd.DataFrame(top_tokens))
+    elif not use_store and trades.rows:
+        st.line_chart(pd.DataFrame({"Cumulative_PnL": trades.curve()}))
@@ -0,0 +1,154 @@
+import asyncio
+import concurrent.futures
+import io
+import os
+import threading
+from collections import deque
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.config.config import Config
+from src.engine.position_book import PositionBook, Tier
+from src.engine.position_store import PositionStore
+from src.utils.csv_logger import CSVLogger
+from src.utils.logger import logger
+
+def file_version(*paths) -> tuple:
+    """(mtime_ns, size) per path, or None if missing. A cache key that changes whenever a file does."""
+    version = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            version.append((st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            version.append(None)
+    return tuple(version)
+
+def positions_version(snapshot_path) -> tuple:
+    snapshot_path = Path(snapshot_path)
+    return file_version(snapshot_path, snapshot_path.with_suffix(".journal"))
+
+def load_positions(snapshot_path, version=None) -> PositionBook:
+    """Read the book. `version` is only there to key the caller's cache."""
+    return PositionBook.from_dict(PositionStore.read(snapshot_path))
+
+def positions_frame(book: PositionBook) -> pd.DataFrame:
+    """One row per mint, built straight from the book's columns."""
+    cols = book.columns()
+    tiers = cols.pop("tiers")
+    frame = pd.DataFrame(cols, index=pd.Index(book.mints, name="mint"))
+    frame["tiers_sold"] = [Tier(int(t)).bit_count() for t in tiers]
+    return frame.drop(columns="ladder")
+
+class TradeTail:
+    """
+    Incremental reader for the trade CSV.
+
+    Keeps the byte offset of the last complete line it parsed, so each
+    `refresh` only parses rows appended since the previous one. A half-written
+    last line is left for the next refresh. It maintains running totals, the
+    cumulative PnL curve, and the last Config.DASHBOARD_RECENT_TRADES rows.
+    If the file is replaced or shrinks, it starts over.
+    """
+
+    def __init__(self, path, recent: int = None):
+        self.path = path
+        self.recent_size = recent or Config.DASHBOARD_RECENT_TRADES
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.offset = 0
+        self.inode = None
+        self.rows = 0
+        self.total_pnl = 0.0
+        self.cum_pnl_buffer = np.empty(1024)  # Grown by doubling; the first `rows` entries are valid
+        self.recent = deque(maxlen=self.recent_size)
+
+    def refresh(self):
+        with self.lock:
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                self._reset()
+                return
+            size = st.st_size
+            if st.st_ino != self.inode or size < self.offset:
+                self._reset()
+                self.inode = st.st_ino
+            if size == self.offset:
+                return
+
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                chunk = f.read(size - self.offset)
+            end = chunk.rfind(b"\n") + 1
+            if end == 0:
+                return
+            start_offset = self.offset
+            self.offset += end
+            chunk = chunk[:end]
+            if start_offset == 0:
+                # Drop the header line
+                chunk = chunk[chunk.find(b"\n") + 1:]
+            if not chunk:
+                return
+
+            df = pd.read_csv(io.BytesIO(chunk), header=None, names=CSVLogger.HEADERS)
+            pnl = pd.to_numeric(df["PnL_SOL"], errors="coerce").fillna(0.0).to_numpy()
+            needed = self.rows + len(pnl)
+            if needed > len(self.cum_pnl_buffer):
+                grown = np.empty(max(needed, 2 * len(self.cum_pnl_buffer)))
+                grown[:self.rows] = self.cum_pnl_buffer[:self.rows]
+                self.cum_pnl_buffer = grown
+            self.cum_pnl_buffer[self.rows:needed] = self.total_pnl + np.cumsum(pnl)
+            self.total_pnl += float(pnl.sum())
+            self.rows = needed
+            self.recent.extend(df.tail(self.recent_size).to_dict("records"))
+
+    def recent_frame(self) -> pd.DataFrame:
+        with self.lock:
+            return pd.DataFrame(list(self.recent), columns=CSVLogger.HEADERS)
+
+    def curve(self, points: int = None) -> np.ndarray:
+        """Cumulative PnL, downsampled to at most `points` values for charting."""
+        points = points or Config.DASHBOARD_CURVE_POINTS
+        with self.lock:
+            curve = self.cum_pnl_buffer[:self.rows].copy() if self.rows <= points else \
+                self.cum_pnl_buffer[np.linspace(0, self.rows - 1, points).astype(int)]
+        return curve
+
+class BalanceReader:
+    """
+    One SolanaClient for the whole dashboard process. The client lives on a
+    background event loop, so Streamlit reruns (run on various threads) reuse
+    its connection instead of creating a client and a loop each time. A slow
+    or failing RPC shows the last balance read (0.0 before the first one).
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="DashboardRPC", daemon=True)
+        self.thread.start()
+        self.last_balance = 0.0
+        self.client = self._run(self._create_client())
+
+    @staticmethod
+    async def _create_client():
+        # Imported here so the data loaders above don't need the Solana stack
+        from src.clients.solana_client import SolanaClient
+        return SolanaClient()
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout=Config.RPC_TIMEOUT)
+
+    def get_balance(self) -> float:
+        future = asyncio.run_coroutine_threadsafe(self.client.get_sol_balance(), self.loop)
+        try:
+            self.last_balance = future.result(timeout=Config.RPC_TIMEOUT)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            logger.warning(f"Balance read timed out after {Config.RPC_TIMEOUT}s; showing the last known value.")
+        except Exception as e:
+            logger.error(f"Balance read failed: {e}")
+        return self.last_balance
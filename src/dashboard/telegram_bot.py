@@ -1,7 +1,139 @@
 import requests
 import asyncio
+import time
+from collections import deque
 from src.config.config import Config
 from src.utils.logger import logger
+from src.clients.http_pool import build_async_client
+from src.utils.trade_store import TradeStore
+from src.utils.metrics import track_upstream, queue_depth
+
+class ChatRateLimiter:
+    """Telegram per-chat limits: one message per MIN_INTERVAL and MAX_PER_MINUTE per rolling minute."""
+
+    def __init__(self, min_interval: float = None, max_per_minute: int = None):
+        self.min_interval = Config.TELEGRAM_MIN_INTERVAL if min_interval is None else min_interval
+        self.max_per_minute = max_per_minute or Config.TELEGRAM_MAX_PER_MINUTE
+        self.sent = deque()
+        self.blocked_until = 0.0
+
+    def delay(self) -> float:
+        """Seconds to wait before the next message may go out."""
+        now = time.monotonic()
+        while self.sent and now - self.sent[0] >= 60:
+            self.sent.popleft()
+        wait = self.blocked_until - now
+        if self.sent:
+            wait = max(wait, self.sent[-1] + self.min_interval - now)
+        if len(self.sent) >= self.max_per_minute:
+            wait = max(wait, self.sent[0] + 60 - now)
+        return max(wait, 0.0)
+
+    async def acquire(self):
+        wait = self.delay()
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = self.delay()
+        self.sent.append(time.monotonic())
+
+    def back_off(self, seconds: float):
+        """Honor a 429 retry_after from Telegram."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+class NotificationQueue:
+    """
+    Outbound alert queue drained by a dedicated sender task.
+
+    `push()` never blocks, so alerts add nothing to trade latency. The sender
+    waits a short linger after the first alert and then respects the chat
+    rate limit, and alerts pile up while it waits. Each round, any kind with
+    at least Config.TELEGRAM_DIGEST_THRESHOLD alerts is folded into one
+    digest (e.g. "12 sells in the last 5s").
+    """
+
+    KIND_LABELS = {"buy": "buys", "sell": "sells", "tax": "tax deposits"}
+
+    def __init__(self, send, limiter: ChatRateLimiter = None):
+        self.send = send  # async callable(text) -> retry_after seconds or None
+        self.limiter = limiter or ChatRateLimiter()
+        self.pending = []
+        self.first_pending_at = None
+        self.dropped = 0
+        self.wakeup = None
+        self.task = None
+        queue_depth.labels("telegram").set_function(lambda: len(self.pending))
+
+    def push(self, kind: str, text: str):
+        if self.task is None:
+            self.start()
+        if len(self.pending) >= Config.TELEGRAM_QUEUE_LIMIT:
+            self.pending.pop(0)
+            self.dropped += 1
+        if not self.pending:
+            self.first_pending_at = time.monotonic()
+        self.pending.append((kind, text))
+        self.wakeup.set()
+
+    def start(self):
+        self.wakeup = asyncio.Event()
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self, timeout: float = 10.0):
+        """Send what is still queued (best effort) and stop the sender."""
+        if self.task is None:
+            return
+        self.task.cancel()
+        await asyncio.gather(self.task, return_exceptions=True)
+        self.task = None
+        if self.pending:
+            try:
+                await asyncio.wait_for(self._send_round(), timeout)
+            except Exception as e:
+                logger.error(f"Dropped {len(self.pending)} Telegram alerts on shutdown: {e}")
+
+    async def _run(self):
+        while True:
+            if not self.pending:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+            await asyncio.sleep(Config.TELEGRAM_COALESCE_LINGER)
+            await self._send_round()
+
+    async def _send_round(self):
+        for text in self._coalesce():
+            await self.limiter.acquire()
+            try:
+                retry_after = await self.send(text)
+            except Exception as e:
+                logger.error(f"Failed to send Telegram message: {e}")
+                continue
+            if retry_after:
+                self.limiter.back_off(retry_after)
+
+    def _coalesce(self):
+        batch, self.pending = self.pending, []
+        window = time.monotonic() - self.first_pending_at if batch else 0.0
+        dropped, self.dropped = self.dropped, 0
+
+        by_kind = {}
+        for kind, text in batch:
+            by_kind.setdefault(kind, []).append(text)
+
+        texts = []
+        for kind, kind_texts in by_kind.items():
+            if len(kind_texts) >= Config.TELEGRAM_DIGEST_THRESHOLD:
+                label = self.KIND_LABELS.get(kind, f"{kind} alerts")
+                preview = "\n\n".join(kind_texts[:Config.TELEGRAM_DIGEST_PREVIEW])
+                more = len(kind_texts) - Config.TELEGRAM_DIGEST_PREVIEW
+                digest = f"📦 **{len(kind_texts)} {label} in the last {max(window, 1):.0f}s**\n\n{preview}"
+                if more > 0:
+                    digest += f"\n\n…and {more} more."
+                texts.append(digest)
+            else:
+                texts.extend(kind_texts)
+        if dropped:
+            texts.append(f"⚠️ {dropped} alerts dropped (queue full).")
+        return texts
 
 class TelegramBot:
     def __init__(self):
@@ -10,13 +142,18 @@ class TelegramBot:
         self.base_url = f"https://api.telegram.org/bot{self.token}"
         self.offset = 0
         self.bot_engine = None  # Reference to the bot engine
+        self.notifications = NotificationQueue(self.send_message_async)
+        self.client = None
+        self.poll_task = None
+        self.handlers = set()
 
     def set_engine(self, engine):
         self.bot_engine = engine
 
     def send_message(self, message: str):
+        """Blocking send. Returns Telegram's retry_after in seconds if we were rate limited."""
         if not self.token or not self.chat_id:
-            return
+            return None
 
         url = f"{self.base_url}/sendMessage"
         payload = {
@@ -25,34 +162,114 @@ class TelegramBot:
             "parse_mode": "Markdown"
         }
         try:
-            requests.post(url, json=payload, timeout=5)
+            resp = requests.post(url, json=payload, timeout=5)
+            if resp.status_code == 429:
+                retry_after = resp.json().get("parameters", {}).get("retry_after", 5)
+                logger.warning(f"Telegram rate limited us for {retry_after}s")
+                return retry_after
         except Exception as e:
             logger.error(f"Failed to send Telegram message: {e}")
+        return None
+
+    def open(self):
+        """Create the persistent client used for polling and sending."""
+        if self.client is None:
+            # Reads must outlast the server-side long-poll timeout
+            self.client = build_async_client(Config.TELEGRAM_POLL_TIMEOUT + Config.TELEGRAM_TIMEOUT)
+        return self.client
+
+    async def send_message_async(self, message: str):
+        """Returns Telegram's retry_after in seconds if we were rate limited."""
+        if not self.token or not self.chat_id:
+            return None
+
+        url = f"{self.base_url}/sendMessage"
+        payload = {
+            "chat_id": self.chat_id,
+            "text": message,
+            "parse_mode": "Markdown"
+        }
+        try:
+            with track_upstream("telegram", "sendMessage") as call:
+                resp = await self.open().post(url, json=payload, timeout=Config.TELEGRAM_TIMEOUT)
+                if resp.status_code != 200:
+                    call.fail()
+            if resp.status_code == 429:
+                retry_after = resp.json().get("parameters", {}).get("retry_after", 5)
+                logger.warning(f"Telegram rate limited us for {retry_after}s")
+                return retry_after
+        except Exception as e:
+            logger.error(f"Failed to send Telegram message: {e}")
+        return None
+
+    def notify(self, kind: str, message: str):
+        """Queue an alert without blocking. Outside an event loop it is sent directly."""
+        if not self.token or not self.chat_id:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self.send_message(message)
+            return
+        self.notifications.push(kind, message)
+
+    def start(self):
+        """Start long-polling for commands in the background."""
+        if self.poll_task is None:
+            self.poll_task = asyncio.create_task(self.poll_updates())
+        return self.poll_task
+
+    async def close(self):
+        """Stop polling, let running commands finish or cancel them, flush alerts, close the client."""
+        if self.poll_task is not None:
+            self.poll_task.cancel()
+            await asyncio.gather(self.poll_task, return_exceptions=True)
+            self.poll_task = None
+        if self.handlers:
+            _, pending = await asyncio.wait(self.handlers, timeout=Config.TELEGRAM_TIMEOUT)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        await self.notifications.close()
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
 
     async def poll_updates(self):
-        """Simple long-polling for commands"""
+        """Long-poll for commands. Each update is handled in its own task."""
         if not self.token: 
             return
 
+        url = f"{self.base_url}/getUpdates"
         while True:
             try:
-                url = f"{self.base_url}/getUpdates"
-                params = {"offset": self.offset, "timeout": 30}
-                # Use requests in thread executor to not block asyncio loop
-                loop = asyncio.get_event_loop()
-                resp = await loop.run_in_executor(None, lambda: requests.get(url, params=params, timeout=35))
+                params = {"offset": self.offset, "timeout": Config.TELEGRAM_POLL_TIMEOUT}
+                resp = await self.open().get(url, params=params)
                 
                 if resp.status_code == 200:
                     data = resp.json()
                     if data["ok"]:
                         for result in data["result"]:
                             self.offset = result["update_id"] + 1
-                            await self.handle_update(result)
+                            self._dispatch(result)
+                else:
+                    logger.warning(f"Telegram polling failed: {resp.status_code}")
+                    await asyncio.sleep(5)
             except Exception as e:
                 logger.error(f"Telegram polling error: {e}")
                 await asyncio.sleep(5)
-            
-            await asyncio.sleep(1)
+
+    def _dispatch(self, update):
+        # A slow command (e.g. /balance waiting on RPC) must not hold up the others
+        task = asyncio.create_task(self._handle_safely(update))
+        self.handlers.add(task)
+        task.add_done_callback(self.handlers.discard)
+
+    async def _handle_safely(self, update):
+        try:
+            await self.handle_update(update)
+        except Exception as e:
+            logger.error(f"Telegram command failed: {e}")
 
     async def handle_update(self, update):
         if "message" not in update: return
@@ -74,10 +291,8 @@ class TelegramBot:
         
         elif text == "/start_bot":
             if self.bot_engine:
+                # The scheduler keeps running while paused, so this resumes the trading jobs
                 self.bot_engine.running = True
-                # Restart loop if it was broken? 
-                # Actually, the loop checks 'running'. If it exited, we can't restart easily without re-triggering start()
-                # But typically 'running' controls the while loop.
                 await self.send_message_async("✅ Bot resumed.")
         
         elif text == "/stop_bot":
@@ -87,18 +302,41 @@ class TelegramBot:
 
         elif text == "/balance":
             if self.bot_engine:
-                bal = await self.bot_engine.solana.get_sol_balance()
-                await self.send_message_async(f"💰 **Balance**: {bal:.4f} SOL")
+                ledger = self.bot_engine.solana.ledger
+                if not ledger.synced:
+                    await self.bot_engine.solana.reconcile_balance()
+                age = time.time() - ledger.last_reconciled if ledger.last_reconciled else 0
+                await self.send_message_async(
+                    f"💰 **Balance**: {ledger.balance or 0.0:.4f} SOL\n"
+                    f"Reserved: {ledger.reserved:.4f} SOL | Available: {ledger.available:.4f} SOL\n"
+                    f"Reconciled {age:.0f}s ago"
+                )
+
+        elif text == "/pnl":
+            await self.send_message_async(await asyncio.to_thread(self.format_pnl))
 
-    async def send_message_async(self, message):
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, lambda: self.send_message(message))
+    @staticmethod
+    def format_pnl(days: int = 7) -> str:
+        """PnL report from the trade store's rollups."""
+        store = TradeStore(Config.TRADE_STORE_FILE)
+        total = store.summary()
+        lines = [
+            "📈 **PnL**",
+            f"Realized: {total['realized_pnl']:+.4f} SOL over {int(total['sells'])} sells (win rate {total['win_rate']:.0%})",
+            f"Volume: {total['volume_sol']:.4f} SOL | Tax accrued: {total['tax_accrued']:.4f} | paid: {total['tax_paid']:.4f}",
+        ]
+        for day in store.daily(days):
+            lines.append(f"`{day['date']}` {day['realized_pnl']:+.4f} SOL ({int(day['sells'])} sells, {day['win_rate']:.0%} wins)")
+        best = store.tokens(limit=3)
+        if best:
+            lines.append("Top tokens: " + ", ".join(f"`{t['token'][:6]}` {t['realized_pnl']:+.3f}" for t in best))
+        return "\n".join(lines)
 
     def notify_buy(self, mint, amount_sol, price):
-        self.send_message(f"🟢 **BUY ALERT**\nToken: `{mint}`\nAmount: {amount_sol} SOL\nPrice: {price}")
+        self.notify("buy", f"🟢 **BUY ALERT**\nToken: `{mint}`\nAmount: {amount_sol} SOL\nPrice: {price}")
 
     def notify_sell(self, mint, amount_sol, price, reason, pnl_pct):
-        self.send_message(f"🔴 **SELL ALERT**\nToken: `{mint}`\nReason: {reason}\nPnL: {pnl_pct*100:.2f}%")
+        self.notify("sell", f"🔴 **SELL ALERT**\nToken: `{mint}`\nReason: {reason}\nPnL: {pnl_pct*100:.2f}%")
 
     def notify_tax(self, amount_sol):
-        self.send_message(f"🏛️ **TAX DEPOSIT**\nSent {amount_sol} SOL to Vault.")
+        self.notify("tax", f"🏛️ **TAX DEPOSIT**\nSent {amount_sol:.6f} SOL to Vault.")
@@ -0,0 +1,210 @@
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import numpy as np
+from src.config.config import Config
+from src.engine.money_manager import MoneyManager
+from src.engine.strategy import Strategy, SellReason
+
+class PricePaths:
+    """
+    Price paths in SOL per token: `prices[token, step]` sampled at `timestamps[step]`
+    (epoch seconds). `is_usor` flags rows that follow the USOR rules.
+    """
+
+    def __init__(self, prices, timestamps, is_usor=None):
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)
+        self.is_usor = np.zeros(len(self.prices), dtype=bool) if is_usor is None else np.asarray(is_usor, dtype=bool)
+
+    @property
+    def n_tokens(self) -> int:
+        return self.prices.shape[0]
+
+    @property
+    def n_steps(self) -> int:
+        return self.prices.shape[1]
+
+    @classmethod
+    def synthetic(cls, n_tokens, n_steps, step_seconds=None, start=None, drift=0.0, volatility=0.03, rug_rate=0.0005, seed=0):
+        """
+        Random-walk paths starting at 1.0: log-normal steps plus rugs, where a
+        token loses 99% at a random step with probability `rug_rate` per step.
+        """
+        rng = np.random.default_rng(seed)
+        step_seconds = step_seconds or Config.POSITION_CHECK_INTERVAL
+        log_returns = rng.normal(drift, volatility, size=(n_tokens, n_steps))
+        log_returns[:, 0] = 0.0
+        prices = np.exp(np.cumsum(log_returns, axis=1))
+        rugged = rng.random((n_tokens, n_steps)) < rug_rate
+        rugged[:, 0] = False
+        prices *= np.where(np.cumsum(rugged, axis=1) > 0, 0.01, 1.0)
+        start = time.time() if start is None else start
+        return cls(prices, start + np.arange(n_steps) * step_seconds)
+
+    def save(self, path):
+        np.savez_compressed(path, prices=self.prices, timestamps=self.timestamps, is_usor=self.is_usor)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        return cls(data["prices"], data["timestamps"], data["is_usor"])
+
+class Backtest:
+    """
+    Replays price paths through Strategy.get_sell_actions, MoneyManager
+    sizing and the tax rule, with the same state transitions as the
+    engine's manage cycle (high-water mark, tier flags, full exit on a 100%
+    sell or dust).
+
+    `run_many` evaluates a list of parameter sets in one vectorized pass:
+    every (combo, token) pair is a row, and each combo's settings are
+    broadcast as per-row arrays. `clock` maps a step timestamp to the
+    datetime used for the lockdown check, instead of the wall clock.
+    """
+
+    def __init__(self, paths: PricePaths, stake_sol: float = None, clock=None):
+        self.paths = paths
+        self.stake_sol = stake_sol or MoneyManager.calculate_position_size(Config.BACKTEST_START_BALANCE)
+        self.clock = clock or datetime.fromtimestamp
+
+    def lockdown_mask(self) -> np.ndarray:
+        return np.array([Strategy.in_lockdown(self.clock(ts)) for ts in self.paths.timestamps])
+
+    def run(self, params: dict = None) -> dict:
+        return self.run_many([params or {}])[0]
+
+    def run_many(self, combos) -> list:
+        combos = [dict(c) for c in combos]
+        k, n = len(combos), self.paths.n_tokens
+        rows = k * n
+        names = sorted({name for combo in combos for name in combo})
+        defaults = Strategy._params()
+        # Row r belongs to combo r // n and token r % n
+        params = {name: np.repeat([c.get(name, defaults[name]) for c in combos], n) for name in names}
+        lockdown = self.lockdown_mask()
+
+        prices = self.paths.prices
+        usor = np.tile(self.paths.is_usor, k)
+        entry = np.tile(prices[:, 0], k)
+        high = entry.copy()
+        remaining = self.stake_sol / entry
+        t1 = np.zeros(rows, dtype=bool)
+        t2 = np.zeros(rows, dtype=bool)
+        t3 = np.zeros(rows, dtype=bool)
+        is_open = entry > 0
+
+        realized = np.zeros(rows)
+        tax = np.zeros(rows)
+        sells = np.zeros(rows, dtype=np.int64)
+        wins = np.zeros(rows, dtype=np.int64)
+        exits = np.zeros((rows, len(SellReason)), dtype=np.int64)
+
+        for step in range(1, self.paths.n_steps):
+            if not is_open.any():
+                break
+            current = np.tile(prices[:, step], k)
+            np.maximum(high, current, out=high)
+            sell, pct, reason = Strategy.get_sell_actions(current, entry, high, t1, t2, t3, usor, lockdown[step], params=params)
+            idx = np.flatnonzero(sell & is_open)
+            if not len(idx):
+                continue
+
+            amount = remaining[idx] * pct[idx]
+            pnl = (current[idx] - entry[idx]) * amount
+            realized[idx] += pnl
+            tax[idx] += MoneyManager.calculate_taxes(pnl)
+            sells[idx] += 1
+            wins[idx] += pnl > 0
+            np.add.at(exits, (idx, reason[idx]), 1)
+
+            remaining[idx] -= amount
+            r = reason[idx]
+            t1[idx] |= r == SellReason.TIER_1_PROFIT
+            t2[idx] |= r == SellReason.TIER_2_PROFIT
+            t3[idx] |= r == SellReason.TIER_3_PROFIT
+            is_open[idx] &= ~((pct[idx] == 1.0) | (remaining[idx] < 0.0001))
+
+        # Positions still open are marked to the last price
+        unrealized = np.where(is_open, (np.tile(prices[:, -1], k) - entry) * remaining, 0.0)
+
+        def per_combo(values):
+            return values.reshape(k, n).sum(axis=1)
+
+        totals = {
+            "realized_pnl": per_combo(realized),
+            "tax": per_combo(tax),
+            "unrealized_pnl": per_combo(unrealized),
+            "sells": per_combo(sells),
+            "wins": per_combo(wins),
+            "open_positions": per_combo(is_open.astype(np.int64)),
+        }
+        exit_counts = exits.reshape(k, n, len(SellReason)).sum(axis=1)
+
+        results = []
+        for i, combo in enumerate(combos):
+            result = {name: float(totals[name][i]) for name in ("realized_pnl", "tax", "unrealized_pnl")}
+            result.update({name: int(totals[name][i]) for name in ("sells", "wins", "open_positions")})
+            result["net_pnl"] = result["realized_pnl"] - result["tax"]
+            result["win_rate"] = result["wins"] / result["sells"] if result["sells"] else 0.0
+            result["exits"] = {SellReason(code).label: int(c) for code, c in enumerate(exit_counts[i]) if c}
+            result["params"] = combo
+            results.append(result)
+        return results
+
+def param_grid(grid: dict) -> list:
+    """{"TIER_1_GAIN": [0.2, 0.3], ...} -> list of every combination as a dict."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+_worker_backtest = None
+
+def _init_worker(paths, stake_sol):
+    global _worker_backtest
+    _worker_backtest = Backtest(paths, stake_sol)
+
+def _run_chunk(combos):
+    return _worker_backtest.run_many(combos)
+
+def sweep(paths: PricePaths, grid: dict, processes: int = None, chunk_size: int = None, stake_sol: float = None) -> list:
+    """
+    Backtest every combination in `grid`, sorted by net PnL (best first).
+    Combos are evaluated `chunk_size` at a time in one vectorized pass, with
+    chunks spread over `processes` worker processes (the paths are sent to
+    each worker once). processes=1 runs in this process.
+    """
+    combos = param_grid(grid)
+    chunk_size = chunk_size or Config.BACKTEST_CHUNK_SIZE
+    chunks = [combos[i:i + chunk_size] for i in range(0, len(combos), chunk_size)]
+
+    if processes == 1 or len(chunks) == 1:
+        backtest = Backtest(paths, stake_sol)
+        results = [r for chunk in chunks for r in backtest.run_many(chunk)]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(paths, stake_sol)) as pool:
+            results = [r for chunk_results in pool.map(_run_chunk, chunks) for r in chunk_results]
+    return sorted(results, key=lambda r: r["net_pnl"], reverse=True)
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Sweep exit-ladder settings over price paths.")
+    parser.add_argument("--paths", help="npz file saved with PricePaths.save (default: synthetic)")
+    parser.add_argument("--tokens", type=int, default=1000)
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    paths = PricePaths.load(args.paths) if args.paths else PricePaths.synthetic(args.tokens, args.steps)
+    grid = {
+        "TIER_1_GAIN": [0.15, 0.25, 0.35],
+        "TIER_2_GAIN": [0.4, 0.5, 0.75],
+        "TIER_3_GAIN": [0.8, 1.0, 1.5],
+        "MOONBAG_TRAILING_STOP": [0.1, 0.15, 0.2, 0.3],
+    }
+    started = time.time()
+    results = sweep(paths, grid, processes=args.processes)
+    print(f"{len(results)} combos x {paths.n_tokens} tokens x {paths.n_steps} steps in {time.time() - started:.1f}s")
+    for r in results[:args.top]:
+        print(f"net {r['net_pnl']:+.4f} SOL  win {r['win_rate']:.0%}  open {r['open_positions']}  {r['params']}")
@@ -1,5 +1,7 @@
 import asyncio
-import json
+import functools
+import numpy as np
+import signal
 import time
 from pathlib import Path
 from datetime import datetime
@@ -20,10 +22,19 @@ try:
     from src.clients.solana_client import SolanaClient
     from src.clients.jupiter_client import JupiterClient
     from src.clients.rugcheck_client import RugCheckClient
-    from src.engine.strategy import Strategy
+    from src.clients.price_feed import PriceFeed
+    from src.clients.liquidity import LiquidityEstimator
+    from src.clients.pool_detector import PoolDetector
+    from src.engine.strategy import SellReason
     from src.engine.money_manager import MoneyManager
+    from src.engine.pipeline import ScanPipeline
+    from src.engine.position_store import PositionStore
+    from src.engine.exit_ladder import ExitLadders
+    from src.engine.tax_ledger import TaxLedger
+    from src.engine.scheduler import Scheduler, Job
     from src.dashboard.telegram_bot import TelegramBot
     from src.utils.csv_logger import CSVLogger
+    from src.utils.metrics import MetricsServer, stage_seconds, open_positions
 except ImportError as e:
     # Fallback for direct execution
     sys.path.append(os.getcwd())
@@ -32,199 +43,385 @@ except ImportError as e:
     from src.clients.solana_client import SolanaClient
     from src.clients.jupiter_client import JupiterClient
     from src.clients.rugcheck_client import RugCheckClient
-    from src.engine.strategy import Strategy
+    from src.clients.price_feed import PriceFeed
+    from src.clients.liquidity import LiquidityEstimator
+    from src.clients.pool_detector import PoolDetector
+    from src.engine.strategy import SellReason
     from src.engine.money_manager import MoneyManager
+    from src.engine.pipeline import ScanPipeline
+    from src.engine.position_store import PositionStore
+    from src.engine.exit_ladder import ExitLadders
+    from src.engine.tax_ledger import TaxLedger
+    from src.engine.scheduler import Scheduler, Job
     from src.dashboard.telegram_bot import TelegramBot
     from src.utils.csv_logger import CSVLogger
+    from src.utils.metrics import MetricsServer, stage_seconds, open_positions
 
 class BotEngine:
     def __init__(self):
         self.solana = SolanaClient()
         self.jupiter = JupiterClient()
         self.rugcheck = RugCheckClient()
+        self.prices = PriceFeed(self.jupiter)
+        self.liquidity = LiquidityEstimator(self.jupiter)
         self.telegram = TelegramBot()
         self.positions_file = Config.DATA_DIR / "positions.json"
+        self.store = PositionStore(self.positions_file)
         self.positions = self.load_positions()
+        # Compiled once; a bad ladder config stops startup here rather than mid-cycle
+        self.ladders = ExitLadders.from_config()
+        self.ledger = self.solana.ledger
+        self.tax = TaxLedger(Config.TAX_LEDGER_FILE)
+        self.tax.load()
+        self.pipeline = ScanPipeline(self)
+        self.scheduler = self.build_scheduler()
+        self.detector = None
+        self.metrics = MetricsServer() if Config.METRICS_ENABLED else None
+        open_positions.labels().set_function(lambda: len(self.positions))
+        self.pending_buys = {}  # mint -> SOL spent, for buys whose BUY alert waits for an entry price
+        self.reclaim_due = True  # Sweep accounts left over from earlier runs once
         self.running = False
 
     def load_positions(self):
-        if self.positions_file.exists():
-            try:
-                with open(self.positions_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.error(f"Failed to load positions: {e}")
-        return {}
-
-    def save_positions(self):
+        """Recover the book from the last snapshot plus the journal."""
         try:
-            with open(self.positions_file, 'w') as f:
-                json.dump(self.positions, f, indent=2)
+            return self.store.load()
         except Exception as e:
-            logger.error(f"Failed to save positions: {e}")
+            logger.error(f"Failed to load positions: {e}")
+        return self.store.positions
 
     async def start(self):
         self.running = True
         logger.info("Starting Skry R&D Autonomous Engine...")
         
+        # Open pooled upstream connections once for the lifetime of the engine
+        self.jupiter.open()
+        self.rugcheck.open()
+
+        if self.metrics:
+            await self.metrics.start()
+
         # Link engine to telegram
         self.telegram.set_engine(self)
         
         # Start Telegram Polling in background
-        asyncio.create_task(self.telegram.poll_updates())
+        self.telegram.start()
+
+        # Optional push-based detection alongside the token-list scan
+        if Config.POOL_DETECTOR_ENABLED:
+            self.detector = PoolDetector(self.solana, self.jupiter.known_tokens, self.on_new_pool_mint)
+            self.detector.start()
         
-        # Main Loop
-        while self.running:
+        # Let SIGTERM (docker stop, pm2) take the same clean path as Ctrl+C
+        main_task = asyncio.current_task()
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, main_task.cancel)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+        # Each cycle runs on its own cadence; /stop_bot pauses the trading jobs
+        try:
+            await self.scheduler.run()
+        except asyncio.CancelledError:
+            logger.info("Bot stopped by user.")
+        finally:
+            await self.shutdown()
+
+    def build_scheduler(self):
+        scheduler = Scheduler(is_paused=lambda: not self.running)
+        scheduler.add(Job("scan", self.scan_cycle, Config.SCAN_INTERVAL,
+                          jitter=Config.SCAN_JITTER, deadline=Config.SCAN_DEADLINE, overrun=Job.SKIP))
+        # Trailing stops are checked every few seconds regardless of what the scanner is doing
+        scheduler.add(Job("positions", self.manage_positions_cycle, Config.POSITION_CHECK_INTERVAL,
+                          jitter=Config.POSITION_CHECK_JITTER, deadline=Config.POSITION_CHECK_DEADLINE, overrun=Job.IMMEDIATE))
+        scheduler.add(Job("balance", self.reconcile_balance, Config.BALANCE_RECONCILE_INTERVAL,
+                          jitter=Config.BALANCE_RECONCILE_JITTER, deadline=Config.BALANCE_RECONCILE_DEADLINE, overrun=Job.SKIP))
+        # Keep a fresh blockhash and fee estimate so sends don't wait on RPC.
+        # Without a keypair nothing is ever sent, so there is nothing to prefetch.
+        if self.solana.keypair:
+            scheduler.add(Job("blockhash", self.solana.blockhashes.refresh, Config.BLOCKHASH_REFRESH_INTERVAL,
+                              deadline=Config.BLOCKHASH_REFRESH_INTERVAL, overrun=Job.SKIP))
+            fee_sample = functools.partial(self.solana.fees.sample, self.solana.fee_accounts())
+            scheduler.add(Job("priority_fees", fee_sample, Config.PRIORITY_FEE_SAMPLE_INTERVAL,
+                              deadline=Config.PRIORITY_FEE_SAMPLE_INTERVAL, overrun=Job.SKIP))
+        scheduler.add(Job("tax", self.settle_tax, Config.TAX_SETTLE_CHECK_INTERVAL,
+                          deadline=Config.TAX_SETTLE_DEADLINE, overrun=Job.SKIP, paused_ok=True))
+        scheduler.add(Job("rent_reclaim", self.reclaim_rent, Config.RENT_RECLAIM_INTERVAL,
+                          jitter=Config.RENT_RECLAIM_JITTER, deadline=Config.RENT_RECLAIM_DEADLINE, overrun=Job.SKIP, paused_ok=True))
+        scheduler.add(Job("housekeeping", self.housekeeping, Config.HOUSEKEEPING_INTERVAL,
+                          deadline=Config.HOUSEKEEPING_DEADLINE, overrun=Job.SKIP, paused_ok=True))
+        return scheduler
+
+    async def reconcile_balance(self):
+        """Settle the balance ledger against the chain."""
+        if await self.solana.reconcile_balance():
+            logger.info(f"Wallet balance: {self.ledger.balance:.4f} SOL ({self.ledger.reserved:.4f} reserved, drift {self.ledger.last_drift:+.6f})")
+
+    async def settle_tax(self, force: bool = False):
+        """Persist new accruals, then pay accrued tax to the vault once it's due."""
+        await self.tax.flush()
+        if not Config.TAX_VAULT_ADDRESS:
+            return
+        paid = await self.tax.settle(lambda amount: self.solana.transfer_sol(Config.TAX_VAULT_ADDRESS, amount), force=force)
+        if paid:
+            self.telegram.notify_tax(paid)
+
+    async def reclaim_rent(self):
+        """Close the token accounts emptied by full exits since the last run."""
+        if not self.reclaim_due:
+            return
+        self.reclaim_due = False
+        # Held mints keep their accounts; a position may still be selling down
+        closed = await self.solana.close_empty_accounts(exclude_mints=set(self.positions))
+        if closed:
+            logger.info(f"Rent reclaim closed {closed} token accounts.")
+
+    async def housekeeping(self):
+        """Flush buffered writes and compact state files."""
+        await asyncio.to_thread(CSVLogger.flush)
+        self.store.snapshot()
+        await self.rugcheck.save()
+        logger.info(f"Scheduler stats: {self.scheduler.stats()}")
+        logger.info(f"Priority fee percentiles (uL/CU): {self.solana.fees.percentiles()} -> bidding {self.solana.fees.estimate()}")
+
+    async def shutdown(self):
+        """Stop pipeline workers and close upstream connections."""
+        logger.info("Shutting down engine...")
+        self.running = False
+        if self.detector:
+            await self.detector.close()
+        await self.pipeline.close()
+        try:
+            await self.settle_tax(force=True)
+        except Exception as e:
+            logger.error(f"Final tax settlement failed: {e}")
+        await asyncio.to_thread(self.store.shutdown)
+        await asyncio.to_thread(CSVLogger.close)
+        await self.telegram.close()
+        if self.metrics:
+            await self.metrics.close()
+        for client in (self.jupiter, self.rugcheck, self.solana):
             try:
-                await self.scan_cycle()
-                await self.manage_positions_cycle()
-                await asyncio.sleep(60) # Scan every minute
-            except asyncio.CancelledError:
-                logger.info("Bot stopped by user.")
-                break
+                await client.close()
             except Exception as e:
-                logger.error(f"Main loop error: {e}")
-                # Wait before retrying to avoid rapid crash loops
-                await asyncio.sleep(60)
+                logger.error(f"Failed to close {type(client).__name__}: {e}")
 
     async def scan_cycle(self):
         try:
             logger.info("Scanning for new tokens...")
             new_tokens = await self.jupiter.scan_new_tokens()
             
-            for mint in new_tokens:
-                await self.analyze_and_trade(mint)
+            if new_tokens:
+                await self.pipeline.run(new_tokens)
         except Exception as e:
             logger.error(f"Scan cycle failed: {e}")
 
 
+    async def on_new_pool_mint(self, mint):
+        """Feed a mint from the pool detector straight into the analysis pipeline."""
+        if self.running:
+            await self.pipeline.submit(mint)
+
     async def analyze_and_trade(self, mint):
+        """Run a single mint through every pipeline stage in order."""
+        with stage_seconds.labels("analyze").time():
+            if not await self.screen_token(mint):
+                return
+            order = await self.quote_token(mint)
+            if order:
+                quote, position_size = order
+                await self.execute_trade(mint, quote, position_size)
+
+    async def screen_token(self, mint):
         logger.info(f"Analyzing {mint}...")
+        if mint in self.positions:
+            return False
         
         # 1. RugCheck
         report = await self.rugcheck.get_token_report(mint)
         if not report or not self.rugcheck.is_trustable(report):
             logger.info(f"Token {mint} failed RugCheck (Score: {report.get('score') if report else 'N/A'})")
-            return
+            return False
 
-        # 2. Liquidity Check (via Quote)
-        # Try to buy $100k worth? No, just check if we CAN swap a significant amount with low impact?
-        # User Req: "monitor new pools with >$100k liquidity"
-        # Jupiter Quote API returns 'impact'.
-        # Let's try to quote 1 SOL. If price impact is huge, liquidity is low.
-        # Better: Quote 1000 USD worth of SOL.
-        # But to check TOTAL liquidity > 100k, we can't easily do that via Quote API without probing.
-        # Proxy: If we can sell $1000 with < 1% impact, liquidity is likely decent (~$100k+).
-        # Or just trust RugCheck's liquidity data if available?
-        # RugCheck report usually contains liquidity info.
-        
-        liquidity = 0
-        if report and 'tokenProgram' in report.get('raw', {}):
-            # Try to parse liquidity from RugCheck raw data if possible
-            # But let's rely on Jupiter Quote for execution feasibility
-            pass
+        # 2. Liquidity: pool depth fitted from concurrent multi-size quotes
+        if Config.MIN_LIQUIDITY_USD > 0:
+            depth = await self.liquidity.get_depth(mint)
+            if depth is None or depth < Config.MIN_LIQUIDITY_USD:
+                shown = f"${depth:,.0f}" if depth is not None else "N/A"
+                logger.info(f"Token {mint} failed liquidity check (Depth: {shown}, need ${Config.MIN_LIQUIDITY_USD:,.0f})")
+                return False
 
-        # 3. Buy Logic
-        balance = await self.solana.get_sol_balance()
-        position_size = MoneyManager.calculate_position_size(balance)
+        return True
+
+    async def quote_token(self, mint):
+        """
+        Reserve a position size and fetch the buy quote.
+        Returns (quote, position_size) or None. The reservation is held until
+        execute_trade finishes, so concurrent buys don't size off the same SOL.
+        """
+        # 3. Buy Logic: sized off the local ledger, no RPC round-trip
+        if not self.ledger.synced:
+            await self.solana.reconcile_balance()
+        position_size = self.ledger.reserve_position()
         
-        if position_size < 0.01: # Min trade
+        if position_size < Config.MIN_TRADE_SOL:
             logger.warning("Insufficient balance for trade.")
-            return
+            return None
 
         logger.info(f"Attempting to buy {mint} with {position_size} SOL")
         
         # Get Quote
-        quote = await self.jupiter.get_quote("So11111111111111111111111111111111111111112", mint, int(position_size * 1e9))
+        try:
+            quote = await self.jupiter.get_quote(JupiterClient.SOL_MINT, mint, int(position_size * 1e9))
+        except Exception:
+            self.ledger.release(position_size)
+            raise
         if not quote:
-            return
+            self.ledger.release(position_size)
+            return None
+        return quote, position_size
 
-        # Execute Swap
-        if Config.SOLANA_PRIVATE_KEY:
-            # tx = await self.jupiter.get_swap_transaction(quote, self.solana.keypair.pubkey().__str__())
-            # For now, we simulate success in V1 if no key
-            pass
-        
-        # Record Position (Simulation)
-        self.positions[mint] = {
-            "entry_price": float(quote.get('outAmount')) / float(quote.get('inAmount')) if quote else 1.0, # Approximate
-            "amount": float(quote.get('outAmount')) if quote else 0.0,
-            "highest_price": float(quote.get('outAmount')) / float(quote.get('inAmount')) if quote else 1.0,
-            "sold_tier_1": False,
-            "sold_tier_2": False,
-            "sold_tier_3": False,
-            "timestamp": time.time()
-        }
-        self.save_positions()
-        logger.info(f"Bought {mint}")
+    def cancel_order(self, mint, quote, position_size):
+        """Release the reservation of a quoted order that will never execute (pipeline shutdown)."""
+        self.ledger.release(position_size)
+        logger.info(f"Dropped pending buy of {mint} ({position_size} SOL reservation released)")
+
+    async def execute_trade(self, mint, quote, position_size):
+        try:
+            # Execute Swap
+            if Config.SOLANA_PRIVATE_KEY:
+                # tx = await self.jupiter.get_swap_transaction(quote, self.solana.keypair.pubkey().__str__())
+                # For now, we simulate success in V1 if no key
+                pass
+            
+            # Entry price comes from the same feed manage_positions_cycle reads, so gains
+            # are measured in one unit (SOL per token). If the feed can't price the
+            # mint yet, the first managed tick with a price sets it.
+            prices = await self.prices.get_prices([mint], max_age=0)
+            entry_price = prices[mint].price if mint in prices else None
+            buy_amt = float(quote.get('outAmount')) if quote else 0.0
+
+            # Record Position (Simulation)
+            self.store.open(mint, {
+                "entry_price": entry_price,
+                "amount": buy_amt,
+                "highest_price": entry_price,
+                "sold_tier_1": False,
+                "sold_tier_2": False,
+                "sold_tier_3": False,
+                "timestamp": time.time()
+            })
+            # Debit before the reservation is released so the SOL is never counted as free
+            self.ledger.debit(position_size + Config.TX_BASE_FEE_SOL, f"buy {mint}")
+            logger.info(f"Bought {mint}")
+        finally:
+            self.ledger.release(position_size)
         
-        # Notifications & Logging
-        buy_price = self.positions[mint]["entry_price"]
-        buy_amt = self.positions[mint]["amount"]
-        self.telegram.notify_buy(mint, position_size, buy_price)
-        CSVLogger.log_trade("BUY", mint, buy_amt, buy_price, position_size, 0.0, 0.0, "Initial Entry")
+        # Notifications & Logging. Without a price the BUY is reported by the
+        # manage cycle that sets the entry, so no alert or row says "None".
+        if entry_price is None:
+            self.pending_buys[mint] = position_size
+            return
+        self.report_buy(mint, buy_amt, entry_price, position_size)
+
+    def report_buy(self, mint, amount, entry_price, position_size):
+        self.telegram.notify_buy(mint, position_size, entry_price)
+        CSVLogger.log_trade("BUY", mint, amount, entry_price, position_size, 0.0, 0.0, "Initial Entry")
 
     async def manage_positions_cycle(self):
-        logger.info(f"Managing {len(self.positions)} positions...")
+        with stage_seconds.labels("manage_cycle").time():
+            await self._manage_positions()
+
+    async def _manage_positions(self):
+        book = self.positions
+        if not book:
+            return
+        logger.info(f"Managing {len(book)} positions...")
+        # One batched price request per PRICE_BATCH_SIZE positions
+        prices = await self.prices.get_prices(list(book))
+
+        # No awaits from here on, so rows can't move under us. Positions the
+        # pipeline opened during the fetch have no price yet and are skipped.
+        n = len(book)
+        quotes = [prices.get(mint) for mint in book.mints]
+        current = np.full(n, np.nan)
+        for row, quote in enumerate(quotes):
+            if quote is None:
+                logger.warning(f"No price for {book.mints[row]}, skipping.")
+            elif quote.stale:
+                logger.warning(f"Price for {book.mints[row]} is {quote.age:.0f}s old, skipping.")
+            else:
+                current[row] = quote.price
+        rows = np.flatnonzero(~np.isnan(current))
+        if not len(rows):
+            return
+        cols = book.columns()
+        entry, high, ladder = cols["entry_price"], cols["highest_price"], cols["ladder"]
+        # Ladder ids are looked up once per position, the first cycle it is seen
+        for row in np.flatnonzero(ladder < 0):
+            ladder[row] = self.ladders.resolve(book.mints[row])
+
+        # First priced tick sets the entry of a position bought before the feed knew the mint
+        for row in rows[np.isnan(entry[rows])]:
+            mint, price, amount = book.mints[row], float(current[row]), float(cols["amount"][row])
+            self.store.update(mint, entry_price=price, highest_price=price)
+            # Bought before a restart: the SOL spent is gone with the process, so value it at the entry
+            self.report_buy(mint, amount, price, self.pending_buys.pop(mint, amount * price))
+        # Update High Water Mark
+        for row in rows[current[rows] > high[rows]]:
+            self.store.update(book.mints[row], highest_price=current[row])
+
+        # Evaluate the whole book in one pass through the compiled exit ladders
+        tiers = cols["tiers"][rows]
+        sells, sell_pcts, reasons, tiers_sold = self.ladders.evaluate(
+            ladder[rows], current[rows], entry[rows], high[rows], tiers, cols["timestamp"][rows], time.time()
+        )
+        selected = sells.nonzero()[0]
+        if not len(selected):
+            return
+
+        # Execute Sell (Simulated), priced per row in one pass
+        sell_rows = rows[selected]
+        sell_pct = sell_pcts[selected]
+        price, entry_price = current[sell_rows], entry[sell_rows]
+        amount = cols["amount"][sell_rows]
+        sell_amt = amount * sell_pct
+        sell_val = sell_amt * price  # SOL
+        # Simple approximation: PnL = (CurrentPrice - EntryPrice) * AmountSold
+        pnl_sol = (price - entry_price) * sell_amt
+        remaining = amount - sell_amt
+        new_tiers = tiers[selected] | tiers_sold[selected]
+
         mints_to_remove = []
-        
-        for mint, data in self.positions.items():
-            # Get current price
-            # We need a price fetcher. Jupiter Quote for 1 unit?
-            # price = await self.jupiter.get_price(mint)
-            # For now, assume price is fetched via quote (1 Token -> SOL)
-            
-            # Simulated Price Update
-            current_price = data['entry_price'] * 1.0 # No change in simulation
-            
-            # Update High Water Mark
-            if current_price > data['highest_price']:
-                data['highest_price'] = current_price
-            
-            should_sell, sell_pct, reason = Strategy.get_sell_action(
-                mint, current_price, data['entry_price'], data['highest_price'],
-                data['sold_tier_1'], data['sold_tier_2'], data['sold_tier_3']
-            )
-            
-            if should_sell:
-                logger.info(f"Selling {mint}: {reason} ({sell_pct*100}%)")
-                # Execute Sell (Simulated)
-                sell_amt = data['amount'] * sell_pct
-                sell_val = sell_amt * current_price # SOL
-                
-                # Calculate Profit
-                # Simple approximation: PnL = (CurrentPrice - EntryPrice) * AmountSold
-                pnl_sol = (current_price - data['entry_price']) * sell_amt
-                
-                # Tax Logic
-                tax_amt = MoneyManager.calculate_tax(pnl_sol)
-                if tax_amt > 0:
-                    await self.solana.transfer_sol(Config.TAX_VAULT_ADDRESS, tax_amt)
-                    self.telegram.notify_tax(tax_amt)
-                    CSVLogger.log_trade("TAX", "SOL", tax_amt, 0, tax_amt, 0, 0, "Tax Vault Deposit")
-
-                # Notifications
-                self.telegram.notify_sell(mint, sell_val, current_price, reason, (current_price - data['entry_price'])/data['entry_price'])
-                CSVLogger.log_trade("SELL", mint, sell_amt, current_price, sell_val, 0, pnl_sol, reason)
-
-                # Update State
-                data['amount'] -= sell_amt
-                
-                if sell_pct == 1.0 or data['amount'] < 0.0001:
-                    mints_to_remove.append(mint)
-                    # Close Account
-                    await self.solana.close_empty_accounts()
-                
-                # Update Tiers
-                if "Tier 1" in reason: data['sold_tier_1'] = True
-                if "Tier 2" in reason: data['sold_tier_2'] = True
-                if "Tier 3" in reason: data['sold_tier_3'] = True
+        for i, row in enumerate(sell_rows):
+            mint = book.mints[row]
+            reason = SellReason(reasons[selected[i]]).label
+            pct, value, pnl = float(sell_pct[i]), float(sell_val[i]), float(pnl_sol[i])
+            logger.info(f"Selling {mint}: {reason} ({pct*100}%)")
+
+            # Tax Logic: accrued here, paid in one transfer by the tax job
+            tax_amt = MoneyManager.calculate_tax(pnl)
+            if tax_amt > 0:
+                self.tax.accrue(mint, tax_amt, pnl)
+
+            self.ledger.credit(value - Config.TX_BASE_FEE_SOL, f"sell {mint}")
+
+            # Notifications
+            self.telegram.notify_sell(mint, value, float(price[i]), reason, float((price[i] - entry_price[i]) / entry_price[i]))
+            CSVLogger.log_trade("SELL", mint, float(sell_amt[i]), float(price[i]), value, 0, pnl, reason)
 
+            if pct == 1.0 or remaining[i] < 0.0001:
+                mints_to_remove.append(mint)
+                # The token account is closed in batches by the rent_reclaim job
+                self.reclaim_due = True
+
+            # Update State
+            self.store.update(mint, amount=float(remaining[i]), tiers=int(new_tiers[i]))
+
+        # Closing moves rows, so it waits until every sell is booked
         for mint in mints_to_remove:
-            del self.positions[mint]
-        
-        if mints_to_remove:
-            self.save_positions()
+            self.store.close(mint)
+            self.prices.forget(mint)
 
 if __name__ == "__main__":
     bot = BotEngine()
@@ -0,0 +1,252 @@
+import calendar
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+import numpy as np
+from src.config.config import Config
+from src.engine.strategy import SellReason
+from src.utils.logger import logger
+
+# Rule kinds, in the order of the per-row inputs they compare against
+GAIN = 0           # (price - entry) / entry >= at
+TRAILING_STOP = 1  # (high - price) / high >= at
+TIME = 2           # seconds since the position was opened >= at
+LOCKDOWN = 3       # now falls inside one of the rule's windows
+NEVER = 4          # padding; never fires
+
+RULE_TYPES = {"gain": GAIN, "trailing_stop": TRAILING_STOP, "time": TIME, "lockdown": LOCKDOWN}
+
+DEFAULT_REASONS = {
+    TRAILING_STOP: SellReason.TRAILING_STOP,
+    TIME: SellReason.TIME_EXIT,
+    LOCKDOWN: SellReason.USOR_LOCKDOWN,
+}
+TIER_REASONS = {1: SellReason.TIER_1_PROFIT, 2: SellReason.TIER_2_PROFIT, 3: SellReason.TIER_3_PROFIT}
+MAX_TIERS = 8  # Bits in PositionBook.tiers
+
+def default_ladders() -> dict:
+    """The standard ladder and the USOR ladder, built from the Config settings they always used."""
+    return {
+        "standard": {
+            "rules": [
+                {"type": "gain", "at": Config.TIER_1_GAIN, "sell": Config.TIER_1_PCT, "tier": 1},
+                {"type": "gain", "at": Config.TIER_2_GAIN, "sell": Config.TIER_2_PCT, "tier": 2},
+                {"type": "gain", "at": Config.TIER_3_GAIN, "sell": Config.TIER_3_PCT, "tier": 3},
+                {"type": "trailing_stop", "at": Config.MOONBAG_TRAILING_STOP, "sell": 1.0, "after_tier": 3,
+                 "reason": "MOONBAG_TRAILING_STOP"},
+            ],
+            "hold_reason": "HOLDING_STANDARD",
+        },
+        "usor": {
+            "rules": [
+                {"type": "trailing_stop", "at": Config.USOR_TRAILING_STOP, "sell": 1.0, "reason": "USOR_TRAILING_STOP"},
+                # Only the stop above may sell inside the window
+                {"type": "lockdown", "windows": [["01-25", "02-05"]], "reason": "USOR_LOCKDOWN"},
+                {"type": "gain", "at": Config.USOR_TARGET_GAIN, "sell": 0.5, "reason": "USOR_TARGET_HIT"},
+            ],
+            "hold_reason": "HOLDING_USOR",
+        },
+    }
+
+def _month_day(text) -> tuple:
+    """"MM-DD" -> (month, day), valid in a leap year. Raises ValueError otherwise."""
+    try:
+        month, day = (int(x) for x in text.split("-"))
+        datetime(2000, month, day)
+    except (AttributeError, TypeError, ValueError):
+        raise ValueError(f"lockdown window date {text!r} is not a valid MM-DD") from None
+    return month, day
+
+def _local_day(year, month, day) -> datetime:
+    # Feb 29 falls on Feb 28 in non-leap years
+    return datetime(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+def _window_intervals(windows, years) -> list:
+    """["MM-DD", "MM-DD"] pairs (both days inclusive, local time) -> sorted epoch [start, end) intervals."""
+    intervals = []
+    for start, end in windows:
+        sm, sd = _month_day(start)
+        em, ed = _month_day(end)
+        for year in years:
+            begin = _local_day(year, sm, sd)
+            # A window that wraps the new year ends in the following one. The end is local
+            # midnight after the last day, so DST changes don't shift it by an hour.
+            finish = _local_day(year + ((em, ed) < (sm, sd)), em, ed) + timedelta(days=1)
+            intervals.append((begin.timestamp(), finish.timestamp()))
+    return sorted(intervals)
+
+class ExitLadders:
+    """
+    Exit ladders compiled into a decision table.
+
+    A ladder is an ordered list of rules; the first rule that fires decides
+    the tick, and a position where none fires holds with the ladder's
+    `hold_reason`. Rule fields:
+
+      type        gain | trailing_stop | time | lockdown
+      at          threshold: gain or drop fraction, or seconds held (time)
+      sell        fraction of the remaining amount to sell (0 = hold)
+      tier        fire once: skipped once tier N is sold, and marks it sold
+      after_tier  only fire after tier N was sold
+      windows     lockdown only: [["MM-DD", "MM-DD"], ...], days inclusive
+      reason      SellReason name; defaults by type (TIER_N_PROFIT, TAKE_PROFIT, ...)
+
+    A lockdown rule holds while a window is open, so only the rules before
+    it can sell then. Ladders come from `default_ladders()`, then
+    Config.EXIT_LADDERS, then the JSON file at Config.EXIT_LADDERS_FILE
+    ({"ladders": {...}, "assignments": {mint: ladder}, "default": name}).
+    Mints are assigned in Config.EXIT_LADDER_ASSIGNMENTS (USOR_ADDRESS uses
+    "usor"); everything else uses Config.EXIT_LADDER_DEFAULT.
+
+    Compiling turns every ladder into one row of (ladders x rules) arrays and
+    lockdown windows into epoch intervals, so `evaluate` is a handful of
+    array gathers and compares: no config, dates or strings per tick.
+    """
+
+    def __init__(self, ladders: dict, assignments: dict = None, default: str = None, now: float = None):
+        self.names = list(ladders)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.assignments = {}
+        for mint, name in (assignments or {}).items():
+            if name not in self.ids:
+                raise ValueError(f"Mint {mint} is assigned to unknown exit ladder '{name}'")
+            self.assignments[mint] = self.ids[name]
+        default = default or "standard"
+        if default not in self.ids:
+            raise ValueError(f"Unknown default exit ladder '{default}'")
+        self.default_id = self.ids[default]
+        self._compile(ladders, now)
+
+    @classmethod
+    def from_config(cls) -> "ExitLadders":
+        ladders = default_ladders()
+        ladders.update(Config.EXIT_LADDERS)
+        assignments = {}
+        if Config.USOR_ADDRESS:
+            assignments[Config.USOR_ADDRESS] = "usor"
+        assignments.update(Config.EXIT_LADDER_ASSIGNMENTS)
+        default = Config.EXIT_LADDER_DEFAULT
+
+        if Config.EXIT_LADDERS_FILE:
+            with open(Path(Config.EXIT_LADDERS_FILE), 'r') as f:
+                spec = json.load(f)
+            ladders.update(spec.get("ladders", {}))
+            assignments.update(spec.get("assignments", {}))
+            default = spec.get("default", default)
+
+        compiled = cls(ladders, assignments, default)
+        logger.info(f"Compiled exit ladders: {', '.join(compiled.names)} (default {default}, {len(compiled.assignments)} assigned mints)")
+        return compiled
+
+    def _compile(self, ladders, now):
+        width = max([len(spec.get("rules", [])) for spec in ladders.values()] + [1])
+        shape = (len(self.names), width)
+        self.kind = np.full(shape, NEVER, dtype=np.int8)
+        self.at = np.full(shape, np.inf)
+        self.sell = np.zeros(shape)
+        self.requires = np.zeros(shape, dtype=np.uint8)
+        self.excludes = np.zeros(shape, dtype=np.uint8)
+        self.sets = np.zeros(shape, dtype=np.uint8)
+        self.reason = np.zeros(shape, dtype=np.int8)
+        self.hold_reason = np.zeros(len(self.names), dtype=np.int8)
+        # (ladder, rule position, starts, ends) per lockdown rule
+        self.windows = []
+
+        year = datetime.fromtimestamp(now).year if now else datetime.now().year
+        years = range(year - 1, year + Config.EXIT_LADDER_WINDOW_YEARS + 1)
+
+        for l, name in enumerate(self.names):
+            spec = ladders[name]
+            self.hold_reason[l] = self._reason(spec.get("hold_reason", "HOLDING_STANDARD"), name)
+            for k, rule in enumerate(spec.get("rules", [])):
+                kind = RULE_TYPES.get(rule.get("type"))
+                if kind is None:
+                    raise ValueError(f"Exit ladder '{name}' rule {k + 1}: unknown type {rule.get('type')!r}")
+                self.kind[l, k] = kind
+                self.sell[l, k] = float(rule.get("sell", 0.0))
+                if not 0.0 <= self.sell[l, k] <= 1.0:
+                    raise ValueError(f"Exit ladder '{name}' rule {k + 1}: sell must be within [0, 1]")
+
+                tier = rule.get("tier")
+                if tier is not None:
+                    self.excludes[l, k] = self.sets[l, k] = self._tier_bit(tier, name)
+                if rule.get("after_tier") is not None:
+                    self.requires[l, k] = self._tier_bit(rule["after_tier"], name)
+
+                if kind == LOCKDOWN:
+                    try:
+                        intervals = _window_intervals(rule.get("windows", []), years)
+                    except ValueError as e:
+                        raise ValueError(f"Exit ladder '{name}' rule {k + 1}: {e}") from None
+                    self.windows.append((l, k, np.array([s for s, _ in intervals]), np.array([e for _, e in intervals])))
+                else:
+                    self.at[l, k] = float(rule["at"])
+
+                if "reason" in rule:
+                    self.reason[l, k] = self._reason(rule["reason"], name)
+                elif kind == GAIN:
+                    self.reason[l, k] = TIER_REASONS.get(tier, SellReason.TAKE_PROFIT)
+                else:
+                    self.reason[l, k] = DEFAULT_REASONS[kind]
+
+    @staticmethod
+    def _tier_bit(tier, name) -> int:
+        if not 1 <= int(tier) <= MAX_TIERS:
+            raise ValueError(f"Exit ladder '{name}': tiers run from 1 to {MAX_TIERS}")
+        return 1 << (int(tier) - 1)
+
+    @staticmethod
+    def _reason(reason, name) -> int:
+        try:
+            return SellReason[reason]
+        except KeyError:
+            raise ValueError(f"Exit ladder '{name}': unknown reason {reason!r}") from None
+
+    def resolve(self, mint: str) -> int:
+        """Ladder id for a mint."""
+        return self.assignments.get(mint, self.default_id)
+
+    def locked(self, now: float) -> np.ndarray:
+        """(ladders x rules) bool: lockdown rules whose window is open at `now`."""
+        locked = np.zeros(self.kind.shape, dtype=bool)
+        for l, k, starts, ends in self.windows:
+            i = np.searchsorted(starts, now, side="right") - 1
+            locked[l, k] = i >= 0 and now < ends[i]
+        return locked
+
+    def evaluate(self, ladder, current_price, entry_price, highest_price, tiers, opened_at, now: float):
+        """
+        Decide every row at once. `ladder` holds ids from `resolve`, `tiers`
+        the sold-tier bitmask, `opened_at` epoch seconds (0 = unknown, never
+        time-exits). Returns (should_sell: bool[], sell_pct: float[],
+        reason: int[] of SellReason, tiers_sold: uint8[] bits to add).
+        """
+        ladder = np.asarray(ladder, dtype=np.intp)
+        current = np.asarray(current_price, dtype=np.float64)
+        entry = np.asarray(entry_price, dtype=np.float64)
+        high = np.asarray(highest_price, dtype=np.float64)
+        tiers = np.asarray(tiers, dtype=np.uint8)
+        opened_at = np.asarray(opened_at, dtype=np.float64)
+        n = len(ladder)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inputs = np.stack([
+                (current - entry) / entry,
+                (high - current) / high,
+                np.where(opened_at > 0, now - opened_at, 0.0),
+                np.zeros(n),
+            ])
+        # (rows x rule positions): every rule of each row's ladder at once; the first that fires wins
+        kind = self.kind[ladder]
+        requires = self.requires[ladder]
+        tiers = tiers[:, None]
+        fires = inputs[np.minimum(kind, LOCKDOWN), np.arange(n)[:, None]] >= self.at[ladder]
+        fires |= self.locked(now)[ladder]
+        fires &= ((tiers & requires) == requires) & ((tiers & self.excludes[ladder]) == 0)
+
+        first = fires.argmax(axis=1)
+        decided = fires[np.arange(n), first]
+        sell_pct = np.where(decided, self.sell[ladder, first], 0.0)
+        reason = np.where(decided, self.reason[ladder, first], self.hold_reason[ladder])
+        sold = np.where(decided, self.sets[ladder, first], 0).astype(np.uint8)
+        return sell_pct > 0, sell_pct, reason, sold
@@ -1,3 +1,4 @@
+import numpy as np
 from src.config.config import Config
 
 class MoneyManager:
@@ -17,9 +18,42 @@ class MoneyManager:
             return 0.0
         return net_profit_sol * Config.TAX_RATE
 
+    @staticmethod
+    def calculate_taxes(net_profit_sol):
+        """
+        Batch form of calculate_tax over an array of per-sell profits.
+        """
+        return np.maximum(np.asarray(net_profit_sol, dtype=np.float64), 0.0) * Config.TAX_RATE
+
     @staticmethod
     def should_reclaim_rent(token_balance: float) -> bool:
         """
         Account Reclaim: Close empty SPL token accounts.
         """
         return token_balance == 0
+
+class PositionAllocator:
+    """
+    Tracks SOL earmarked for buys that are still in flight, so concurrent
+    entries size off the balance that is actually left.
+    """
+
+    def __init__(self):
+        self.reserved = 0.0
+
+    def reserve(self, total_sol_balance: float) -> float:
+        """
+        Size a new position against the unreserved balance and reserve it.
+        Returns 0.0 if the resulting size is below the minimum trade.
+        There is no await between the read and the write, so this is atomic
+        with respect to other tasks on the event loop.
+        """
+        available = max(total_sol_balance - self.reserved, 0.0)
+        size = MoneyManager.calculate_position_size(available)
+        if size < Config.MIN_TRADE_SOL:
+            return 0.0
+        self.reserved += size
+        return size
+
+    def release(self, amount: float):
+        self.reserved = max(self.reserved - amount, 0.0)
@@ -0,0 +1,138 @@
+import asyncio
+from src.config.config import Config
+from src.utils.logger import logger
+from src.utils.metrics import stage_seconds, pipeline_decisions, queue_depth
+
+class ScanPipeline:
+    """
+    Bounded concurrent pipeline for new-token candidates.
+
+    Mints flow screen -> quote -> execute through bounded queues. A burst from
+    the scanner is worked by several workers per stage, and a slow stage
+    pushes back on the one in front of it instead of piling up work. Orders
+    that hold a balance reservation and never reach execute (still queued or
+    in hand at shutdown) are handed back through `engine.cancel_order`.
+    """
+
+    def __init__(self, engine, screen_workers=None, quote_workers=None, execute_workers=None, queue_size=None):
+        self.engine = engine
+        self.screen_workers = screen_workers or Config.PIPELINE_SCREEN_WORKERS
+        self.quote_workers = quote_workers or Config.PIPELINE_QUOTE_WORKERS
+        self.execute_workers = execute_workers or Config.PIPELINE_EXECUTE_WORKERS
+        self.queue_size = queue_size or Config.PIPELINE_QUEUE_SIZE
+        self.in_flight = set()
+        self.queues = None
+        self.workers = []
+
+    def _start(self):
+        screen_q = asyncio.Queue(maxsize=self.queue_size)
+        quote_q = asyncio.Queue(maxsize=self.queue_size)
+        execute_q = asyncio.Queue(maxsize=self.queue_size)
+        self.queues = (screen_q, quote_q, execute_q)
+        for name, queue in zip(("screen", "quote", "execute"), self.queues):
+            queue_depth.labels(f"pipeline_{name}").set_function(queue.qsize)
+        queue_depth.labels("pipeline_in_flight").set_function(lambda: len(self.in_flight))
+
+        stages = [
+            (screen_q, self._screen, quote_q, self.screen_workers),
+            (quote_q, self._quote, execute_q, self.quote_workers),
+            (execute_q, self._execute, None, self.execute_workers),
+        ]
+        for source, stage, sink, count in stages:
+            for _ in range(count):
+                self.workers.append(asyncio.create_task(self._worker(source, stage, sink)))
+
+    async def submit(self, mint):
+        """Queue a mint for analysis. Blocks while the screen stage is full."""
+        if self.queues is None:
+            self._start()
+        if mint in self.in_flight:
+            return False
+        self.in_flight.add(mint)
+        await self.queues[0].put((mint,))
+        return True
+
+    async def drain(self):
+        """Wait until every submitted mint has left the pipeline."""
+        if self.queues is None:
+            return
+        # Workers hand an item to the next stage before marking it done,
+        # so joining the stages in order sees every item through.
+        for queue in self.queues:
+            await queue.join()
+
+    async def run(self, mints):
+        """Push a batch of mints through the pipeline and wait for it to finish."""
+        for mint in mints:
+            await self.submit(mint)
+        await self.drain()
+
+    async def close(self):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        if self.queues is not None:
+            # Quoted orders waiting for an execute worker still hold their reservation
+            execute_q = self.queues[2]
+            while not execute_q.empty():
+                self._abandon(execute_q.get_nowait())
+        self.queues = None
+        self.in_flight.clear()
+
+    async def _worker(self, source, stage, sink):
+        name = stage.__name__.lstrip("_")
+        timer = stage_seconds.labels(name)
+        # A mint leaving at this stage was rejected here, or bought if it is the last one
+        decided = pipeline_decisions.labels("bought" if sink is None else f"rejected_{name}")
+        failed = pipeline_decisions.labels(f"error_{name}")
+        while True:
+            item = await source.get()
+            try:
+                result = None
+                try:
+                    with timer.time():
+                        result = await stage(*item)
+                except Exception as e:
+                    failed.inc()
+                    logger.error(f"Pipeline stage {stage.__name__} failed for {item[0]}: {e}")
+                else:
+                    if result is None:
+                        decided.inc()
+
+                if result is not None and sink is not None:
+                    try:
+                        await sink.put(result)
+                    except asyncio.CancelledError:
+                        # Cancelled while the next stage was full: the result is ours to give back
+                        self._abandon(result)
+                        raise
+                else:
+                    self.in_flight.discard(item[0])
+            finally:
+                source.task_done()
+
+    def _abandon(self, item):
+        """Release what a quoted order (mint, quote, position_size) holds; other items hold nothing."""
+        if len(item) != 3:
+            return
+        try:
+            self.engine.cancel_order(*item)
+        except Exception as e:
+            logger.error(f"Failed to release order for {item[0]}: {e}")
+
+    async def _screen(self, mint):
+        if await self.engine.screen_token(mint):
+            return (mint,)
+        return None
+
+    async def _quote(self, mint):
+        order = await self.engine.quote_token(mint)
+        if order:
+            quote, position_size = order
+            return (mint, quote, position_size)
+        return None
+
+    async def _execute(self, mint, quote, position_size):
+        await self.engine.execute_trade(mint, quote, position_size)
+        return None
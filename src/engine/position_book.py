@@ -0,0 +1,173 @@
+from enum import IntFlag
+import numpy as np
+from src.engine.strategy import SellReason
+
+class Tier(IntFlag):
+    """Profit tiers already sold, as a bitmask per position."""
+    NONE = 0
+    TIER_1 = 1
+    TIER_2 = 2
+    TIER_3 = 4
+
+    @staticmethod
+    def for_reason(reason) -> "Tier":
+        return _TIER_FOR_REASON.get(reason, Tier.NONE)
+
+_TIER_FOR_REASON = {
+    SellReason.TIER_1_PROFIT: Tier.TIER_1,
+    SellReason.TIER_2_PROFIT: Tier.TIER_2,
+    SellReason.TIER_3_PROFIT: Tier.TIER_3,
+}
+
+# Keys of the snapshot/journal format, one per tier bit. Ladders may use up to 8 tiers;
+# sold_tier_4 and up are only written once set, so standard books keep their old shape.
+_TIER_KEYS = tuple((f"sold_tier_{n}", 1 << (n - 1)) for n in range(1, 9))
+_TIER_BITS = dict(_TIER_KEYS)
+
+def tier_flags(tiers: int) -> dict:
+    """A tier bitmask as sold_tier_N flags in the snapshot/journal format."""
+    return {key: bool(tiers & bit) for key, bit in _TIER_KEYS if bit <= Tier.TIER_3 or tiers & bit}
+
+class PositionBook:
+    """
+    Open positions stored column-wise in numpy arrays, one row per mint.
+
+    Rows are kept dense: closing a position moves the last row into its
+    place, so `entry_price[:len(book)]` and the other columns are always
+    contiguous and `columns()` hands out views without copying. `mints[i]`
+    is the mint of row i and `index[mint]` its row. An unpriced entry is NaN.
+    Sold tiers are a bitmask per row (Tier for the standard ladder), and
+    `ladder` caches the row's exit ladder id: -1 until the engine resolves it,
+    so mints are looked up once instead of every cycle.
+
+    `to_dict` / `from_dict` and the `book[mint]` mapping view use the
+    snapshot format (entry_price, amount, highest_price, sold_tier_N,
+    timestamp), so snapshots and journals written before stay readable.
+    """
+
+    FLOAT_COLUMNS = ("entry_price", "highest_price", "amount", "timestamp")
+
+    def __init__(self, capacity: int = 64):
+        self.mints = []
+        self.index = {}
+        self.entry_price = np.empty(capacity)
+        self.highest_price = np.empty(capacity)
+        self.amount = np.empty(capacity)
+        self.timestamp = np.empty(capacity)
+        self.tiers = np.zeros(capacity, dtype=np.uint8)
+        self.ladder = np.full(capacity, -1, dtype=np.int16)
+
+    def __len__(self) -> int:
+        return len(self.mints)
+
+    def __contains__(self, mint) -> bool:
+        return mint in self.index
+
+    def __iter__(self):
+        return iter(list(self.mints))
+
+    def __bool__(self) -> bool:
+        return bool(self.mints)
+
+    def __getitem__(self, mint) -> dict:
+        return self._row_dict(self.index[mint])
+
+    def keys(self):
+        return list(self.mints)
+
+    def items(self):
+        return [(mint, self._row_dict(row)) for row, mint in enumerate(self.mints)]
+
+    def _grow(self):
+        capacity = 2 * len(self.entry_price)
+        for name in self.FLOAT_COLUMNS + ("tiers", "ladder"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    # --- Writes ---
+
+    def open(self, mint: str, entry_price, amount: float, highest_price=None, tiers: int = Tier.NONE, timestamp: float = 0.0) -> int:
+        """Add (or replace) a position. Returns its row."""
+        row = self.index.get(mint)
+        if row is None:
+            row = len(self.mints)
+            if row == len(self.entry_price):
+                self._grow()
+            self.mints.append(mint)
+            self.index[mint] = row
+        self.entry_price[row] = np.nan if entry_price is None else entry_price
+        self.highest_price[row] = np.nan if highest_price is None else highest_price
+        self.amount[row] = amount
+        self.timestamp[row] = timestamp or 0.0
+        self.tiers[row] = tiers
+        self.ladder[row] = -1
+        return row
+
+    def update(self, mint: str, **fields):
+        """Set columns by name; `sold_tier_N` booleans from the journal format set or clear tier bits."""
+        row = self.index[mint]
+        for name, value in fields.items():
+            if name in self.FLOAT_COLUMNS:
+                getattr(self, name)[row] = np.nan if value is None else value
+            elif name == "tiers":
+                self.tiers[row] = value
+            else:
+                bit = _TIER_BITS.get(name)
+                if bit is None:
+                    raise KeyError(f"Unknown position field: {name}")
+                self.tiers[row] = self.tiers[row] | bit if value else self.tiers[row] & (0xFF ^ bit)
+
+    def close(self, mint: str):
+        row = self.index.pop(mint, None)
+        if row is None:
+            return
+        last = len(self.mints) - 1
+        if row != last:
+            moved = self.mints[last]
+            self.mints[row] = moved
+            self.index[moved] = row
+            for name in self.FLOAT_COLUMNS + ("tiers", "ladder"):
+                column = getattr(self, name)
+                column[row] = column[last]
+        self.mints.pop()
+
+    # --- Reads ---
+
+    def columns(self) -> dict:
+        """Views of every column over the open rows (no copy; valid until the next open/close)."""
+        n = len(self.mints)
+        return {name: getattr(self, name)[:n] for name in self.FLOAT_COLUMNS + ("tiers", "ladder")}
+
+    def _row_dict(self, row: int) -> dict:
+        entry = float(self.entry_price[row])
+        high = float(self.highest_price[row])
+        tiers = int(self.tiers[row])
+        data = {
+            "entry_price": None if np.isnan(entry) else entry,
+            "amount": float(self.amount[row]),
+            "highest_price": None if np.isnan(high) else high,
+        }
+        data.update(tier_flags(tiers))
+        data["timestamp"] = float(self.timestamp[row])
+        return data
+
+    def to_dict(self) -> dict:
+        """Snapshot format: {mint: {entry_price, amount, highest_price, sold_tier_N..., timestamp}}."""
+        return {mint: self._row_dict(row) for row, mint in enumerate(self.mints)}
+
+    def open_from(self, mint: str, data: dict) -> int:
+        tiers = 0
+        for key, bit in _TIER_KEYS:
+            if data.get(key):
+                tiers |= bit
+        return self.open(mint, data.get("entry_price"), data.get("amount") or 0.0,
+                         data.get("highest_price"), tiers, data.get("timestamp") or 0.0)
+
+    @classmethod
+    def from_dict(cls, positions: dict) -> "PositionBook":
+        book = cls(capacity=max(64, len(positions)))
+        for mint, data in positions.items():
+            book.open_from(mint, data)
+        return book
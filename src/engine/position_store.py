@@ -0,0 +1,165 @@
+import json
+import os
+from pathlib import Path
+from src.config.config import Config
+from src.engine.position_book import PositionBook, tier_flags
+from src.utils.group_commit import GroupCommitWriter
+from src.utils.logger import logger
+
+class _SnapshotRequest:
+    __slots__ = ("positions",)
+
+    def __init__(self, positions):
+        self.positions = positions
+
+class _JournalWriter(GroupCommitWriter):
+    """Appends journal lines with one fsync per group and writes snapshots in queue order."""
+
+    def __init__(self, store):
+        super().__init__("PositionJournal", max_batch=Config.JOURNAL_MAX_BATCH, max_delay=Config.JOURNAL_FSYNC_INTERVAL)
+        self.store = store
+        self.journal = None
+
+    def _journal(self):
+        if self.journal is None:
+            self.journal = open(self.store.journal_path, 'a')
+        return self.journal
+
+    def write_batch(self, items):
+        lines = []
+        for item in items:
+            if isinstance(item, _SnapshotRequest):
+                # The snapshot already contains every line queued before it
+                lines = []
+                self._write_snapshot(item.positions)
+            else:
+                lines.append(item)
+        if lines:
+            f = self._journal()
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _write_snapshot(self, positions):
+        path = self.store.snapshot_path
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(positions, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+        # A crash before this truncate only means replaying old entries over
+        # the new snapshot, which is harmless: every entry sets absolute values.
+        if self.journal is not None:
+            self.journal.close()
+        self.journal = open(self.store.journal_path, 'w')
+        os.fsync(self.journal.fileno())
+
+    def close(self, timeout: float = 10.0):
+        super().close(timeout)
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+class PositionStore:
+    """
+    Position book persisted as a snapshot plus an append-only journal.
+
+    Every change is one journal entry (open, update, close) holding absolute
+    values, so a write costs O(delta) and replaying an entry twice is
+    harmless. Entries are written and fsynced in groups on a background
+    thread. Every Config.POSITION_SNAPSHOT_EVERY entries the book is
+    compacted into `positions.json` (same format as before, replaced
+    atomically) and the journal is truncated. A torn last line from a crash
+    is skipped on load.
+
+    In memory the book is a columnar PositionBook; the files keep the
+    per-mint dict format, which `read` returns.
+    """
+
+    def __init__(self, snapshot_path):
+        self.snapshot_path = Path(snapshot_path)
+        self.journal_path = self.snapshot_path.with_suffix(".journal")
+        self.positions = PositionBook()
+        self.entries_since_snapshot = 0
+        self.writer = _JournalWriter(self)
+
+    @staticmethod
+    def read(snapshot_path) -> dict:
+        """Recover the book from disk without opening it for writes."""
+        snapshot_path = Path(snapshot_path)
+        positions = {}
+        if snapshot_path.exists():
+            try:
+                with open(snapshot_path, 'r') as f:
+                    positions = json.load(f)
+            except Exception as e:
+                logger.error(f"Failed to load positions snapshot: {e}")
+
+        journal_path = snapshot_path.with_suffix(".journal")
+        if journal_path.exists():
+            with open(journal_path, 'r') as f:
+                for line_no, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping torn journal entry at line {line_no}.")
+                        continue
+                    PositionStore._apply(positions, entry)
+        return positions
+
+    @staticmethod
+    def _apply(positions, entry):
+        op = entry.get("op")
+        mint = entry.get("mint")
+        if op == "open":
+            positions[mint] = entry["data"]
+        elif op == "update":
+            if mint in positions:
+                positions[mint].update(entry["fields"])
+        elif op == "close":
+            positions.pop(mint, None)
+
+    def load(self) -> PositionBook:
+        self.positions = PositionBook.from_dict(self.read(self.snapshot_path))
+        # Start from a compact snapshot so the journal only holds this run's changes
+        self.snapshot()
+        return self.positions
+
+    def open(self, mint: str, data: dict):
+        self.positions.open_from(mint, data)
+        self._append({"op": "open", "mint": mint, "data": data})
+
+    def update(self, mint: str, **fields):
+        """Update columns by name. A `tiers` bitmask is journaled as sold_tier_N flags."""
+        self.positions.update(mint, **fields)
+        if "tiers" in fields:
+            fields.update(tier_flags(fields.pop("tiers")))
+        self._append({"op": "update", "mint": mint, "fields": fields})
+
+    def close(self, mint: str):
+        self.positions.close(mint)
+        self._append({"op": "close", "mint": mint})
+
+    def _append(self, entry):
+        self.writer.put(json.dumps(entry))
+        self.entries_since_snapshot += 1
+        if self.entries_since_snapshot >= Config.POSITION_SNAPSHOT_EVERY:
+            self.snapshot()
+
+    def snapshot(self):
+        """Queue a compacted snapshot; it is written after every entry queued before it."""
+        copy = self.positions.to_dict()
+        self.writer.put(_SnapshotRequest(copy))
+        self.entries_since_snapshot = 0
+
+    def flush(self):
+        self.writer.flush()
+
+    def shutdown(self):
+        """Write a final snapshot and stop the writer thread."""
+        self.snapshot()
+        self.writer.close()
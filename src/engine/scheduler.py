@@ -0,0 +1,115 @@
+import asyncio
+import random
+from src.utils.logger import logger
+from src.utils.metrics import job_runs, job_overruns, job_seconds
+
+class Job:
+    """
+    A periodic task and its timing policy.
+
+    interval: seconds between scheduled starts.
+    jitter:   up to this many random seconds added to each start, so jobs
+              sharing an interval don't hit upstreams in lockstep.
+    deadline: a run still going after this many seconds is cancelled.
+    overrun:  what to do when a run ends after its next start was due.
+              SKIP drops the missed ticks and waits for the next one on the
+              grid; IMMEDIATE starts the next run right away.
+    paused_ok: keep running while the engine is paused (/stop_bot).
+    """
+    SKIP = "skip"
+    IMMEDIATE = "immediate"
+
+    def __init__(self, name, func, interval, jitter=0.0, deadline=None, overrun=SKIP, paused_ok=False):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.deadline = deadline
+        self.overrun = overrun
+        self.paused_ok = paused_ok
+        self.runs = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.overruns = 0
+        self.last_duration = 0.0
+
+class Scheduler:
+    """Runs each Job in its own task, so a slow job never delays the others."""
+
+    def __init__(self, is_paused=None):
+        self.jobs = []
+        self.tasks = []
+        self.is_paused = is_paused or (lambda: False)
+
+    def add(self, job: Job):
+        self.jobs.append(job)
+        return job
+
+    async def run(self):
+        """Run every job until cancelled."""
+        self.tasks = [asyncio.create_task(self._run_job(job), name=f"job:{job.name}") for job in self.jobs]
+        try:
+            await asyncio.gather(*self.tasks)
+        finally:
+            await self.stop()
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    async def _run_job(self, job: Job):
+        loop = asyncio.get_running_loop()
+        next_at = loop.time()
+        while True:
+            delay = next_at - loop.time() + (random.uniform(0, job.jitter) if job.jitter else 0.0)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            started = loop.time()
+            if job.paused_ok or not self.is_paused():
+                await self._run_once(job)
+                job.last_duration = loop.time() - started
+                job_seconds.labels(job.name).observe(job.last_duration)
+
+            next_at += job.interval
+            now = loop.time()
+            if now > next_at:
+                job.overruns += 1
+                job_overruns.labels(job.name).inc()
+                if job.overrun == Job.SKIP:
+                    missed = int((now - next_at) // job.interval) + 1
+                    logger.warning(f"Job {job.name} took {job.last_duration:.1f}s (interval {job.interval}s), skipping {missed} tick(s).")
+                    next_at += missed * job.interval
+                else:
+                    next_at = now
+
+    async def _run_once(self, job: Job):
+        job.runs += 1
+        try:
+            if job.deadline:
+                await asyncio.wait_for(job.func(), job.deadline)
+            else:
+                await job.func()
+            job_runs.labels(job.name, "ok").inc()
+        except asyncio.TimeoutError:
+            job.timeouts += 1
+            job_runs.labels(job.name, "timeout").inc()
+            logger.warning(f"Job {job.name} missed its {job.deadline}s deadline and was cancelled.")
+        except Exception as e:
+            job.failures += 1
+            job_runs.labels(job.name, "failure").inc()
+            logger.error(f"Job {job.name} failed: {e}")
+
+    def stats(self):
+        return {
+            job.name: {
+                "runs": job.runs,
+                "failures": job.failures,
+                "timeouts": job.timeouts,
+                "overruns": job.overruns,
+                "last_duration": round(job.last_duration, 3),
+            }
+            for job in self.jobs
+        }
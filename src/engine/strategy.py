@@ -1,7 +1,55 @@
 from datetime import datetime
+from enum import IntEnum
+import numpy as np
 from src.config.config import Config
 
+class SellReason(IntEnum):
+    """Reason codes returned by the batch API. `label` is the text the scalar path returns."""
+    HOLDING_STANDARD = 0
+    TIER_1_PROFIT = 1
+    TIER_2_PROFIT = 2
+    TIER_3_PROFIT = 3
+    MOONBAG_TRAILING_STOP = 4
+    USOR_TRAILING_STOP = 5
+    USOR_LOCKDOWN = 6
+    USOR_TARGET_HIT = 7
+    HOLDING_USOR = 8
+    # Generic exits for ladders defined in config
+    TAKE_PROFIT = 9
+    TRAILING_STOP = 10
+    TIME_EXIT = 11
+
+    @property
+    def label(self) -> str:
+        return _REASON_LABELS[self]
+
+_REASON_LABELS = {
+    SellReason.HOLDING_STANDARD: "Holding Standard",
+    SellReason.TIER_1_PROFIT: "Tier 1 Profit",
+    SellReason.TIER_2_PROFIT: "Tier 2 Profit",
+    SellReason.TIER_3_PROFIT: "Tier 3 Profit",
+    SellReason.MOONBAG_TRAILING_STOP: "Moonbag Trailing Stop",
+    SellReason.USOR_TRAILING_STOP: "USOR Trailing Stop Hit",
+    SellReason.USOR_LOCKDOWN: "Lockdown Mode",
+    SellReason.USOR_TARGET_HIT: "USOR 5x Target Hit",
+    SellReason.HOLDING_USOR: "Holding USOR",
+    SellReason.TAKE_PROFIT: "Take Profit",
+    SellReason.TRAILING_STOP: "Trailing Stop",
+    SellReason.TIME_EXIT: "Time Exit",
+}
+
 class Strategy:
+    @staticmethod
+    def in_lockdown(now=None) -> bool:
+        """USOR Date Guard (Jan 25 - Feb 5). Compute once per cycle and pass it to the batch API."""
+        if now is None:
+            now = datetime.now()
+        if now.month == 1 and now.day >= 25:
+            return True
+        elif now.month == 2 and now.day <= 5:
+            return True
+        return False
+
     @staticmethod
     def get_sell_action(
         token_address: str,
@@ -10,31 +58,115 @@ class Strategy:
         highest_price: float,
         sold_tier_1: bool,
         sold_tier_2: bool,
-        sold_tier_3: bool
+        sold_tier_3: bool,
+        now=None
     ):
         """
         Determine if we should sell based on strategy.
+        `now` replaces the wall clock for the lockdown check (backtests).
         Returns: (should_sell: bool, sell_pct: float, reason: str)
         """
         gain_pct = (current_price - entry_price) / entry_price
         is_usor = token_address == Config.USOR_ADDRESS
         
         # Check Date Guard (Jan 25 - Feb 5)
-        now = datetime.now()
-        # Assuming 2026 based on env context, but safe to check month/day
         # Logic: If within window, ONLY Stop Loss allowed.
-        # Window: Jan 25 to Feb 5
-        in_lockdown = False
-        if now.month == 1 and now.day >= 25:
-            in_lockdown = True
-        elif now.month == 2 and now.day <= 5:
-            in_lockdown = True
+        in_lockdown = Strategy.in_lockdown(now)
             
         if is_usor:
             return Strategy._usor_logic(current_price, highest_price, gain_pct, in_lockdown)
         else:
             return Strategy._standard_logic(gain_pct, current_price, highest_price, sold_tier_1, sold_tier_2, sold_tier_3, in_lockdown)
 
+    @staticmethod
+    def get_sell_actions(current_price, entry_price, highest_price, sold_tier_1, sold_tier_2, sold_tier_3, is_usor, in_lockdown=None, params=None):
+        """
+        Batch form of get_sell_action over columnar arrays, one row per position.
+        Returns (should_sell: bool[], sell_pct: float[], reason: int[] of SellReason).
+        Gives the same decisions as _standard_logic / _usor_logic, row by row.
+        `in_lockdown` may be a scalar or per-row array. `params` overrides Config
+        settings by name (e.g. {"TIER_1_GAIN": 0.3}); values may be per-row arrays.
+        """
+        if in_lockdown is None:
+            in_lockdown = Strategy.in_lockdown()
+        p = Strategy._params(params)
+
+        current = np.asarray(current_price, dtype=np.float64)
+        entry = np.asarray(entry_price, dtype=np.float64)
+        high = np.asarray(highest_price, dtype=np.float64)
+        t1 = np.asarray(sold_tier_1, dtype=bool)
+        t2 = np.asarray(sold_tier_2, dtype=bool)
+        t3 = np.asarray(sold_tier_3, dtype=bool)
+        usor = np.asarray(is_usor, dtype=bool)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gain = (current - entry) / entry
+            drop = (high - current) / high
+        std = ~usor
+
+        # Conditions in the same priority order as the scalar branches
+        conditions = [
+            usor & (drop >= p['USOR_TRAILING_STOP']),
+            usor & in_lockdown,
+            usor & (gain >= p['USOR_TARGET_GAIN']),
+            usor,
+            std & (gain >= p['TIER_1_GAIN']) & ~t1,
+            std & (gain >= p['TIER_2_GAIN']) & ~t2,
+            std & (gain >= p['TIER_3_GAIN']) & ~t3,
+            std & t3 & (drop >= p['MOONBAG_TRAILING_STOP']),
+        ]
+        reasons = [
+            SellReason.USOR_TRAILING_STOP,
+            SellReason.USOR_LOCKDOWN,
+            SellReason.USOR_TARGET_HIT,
+            SellReason.HOLDING_USOR,
+            SellReason.TIER_1_PROFIT,
+            SellReason.TIER_2_PROFIT,
+            SellReason.TIER_3_PROFIT,
+            SellReason.MOONBAG_TRAILING_STOP,
+        ]
+        reason = np.select(conditions, reasons, default=SellReason.HOLDING_STANDARD).astype(np.int8)
+        sell_pct = np.array(Strategy._sell_pct_choices(p, scalar_only=True))[reason]
+        # Per-row sell fractions (parameter sweeps) are filled in where their tier fired
+        for code, name in Strategy._TIER_PCT_PARAMS:
+            if np.ndim(p[name]):
+                sell_pct = np.where(reason == code, p[name], sell_pct)
+        return sell_pct > 0, sell_pct, reason
+
+    # Config settings the batch API reads; `params` may override any of them
+    PARAM_NAMES = (
+        "TIER_1_GAIN", "TIER_1_PCT", "TIER_2_GAIN", "TIER_2_PCT", "TIER_3_GAIN", "TIER_3_PCT",
+        "MOONBAG_TRAILING_STOP", "USOR_TARGET_GAIN", "USOR_TRAILING_STOP",
+    )
+
+    @staticmethod
+    def _params(overrides=None) -> dict:
+        params = {name: getattr(Config, name) for name in Strategy.PARAM_NAMES}
+        if overrides:
+            unknown = set(overrides) - set(params)
+            if unknown:
+                raise ValueError(f"Unknown strategy parameters: {', '.join(sorted(unknown))}")
+            params.update(overrides)
+        return params
+
+    _TIER_PCT_PARAMS = (
+        (SellReason.TIER_1_PROFIT, "TIER_1_PCT"),
+        (SellReason.TIER_2_PROFIT, "TIER_2_PCT"),
+        (SellReason.TIER_3_PROFIT, "TIER_3_PCT"),
+    )
+
+    @staticmethod
+    def _sell_pct_choices(p, scalar_only=False) -> list:
+        """Sell fraction per SellReason, in reason-code order. Array values become 0 with scalar_only."""
+        choices = [0.0] * len(SellReason)
+        for code, name in Strategy._TIER_PCT_PARAMS:
+            if not (scalar_only and np.ndim(p[name])):
+                choices[code] = p[name]
+        choices[SellReason.MOONBAG_TRAILING_STOP] = 1.0
+        choices[SellReason.USOR_TRAILING_STOP] = 1.0
+        choices[SellReason.USOR_TARGET_HIT] = 0.5
+        return choices
+
     @staticmethod
     def _usor_logic(current_price, highest_price, gain_pct, in_lockdown):
         # USOR: Sell 0% until 5x.
@@ -114,3 +246,4 @@ class Strategy:
                 return True, 1.0, "Moonbag Trailing Stop"
                 
         return False, 0.0, "Holding Standard"
+
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from src.config.config import Config
+from src.utils.csv_logger import CSVLogger
+from src.utils.logger import logger
+
+class TaxLedger:
+    """
+    Tax owed to the vault, accrued per profitable sell and paid in one transfer.
+
+    `accrue` is called from the sell loop and only updates the ledger (no RPC).
+    `settle` sends the whole accrued amount once it reaches
+    Config.TAX_SETTLE_THRESHOLD or Config.TAX_SETTLE_INTERVAL has passed
+    since the last payment. Accruals only mark the ledger dirty; `flush`
+    writes it off the event loop from the tax job, while `settle` saves
+    synchronously around the transfer so a crash mid-payment is never lost.
+    The trade log records a TAX_ACCRUE row per sell and a TAX row per
+    settlement, which serves as the audit trail.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.accrued = 0.0
+        self.accruals = 0
+        self.settling = 0.0  # Amount of a transfer in progress
+        self.last_settled = time.time()
+        self.total_paid = 0.0
+        self.dirty = False
+        # Every write goes through the same temp file, so writes are serialized
+        self.save_lock = asyncio.Lock()
+
+    @staticmethod
+    def read(path) -> dict:
+        path = Path(path)
+        if not path.exists():
+            return {}
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load tax ledger: {e}")
+            return {}
+
+    def load(self):
+        state = self.read(self.path)
+        self.accrued = state.get("accrued", 0.0)
+        self.accruals = state.get("accruals", 0)
+        self.last_settled = state.get("last_settled", self.last_settled)
+        self.total_paid = state.get("total_paid", 0.0)
+        if state.get("settling"):
+            # We can't tell whether the interrupted transfer landed; owing it again is the safe side
+            logger.warning(f"Tax transfer of {state['settling']:.6f} SOL was interrupted; re-accruing it. Check the vault before the next settlement.")
+            self.accrued += state["settling"]
+            self._save()
+
+    def _state(self) -> dict:
+        self.dirty = False
+        return {
+            "accrued": self.accrued,
+            "accruals": self.accruals,
+            "settling": self.settling,
+            "last_settled": self.last_settled,
+            "total_paid": self.total_paid,
+        }
+
+    def _save(self):
+        self._write(self._state())
+
+    def _write(self, state):
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Failed to save tax ledger: {e}")
+
+    def accrue(self, mint: str, amount: float, pnl: float):
+        self.accrued += amount
+        self.accruals += 1
+        self.dirty = True
+        # PnL stays on the SELL row so summing the PnL column doesn't count it twice
+        CSVLogger.log_trade("TAX_ACCRUE", mint, amount, 0, amount, 0, 0, f"Tax Accrued on {pnl:.6f} SOL profit")
+
+    async def flush(self):
+        """Write accruals made since the last save, off the event loop."""
+        async with self.save_lock:
+            if self.dirty:
+                await asyncio.to_thread(self._write, self._state())
+
+    def due(self, now: float = None) -> bool:
+        if self.accrued <= 0 or self.settling:
+            return False
+        now = time.time() if now is None else now
+        return self.accrued >= Config.TAX_SETTLE_THRESHOLD or now - self.last_settled >= Config.TAX_SETTLE_INTERVAL
+
+    async def settle(self, send, force: bool = False) -> float:
+        """
+        Pay the accrued tax with `send(amount) -> bool` if due (or `force`).
+        Returns the amount paid, 0.0 if nothing was sent or the send failed.
+        """
+        if not (self.due() or (force and self.accrued > 0 and not self.settling)):
+            return 0.0
+        amount, accruals = self.accrued, self.accruals
+        self.settling, self.accrued, self.accruals = amount, 0.0, 0
+        async with self.save_lock:
+            self._save()
+
+        try:
+            ok = await send(amount)
+        except Exception as e:
+            logger.error(f"Tax settlement failed: {e}")
+            ok = False
+
+        self.settling = 0.0
+        if ok:
+            self.last_settled = time.time()
+            self.total_paid += amount
+            CSVLogger.log_trade("TAX", "SOL", amount, 0, amount, 0, 0, f"Tax Vault Deposit ({accruals} accruals)")
+        else:
+            # Accruals made while the transfer was in flight stay on top
+            self.accrued += amount
+            self.accruals += accruals
+        async with self.save_lock:
+            self._save()
+        return amount if ok else 0.0
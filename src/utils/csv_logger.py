@@ -1,29 +1,121 @@
 import csv
-import os
+import struct
+import time
 from datetime import datetime
 from src.config.config import Config
+from src.utils.group_commit import GroupCommitWriter
+from src.utils.logger import logger
+from src.utils.trade_store import TradeStore
 
-class CSVLogger:
-    HEADERS = ["Timestamp", "Date", "Type", "Token", "Amount", "Price", "Total_SOL", "Fee_SOL", "PnL_SOL", "Reason"]
+class TradeBinarySink:
+    """
+    Compact append-only binary trade log.
+    Each record is six little-endian doubles (timestamp, amount, price, total,
+    fee, pnl) followed by length-prefixed UTF-8 type, token and reason.
+    """
+    NUMBERS = struct.Struct("<dddddd")
+    LENGTHS = struct.Struct("<BHH")
+
+    def __init__(self, path):
+        self.path = path
 
     @staticmethod
-    def log_trade(trade_type, token, amount, price, total, fee=0.0, pnl=0.0, reason=""):
-        file_exists = os.path.isfile(Config.TRADES_LOG)
-        
+    def _float(value):
+        return float(value) if value is not None else float("nan")
+
+    def write(self, rows):
+        chunks = []
+        for ts, trade_type, token, amount, price, total, fee, pnl, reason in rows:
+            t, k, r = str(trade_type).encode(), str(token).encode(), str(reason).encode()
+            chunks.append(self.NUMBERS.pack(ts, self._float(amount), self._float(price), self._float(total), self._float(fee), self._float(pnl)))
+            chunks.append(self.LENGTHS.pack(len(t), len(k), len(r)))
+            chunks.append(t + k + r)
+        with open(self.path, 'ab') as f:
+            f.write(b"".join(chunks))
+
+    @classmethod
+    def read(cls, path):
+        """Yield (timestamp, type, token, amount, price, total, fee, pnl, reason) tuples."""
+        with open(path, 'rb') as f:
+            data = f.read()
+        pos = 0
+        while pos + cls.NUMBERS.size + cls.LENGTHS.size <= len(data):
+            ts, amount, price, total, fee, pnl = cls.NUMBERS.unpack_from(data, pos)
+            pos += cls.NUMBERS.size
+            t_len, k_len, r_len = cls.LENGTHS.unpack_from(data, pos)
+            pos += cls.LENGTHS.size
+            if pos + t_len + k_len + r_len > len(data):
+                break  # Torn tail
+            trade_type = data[pos:pos + t_len].decode()
+            pos += t_len
+            token = data[pos:pos + k_len].decode()
+            pos += k_len
+            reason = data[pos:pos + r_len].decode()
+            pos += r_len
+            yield ts, trade_type, token, amount, price, total, fee, pnl, reason
+
+class _TradeWriter(GroupCommitWriter):
+    """Formats queued trades and appends them to the CSV (and the binary sink and trade store) once per group."""
+
+    def __init__(self):
+        super().__init__("TradeWriter", max_batch=Config.TRADE_LOG_MAX_BATCH, max_delay=Config.TRADE_LOG_FLUSH_INTERVAL)
+        self.binary = TradeBinarySink(Config.TRADES_BINARY_LOG) if Config.TRADES_BINARY_SINK else None
+        self.store = TradeStore(Config.TRADE_STORE_FILE) if Config.TRADE_STORE_ENABLED else None
+
+    def write_batch(self, rows):
+        # Before the CSV: a newly created store backfills from the CSV and must not see this batch twice
+        if self.store:
+            try:
+                self.store.write(rows)
+            except Exception as e:
+                logger.error(f"Trade store write failed: {e}")
+
         with open(Config.TRADES_LOG, 'a', newline='') as f:
             writer = csv.writer(f)
-            if not file_exists:
+            if f.tell() == 0:
                 writer.writerow(CSVLogger.HEADERS)
-            
-            writer.writerow([
-                datetime.now().isoformat(),
-                datetime.now().strftime("%Y-%m-%d"),
-                trade_type,
-                token,
-                amount,
-                price,
-                total,
-                fee,
-                pnl,
-                reason
-            ])
+
+            for ts, trade_type, token, amount, price, total, fee, pnl, reason in rows:
+                now = datetime.fromtimestamp(ts)
+                writer.writerow([
+                    now.isoformat(),
+                    now.strftime("%Y-%m-%d"),
+                    trade_type,
+                    token,
+                    amount,
+                    price,
+                    total,
+                    fee,
+                    pnl,
+                    reason
+                ])
+
+        if self.binary:
+            self.binary.write(rows)
+
+    def close(self, timeout: float = 10.0):
+        super().close(timeout)
+        if self.store:
+            self.store.close()
+
+class CSVLogger:
+    HEADERS = ["Timestamp", "Date", "Type", "Token", "Amount", "Price", "Total_SOL", "Fee_SOL", "PnL_SOL", "Reason"]
+    writer = None
+
+    @staticmethod
+    def log_trade(trade_type, token, amount, price, total, fee=0.0, pnl=0.0, reason=""):
+        """Queue a trade row. The write happens on the background trade writer."""
+        if CSVLogger.writer is None:
+            CSVLogger.writer = _TradeWriter()
+        CSVLogger.writer.put((time.time(), trade_type, token, amount, price, total, fee, pnl, reason))
+
+    @staticmethod
+    def flush():
+        if CSVLogger.writer is not None:
+            CSVLogger.writer.flush()
+
+    @staticmethod
+    def close():
+        """Write everything still queued. Called on engine shutdown (and at exit)."""
+        if CSVLogger.writer is not None:
+            CSVLogger.writer.close()
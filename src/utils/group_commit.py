@@ -0,0 +1,117 @@
+import atexit
+import queue
+import threading
+import time
+from src.utils.logger import logger
+from src.utils.metrics import queue_depth
+
+_STOP = object()
+
+class GroupCommitWriter:
+    """
+    Background writer that commits queued records in groups.
+
+    Producers call `put()`, which only enqueues. A daemon thread drains the
+    queue and hands what it collected to `write_batch()` once `max_batch`
+    records are waiting or `max_delay` seconds have passed since the first
+    one, so file syscalls and fsyncs are paid per group instead of per
+    record and never run on the asyncio loop. `flush()` blocks until
+    everything queued before it is written; `close()` flushes and stops the
+    thread, and runs at interpreter exit.
+
+    Subclasses implement `write_batch(items)`.
+    """
+
+    def __init__(self, name: str, max_batch: int = 256, max_delay: float = 0.5):
+        self.name = name
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+        queue_depth.labels(name).set_function(self.queue.qsize)
+        atexit.register(self.close)
+
+    def _ensure_started(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self.thread.start()
+
+    def put(self, item):
+        self._ensure_started()
+        self.queue.put(item)
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until everything queued so far is written."""
+        if self.thread is None:
+            return True
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 10.0):
+        with self.lock:
+            thread = self.thread
+            self.thread = None
+        if thread is None or not thread.is_alive():
+            return
+        self.queue.put(_STOP)
+        thread.join(timeout)
+
+    def write_batch(self, items):
+        raise NotImplementedError
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch = []
+            waiters = []
+            item = self.queue.get()
+            deadline = time.monotonic() + self.max_delay
+            while True:
+                if item is _STOP:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    # Flush requested: commit what we have right away
+                    waiters.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.max_batch:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    self.write_batch(batch)
+                except Exception as e:
+                    logger.error(f"{self.name} failed to write {len(batch)} records: {e}")
+            for waiter in waiters:
+                waiter.set()
+
+        # Anything queued behind the stop marker
+        leftover = []
+        waiters = []
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not _STOP:
+                leftover.append(item)
+        if leftover:
+            try:
+                self.write_batch(leftover)
+            except Exception as e:
+                logger.error(f"{self.name} failed to write {len(leftover)} records: {e}")
+        for waiter in waiters:
+            waiter.set()
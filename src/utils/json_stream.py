@@ -0,0 +1,31 @@
+import re
+
+BASE58_VALUE = rb'[1-9A-HJ-NP-Za-km-z]{32,44}'
+
+class JsonKeyStream:
+    """
+    Incremental extractor for one string field of a JSON document.
+
+    Feed raw bytes as they arrive and get back every value of `key` that
+    matches `value_pattern`. The key must be an object member (preceded by
+    `{` or `,`), so text inside other strings is not picked up. Nothing but
+    the matched values is decoded; the rest of the document is never
+    materialized.
+    """
+
+    def __init__(self, key: str = "address", value_pattern: bytes = BASE58_VALUE):
+        key_bytes = re.escape(key.encode())
+        self.pattern = re.compile(rb'[{,]\s{0,16}"' + key_bytes + rb'"\s{0,16}:\s{0,16}"(' + value_pattern + rb')"')
+        # Longest possible match; anything that may still complete in the next chunk fits in this tail
+        self.tail = len(key_bytes) + 128
+        self.buffer = b""
+
+    def feed(self, chunk: bytes) -> list:
+        data = self.buffer + chunk if self.buffer else chunk
+        values = []
+        last = 0
+        for match in self.pattern.finditer(data):
+            values.append(match.group(1).decode())
+            last = match.end()
+        self.buffer = data[max(last, len(data) - self.tail):]
+        return values
@@ -0,0 +1,313 @@
+import asyncio
+import time
+from bisect import bisect_left
+import httpx
+from src.config.config import Config
+from src.utils.logger import logger
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _format_labels(names, values, extra=()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+def _format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    """
+    A metric family: one child per distinct label set.
+
+    `labels(*values)` returns the child, created once and cached, so hot
+    paths can keep the child and pay only an attribute update per event.
+    Updates happen on the event loop; the occasional update from a writer
+    thread is a plain `+=`, which is good enough for monitoring.
+    """
+    TYPE = None
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.children = {}
+
+    def labels(self, *values):
+        child = self.children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self.children[values] = self._child()
+        return child
+
+    def _child(self):
+        raise NotImplementedError
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"]
+        for values, child in list(self.children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values, child) -> list:
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.get())}"]
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def get(self):
+        return self.value
+
+class Counter(_Metric):
+    TYPE = "counter"
+
+    def _child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+class _GaugeChild:
+    __slots__ = ("value", "function")
+
+    def __init__(self):
+        self.value = 0
+        self.function = None
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+    def set_function(self, function):
+        """Read the value from `function()` at scrape time instead (e.g. a queue's qsize)."""
+        self.function = function
+
+    def get(self):
+        if self.function is not None:
+            try:
+                return self.function()
+            except Exception:
+                return 0
+        return self.value
+
+class Gauge(_Metric):
+    TYPE = "gauge"
+
+    def _child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        self.labels().set(value)
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def time(self):
+        return _Timer(self)
+
+class _Timer:
+    __slots__ = ("child", "started")
+
+    def __init__(self, child):
+        self.child = child
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.child.observe(time.perf_counter() - self.started)
+        return False
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram; an observation is one bisect and three increments."""
+    TYPE = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def _render_child(self, values, child) -> list:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+            cumulative += count
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, [('le', _format_value(float(bound)))])} {cumulative}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+
+    def register(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+# --- Shared instruments ---
+
+upstream_seconds = registry.histogram(
+    "skry_upstream_request_seconds", "Latency of calls to external services.", ("upstream", "op"))
+upstream_requests = registry.counter(
+    "skry_upstream_requests_total", "Calls to external services by outcome (success, failure, timeout).", ("upstream", "op", "outcome"))
+stage_seconds = registry.histogram(
+    "skry_stage_seconds", "Time spent in each engine stage (screen, quote, execute, analyze, manage_cycle).", ("stage",))
+pipeline_decisions = registry.counter(
+    "skry_pipeline_decisions_total", "Mints leaving the scan pipeline, by the stage that decided.", ("decision",))
+queue_depth = registry.gauge(
+    "skry_queue_depth", "Items waiting in internal queues.", ("queue",))
+open_positions = registry.gauge(
+    "skry_open_positions", "Positions currently held.")
+job_runs = registry.counter(
+    "skry_job_runs_total", "Scheduler job runs by outcome (ok, failure, timeout).", ("job", "outcome"))
+job_overruns = registry.counter(
+    "skry_job_overruns_total", "Job runs that ended after the next run was due.", ("job",))
+job_seconds = registry.histogram(
+    "skry_job_seconds", "Scheduler job run time.", ("job",))
+
+SUCCESS = "success"
+FAILURE = "failure"
+TIMEOUT = "timeout"
+
+def is_timeout(exc) -> bool:
+    """True for timeouts, including ones wrapped by a client library."""
+    while exc is not None:
+        if isinstance(exc, (asyncio.TimeoutError, httpx.TimeoutException)):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+class track_upstream:
+    """
+    Time one upstream call and count its outcome.
+
+        with track_upstream("jupiter", "quote") as call:
+            resp = await client.get(url)
+            if resp.status_code != 200:
+                call.fail()
+
+    An exception leaving the block counts as a timeout or failure and is re-raised.
+    """
+    __slots__ = ("upstream", "op", "outcome", "started")
+
+    def __init__(self, upstream: str, op: str):
+        self.upstream = upstream
+        self.op = op
+        self.outcome = SUCCESS
+
+    def fail(self):
+        self.outcome = FAILURE
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        upstream_seconds.labels(self.upstream, self.op).observe(time.perf_counter() - self.started)
+        if exc_type is not None:
+            self.outcome = TIMEOUT if is_timeout(exc) else FAILURE
+        upstream_requests.labels(self.upstream, self.op, self.outcome).inc()
+        return False
+
+class MetricsServer:
+    """
+    Serves `GET /metrics` from a registry on a local port.
+    Rendering happens per scrape, so the engine only pays for updates.
+    """
+
+    def __init__(self, registry: Registry = registry, host: str = None, port: int = None):
+        self.registry = registry
+        self.host = host or Config.METRICS_HOST
+        self.port = Config.METRICS_PORT if port is None else port
+        self.server = None
+
+    async def start(self):
+        try:
+            self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        except OSError as e:
+            logger.error(f"Failed to start metrics endpoint on {self.host}:{self.port}: {e}")
+            return None
+        self.port = self.server.sockets[0].getsockname()[1]
+        logger.info(f"Metrics at http://{self.host}:{self.port}/metrics")
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def _handle(self, reader, writer):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), 5)
+            # Skip the headers; a scrape has no body
+            while (await asyncio.wait_for(reader.readline(), 5)) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] in ("/metrics", "/"):
+                status, body = "200 OK", self.registry.render().encode()
+            else:
+                status, body = "404 Not Found", b"Not found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
@@ -0,0 +1,179 @@
+import mmap
+import sys
+import os
+from array import array
+from pathlib import Path
+from solders.pubkey import Pubkey
+from src.utils.logger import logger
+
+class MintIndex:
+    """
+    Persistent, memory-mapped set of mint addresses.
+
+    Mints are stored as sorted 32-byte keys behind a 65536-entry fan-out table
+    (keyed on the first two bytes, as in git's pack index), so a lookup is a
+    short binary search inside one bucket of the mapped file. Batch inserts
+    merge into a temp file that atomically replaces the old one. The file is
+    only opened on first use. Counts are stored in native byte order; the
+    file is a local cache, not an interchange format.
+
+    Supports the parts of the set API the scanner uses: `in`, `len`, `add`
+    and `update`.
+    """
+
+    MAGIC = b"MINTIDX1"
+    KEY_SIZE = 32
+    FANOUT = 65536
+    HEADER_SIZE = len(MAGIC) + 8 + FANOUT * 4
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.loaded = False
+        self.count = 0
+        self.mm = None
+        self.fanout = None
+        # Addresses that are not 32-byte keys; kept in memory only
+        self.extra = set()
+
+    # --- Loading ---
+
+    def _ensure_loaded(self):
+        if not self.loaded:
+            self._map()
+            self.loaded = True
+
+    def _map(self):
+        self._unmap()
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to map mint index {self.path}: {e}")
+            return
+
+        count = int.from_bytes(mm[8:16], sys.byteorder) if len(mm) >= 16 else 0
+        if mm[:8] != self.MAGIC or len(mm) != self.HEADER_SIZE + count * self.KEY_SIZE:
+            logger.error(f"Mint index {self.path} is corrupt, ignoring it.")
+            mm.close()
+            return
+
+        self.mm = mm
+        self.count = count
+        self.fanout = memoryview(mm)[16:self.HEADER_SIZE].cast('I')
+
+    def _unmap(self):
+        if self.fanout is not None:
+            self.fanout.release()
+            self.fanout = None
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+        self.count = 0
+
+    def close(self):
+        self._unmap()
+        self.loaded = False
+
+    # --- Lookups ---
+
+    @staticmethod
+    def _to_key(mint: str):
+        try:
+            return bytes(Pubkey.from_string(mint))
+        except ValueError:
+            return None
+
+    def _search(self, key: bytes) -> int:
+        """Index of the first record >= key."""
+        prefix = (key[0] << 8) | key[1]
+        lo = self.fanout[prefix - 1] if prefix else 0
+        hi = self.fanout[prefix]
+        mm = self.mm
+        base = self.HEADER_SIZE
+        size = self.KEY_SIZE
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = base + mid * size
+            if mm[start:start + size] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _has_key(self, key: bytes) -> bool:
+        if not self.count:
+            return False
+        i = self._search(key)
+        if i >= self.count:
+            return False
+        start = self.HEADER_SIZE + i * self.KEY_SIZE
+        return self.mm[start:start + self.KEY_SIZE] == key
+
+    def __contains__(self, mint) -> bool:
+        self._ensure_loaded()
+        key = self._to_key(mint)
+        if key is None:
+            return mint in self.extra
+        return self._has_key(key)
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return self.count + len(self.extra)
+
+    # --- Inserts ---
+
+    def add(self, mint: str):
+        self.update([mint])
+
+    def update(self, mints):
+        """Insert a batch of mints with one atomic file replace."""
+        self._ensure_loaded()
+        keys = set()
+        for mint in mints:
+            key = self._to_key(mint)
+            if key is None:
+                self.extra.add(mint)
+            elif not self._has_key(key):
+                keys.add(key)
+        if not keys:
+            return
+        self._write_merged(sorted(keys))
+
+    def _write_merged(self, new_keys):
+        total = self.count + len(new_keys)
+
+        counts = array('I', bytes(4 * self.FANOUT))
+        for key in new_keys:
+            counts[(key[0] << 8) | key[1]] += 1
+        fanout = array('I', bytes(4 * self.FANOUT))
+        running = 0
+        for prefix in range(self.FANOUT):
+            running += counts[prefix]
+            fanout[prefix] = running + (self.fanout[prefix] if self.fanout is not None else 0)
+
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(self.MAGIC)
+            f.write(total.to_bytes(8, sys.byteorder))
+            f.write(fanout.tobytes())
+
+            # Copy runs of existing records between insertion points
+            copied = 0
+            for key in new_keys:
+                i = self._search(key) if self.count else 0
+                if i > copied:
+                    f.write(self.mm[self.HEADER_SIZE + copied * self.KEY_SIZE:self.HEADER_SIZE + i * self.KEY_SIZE])
+                    copied = i
+                f.write(key)
+            if copied < self.count:
+                f.write(self.mm[self.HEADER_SIZE + copied * self.KEY_SIZE:self.HEADER_SIZE + self.count * self.KEY_SIZE])
+
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._unmap()
+        os.replace(tmp_path, self.path)
+        self._map()
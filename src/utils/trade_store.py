@@ -0,0 +1,201 @@
+import csv
+import sqlite3
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from src.config.config import Config
+from src.utils.logger import logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    date TEXT NOT NULL,
+    type TEXT NOT NULL,
+    token TEXT NOT NULL,
+    amount REAL, price REAL, total REAL, fee REAL, pnl REAL,
+    reason TEXT
+);
+CREATE INDEX IF NOT EXISTS trades_date ON trades(date);
+CREATE INDEX IF NOT EXISTS trades_token_ts ON trades(token, ts);
+
+CREATE TABLE IF NOT EXISTS daily_rollup (
+    date TEXT PRIMARY KEY,
+    buys INTEGER NOT NULL DEFAULT 0,
+    sells INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    volume_sol REAL NOT NULL DEFAULT 0,
+    fees_sol REAL NOT NULL DEFAULT 0,
+    realized_pnl REAL NOT NULL DEFAULT 0,
+    tax_accrued REAL NOT NULL DEFAULT 0,
+    tax_paid REAL NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS token_rollup (
+    token TEXT PRIMARY KEY,
+    buys INTEGER NOT NULL DEFAULT 0,
+    sells INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    volume_sol REAL NOT NULL DEFAULT 0,
+    fees_sol REAL NOT NULL DEFAULT 0,
+    realized_pnl REAL NOT NULL DEFAULT 0,
+    tax_accrued REAL NOT NULL DEFAULT 0,
+    first_ts REAL,
+    last_ts REAL
+);
+"""
+
+COUNTERS = ("buys", "sells", "wins", "volume_sol", "fees_sol", "realized_pnl", "tax_accrued")
+
+class TradeStore:
+    """
+    SQLite trade history with per-day and per-token rollups.
+
+    `write` runs on the trade writer thread: each batch of rows is inserted
+    and folded into the rollup tables in the same transaction, so the
+    rollups always match the rows. Readers (dashboard, Telegram) open their
+    own connections and query the small rollup tables instead of scanning
+    trades. WAL mode lets them read while the writer appends.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.conn = None
+
+    def _connect(self):
+        if self.conn is None:
+            fresh = not self.path.exists()
+            # Used by one writer thread at a time; `close` may run on another once it has stopped
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+            if fresh:
+                self._backfill()
+        return self.conn
+
+    def _backfill(self):
+        """Import trades.csv once when the store is first created."""
+        if not Path(Config.TRADES_LOG).exists():
+            return
+        rows = []
+        with open(Config.TRADES_LOG, newline='') as f:
+            for rec in csv.DictReader(f):
+                try:
+                    rows.append((
+                        datetime.fromisoformat(rec["Timestamp"]).timestamp(), rec["Type"], rec["Token"],
+                        *(float(rec[k] or 0) for k in ("Amount", "Price", "Total_SOL", "Fee_SOL", "PnL_SOL")),
+                        rec["Reason"]
+                    ))
+                except (KeyError, ValueError):
+                    continue
+        if rows:
+            self._insert(rows)
+            logger.info(f"Imported {len(rows)} trades from {Config.TRADES_LOG} into the trade store.")
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    # --- Writes ---
+
+    def write(self, rows):
+        """Insert (timestamp, type, token, amount, price, total, fee, pnl, reason) rows."""
+        self._connect()
+        self._insert(rows)
+
+    def _insert(self, rows):
+        records = []
+        daily = defaultdict(lambda: dict.fromkeys(COUNTERS + ("tax_paid",), 0))
+        tokens = defaultdict(lambda: dict.fromkeys(COUNTERS, 0) | {"first_ts": None, "last_ts": None})
+
+        for ts, trade_type, token, amount, price, total, fee, pnl, reason in rows:
+            date = datetime.fromtimestamp(ts).strftime("%Y-%m-%d")
+            total, fee, pnl = total or 0.0, fee or 0.0, pnl or 0.0
+            records.append((ts, date, trade_type, token, amount, price, total, fee, pnl, reason))
+
+            day = daily[date]
+            if trade_type == "TAX":
+                day["tax_paid"] += total
+                continue
+            tok = tokens[token]
+            tok["first_ts"] = ts if tok["first_ts"] is None else min(tok["first_ts"], ts)
+            tok["last_ts"] = ts if tok["last_ts"] is None else max(tok["last_ts"], ts)
+            for bucket in (day, tok):
+                if trade_type == "BUY":
+                    bucket["buys"] += 1
+                    bucket["volume_sol"] += total
+                elif trade_type == "SELL":
+                    bucket["sells"] += 1
+                    bucket["wins"] += pnl > 0
+                    bucket["volume_sol"] += total
+                    bucket["realized_pnl"] += pnl
+                elif trade_type == "TAX_ACCRUE":
+                    bucket["tax_accrued"] += total
+                bucket["fees_sol"] += fee
+
+        daily_cols = COUNTERS + ("tax_paid",)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO trades (ts, date, type, token, amount, price, total, fee, pnl, reason) VALUES (?,?,?,?,?,?,?,?,?,?)",
+                records
+            )
+            self.conn.executemany(
+                f"INSERT INTO daily_rollup (date, {', '.join(daily_cols)}) VALUES (?{', ?' * len(daily_cols)}) "
+                f"ON CONFLICT(date) DO UPDATE SET {', '.join(f'{c} = {c} + excluded.{c}' for c in daily_cols)}",
+                [(date, *(d[c] for c in daily_cols)) for date, d in daily.items()]
+            )
+            self.conn.executemany(
+                f"INSERT INTO token_rollup (token, {', '.join(COUNTERS)}, first_ts, last_ts) VALUES (?{', ?' * (len(COUNTERS) + 2)}) "
+                f"ON CONFLICT(token) DO UPDATE SET {', '.join(f'{c} = {c} + excluded.{c}' for c in COUNTERS)}, "
+                "first_ts = MIN(first_ts, excluded.first_ts), last_ts = MAX(last_ts, excluded.last_ts)",
+                [(token, *(t[c] for c in COUNTERS), t["first_ts"], t["last_ts"]) for token, t in tokens.items()]
+            )
+
+    # --- Reads (own read-only connection, any thread) ---
+
+    def _query(self, sql, params=()):
+        if not self.path.exists():
+            return []
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        conn.row_factory = sqlite3.Row
+        try:
+            return [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+    def summary(self) -> dict:
+        rows = self._query(
+            "SELECT COUNT(*) AS days, TOTAL(buys) AS buys, TOTAL(sells) AS sells, TOTAL(wins) AS wins, "
+            "TOTAL(volume_sol) AS volume_sol, TOTAL(fees_sol) AS fees_sol, TOTAL(realized_pnl) AS realized_pnl, "
+            "TOTAL(tax_accrued) AS tax_accrued, TOTAL(tax_paid) AS tax_paid FROM daily_rollup"
+        )
+        summary = rows[0] if rows else dict.fromkeys(("days", "buys", "sells", "wins", "volume_sol", "fees_sol", "realized_pnl", "tax_accrued", "tax_paid"), 0)
+        summary["win_rate"] = summary["wins"] / summary["sells"] if summary["sells"] else 0.0
+        return summary
+
+    def daily(self, days: int = None) -> list:
+        """Per-day rollups, oldest first, with a running cumulative PnL."""
+        sql = "SELECT * FROM daily_rollup ORDER BY date DESC"
+        rows = self._query(sql + " LIMIT ?", (days,)) if days else self._query(sql)
+        rows.reverse()
+        cumulative = 0.0
+        for row in rows:
+            cumulative += row["realized_pnl"]
+            row["cumulative_pnl"] = cumulative
+            row["win_rate"] = row["wins"] / row["sells"] if row["sells"] else 0.0
+        return rows
+
+    def tokens(self, limit: int = 10, order_by: str = "realized_pnl") -> list:
+        if order_by not in COUNTERS + ("last_ts",):
+            raise ValueError(f"Unknown rollup column: {order_by}")
+        rows = self._query(f"SELECT * FROM token_rollup ORDER BY {order_by} DESC LIMIT ?", (limit,))
+        for row in rows:
+            row["win_rate"] = row["wins"] / row["sells"] if row["sells"] else 0.0
+        return rows
+
+    def recent(self, limit: int = 10) -> list:
+        rows = self._query("SELECT * FROM trades ORDER BY id DESC LIMIT ?", (limit,))
+        rows.reverse()
+        return rows
@@ -0,0 +1,79 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+from unittest.mock import patch
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from src.config.config import Config
+from src.engine.backtest import Backtest, PricePaths, param_grid, sweep
+from src.engine.money_manager import MoneyManager
+from src.engine.strategy import Strategy
+
+def scalar_replay(paths, stake, now):
+    """Reference: the engine's manage loop, one position at a time, through the scalar API."""
+    realized = tax = 0.0
+    for prices, usor in zip(paths.prices, paths.is_usor):
+        mint = Config.USOR_ADDRESS if usor else "STD_MINT"
+        entry = high = prices[0]
+        remaining = stake / entry
+        t1 = t2 = t3 = False
+        for price in prices[1:]:
+            high = max(high, price)
+            sell, pct, reason = Strategy.get_sell_action(mint, price, entry, high, t1, t2, t3, now=now)
+            if not sell:
+                continue
+            amount = remaining * pct
+            pnl = (price - entry) * amount
+            realized += pnl
+            tax += MoneyManager.calculate_tax(pnl)
+            remaining -= amount
+            t1 |= reason == "Tier 1 Profit"
+            t2 |= reason == "Tier 2 Profit"
+            t3 |= reason == "Tier 3 Profit"
+            if pct == 1.0 or remaining < 0.0001:
+                break
+    return realized, tax
+
+class TestBacktest(unittest.TestCase):
+
+    def setUp(self):
+        self.paths = PricePaths.synthetic(60, 400, volatility=0.05, seed=3)
+        self.paths.is_usor[:10] = True
+        patcher = patch.object(Config, "USOR_ADDRESS", "USOR_MINT")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_vectorized_matches_scalar_replay(self):
+        for day in (datetime(2026, 1, 28), datetime(2026, 3, 1)):
+            result = Backtest(self.paths, stake_sol=1.0, clock=lambda ts: day).run()
+            realized, tax = scalar_replay(self.paths, 1.0, day)
+            self.assertAlmostEqual(result["realized_pnl"], realized)
+            self.assertAlmostEqual(result["tax"], tax)
+            if day.month == 1:
+                self.assertNotIn("USOR 5x Target Hit", result["exits"])
+
+    def test_each_combo_matches_its_own_run(self):
+        combos = param_grid({"TIER_1_GAIN": [0.1, 0.3], "TIER_1_PCT": [0.2, 0.5], "MOONBAG_TRAILING_STOP": [0.1, 0.25]})
+        backtest = Backtest(self.paths, stake_sol=1.0)
+        batched = backtest.run_many(combos)
+        for combo, result in zip(combos, batched):
+            with patch.multiple(Config, **combo):
+                single = backtest.run()
+            self.assertAlmostEqual(result["net_pnl"], single["net_pnl"])
+            self.assertEqual(result["exits"], single["exits"])
+
+    def test_sweep_across_processes(self):
+        grid = {"TIER_1_GAIN": [0.15, 0.25, 0.35], "TIER_3_GAIN": [0.8, 1.5]}
+        local = sweep(self.paths, grid, processes=1, chunk_size=2)
+        pooled = sweep(self.paths, grid, processes=2, chunk_size=2)
+        self.assertEqual(len(pooled), 6)
+        self.assertEqual([r["params"] for r in local], [r["params"] for r in pooled])
+        self.assertTrue(np.allclose([r["net_pnl"] for r in local], [r["net_pnl"] for r in pooled]))
+        self.assertEqual(local[0]["net_pnl"], max(r["net_pnl"] for r in local))
+
+if __name__ == '__main__':
+    unittest.main()
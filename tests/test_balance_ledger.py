@@ -0,0 +1,65 @@
+import unittest
+import time
+import sys
+import os
+from unittest.mock import patch
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.clients.balance_ledger import BalanceLedger
+from src.config.config import Config
+
+class TestBalanceLedger(unittest.TestCase):
+
+    def setUp(self):
+        self.ledger = BalanceLedger()
+        self.ledger.reconcile(10.0, time.time())
+
+    def test_reservations_size_off_available_balance(self):
+        first = self.ledger.reserve_position()
+        second = self.ledger.reserve_position()
+        self.assertAlmostEqual(first, 10.0 * Config.POSITION_SIZE_PCT)
+        self.assertAlmostEqual(second, (10.0 - first) * Config.POSITION_SIZE_PCT)
+        self.assertAlmostEqual(self.ledger.available, 10.0 - first - second)
+
+        # Buy fills: debit, then release the hold
+        self.ledger.debit(first, "buy A")
+        self.ledger.release(first)
+        self.assertAlmostEqual(self.ledger.balance, 10.0 - first)
+        self.assertAlmostEqual(self.ledger.available, 10.0 - first - second)
+
+    def test_unsynced_ledger_reserves_nothing(self):
+        self.assertEqual(BalanceLedger().reserve_position(), 0.0)
+
+    def test_reconcile_keeps_changes_the_chain_has_not_seen(self):
+        self.ledger.debit(1.0, "buy A", "sigA")
+        self.ledger.credit(0.5, "sell B", "sigB")
+        requested_at = time.time()
+
+        # Chain saw neither transaction yet
+        drift = self.ledger.reconcile(10.0, requested_at)
+        self.assertAlmostEqual(drift, 0.0)
+        self.assertAlmostEqual(self.ledger.balance, 9.5)
+        self.assertEqual(self.ledger.pending_signatures(), ["sigA", "sigB"])
+
+        # A confirmed, then a balance read sent after the confirmation includes it
+        self.ledger.confirm("sigA")
+        self.ledger.reconcile(9.0, time.time() + 1)
+        self.assertAlmostEqual(self.ledger.balance, 9.5)
+        self.assertEqual(self.ledger.pending_signatures(), ["sigB"])
+
+        # B failed on chain: backed out locally
+        self.ledger.confirm("sigB", failed=True)
+        self.assertAlmostEqual(self.ledger.balance, 9.0)
+        self.assertEqual(self.ledger.entries, [])
+
+    def test_unconfirmed_changes_expire(self):
+        self.ledger.debit(1.0, "buy A")
+        with patch.object(Config, "LEDGER_PENDING_TTL", 0):
+            drift = self.ledger.reconcile(10.0, time.time())
+        self.assertAlmostEqual(drift, 1.0)
+        self.assertAlmostEqual(self.ledger.balance, 10.0)
+
+if __name__ == '__main__':
+    unittest.main()
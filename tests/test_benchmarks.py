@@ -0,0 +1,55 @@
+import unittest
+import asyncio
+import sys
+import os
+import tempfile
+from argparse import Namespace
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config.config import Config
+from src.clients.jupiter_client import JupiterClient
+from src.clients.rugcheck_client import RugCheckClient
+from benchmarks import run as bench
+
+class TestBenchmarks(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        # point_config_at rewrites these; put them back for the rest of the suite
+        for owner in (Config, JupiterClient, RugCheckClient):
+            patcher = patch.multiple(owner, **{k: v for k, v in vars(owner).items() if k.isupper()})
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_small_run_reports_every_metric(self):
+        args = Namespace(burst=20, positions=30, cycles=2, latency=0.0, jitter=0.0, error_rate=0.0,
+                         pass_rate=0.5, initial_tokens=50, seed=1)
+        metrics = asyncio.run(bench.run_benchmarks(args, Path(self.tmp.name)))
+
+        self.assertEqual(metrics["scan_mints_screened"], 20)
+        self.assertGreater(metrics["scan_bought"], 0)
+        self.assertLess(metrics["scan_bought"], 20)
+        self.assertEqual(metrics["manage_positions_start"], 30)
+        self.assertGreater(metrics["memory_kib_per_1k_positions"], 0)
+        for name in bench.METRICS:
+            self.assertIn(name, metrics)
+        self.assertEqual(metrics["upstream_requests"]["rugcheck"], 20)
+
+    def test_compare_flags_moves_in_the_wrong_direction(self):
+        baseline = {"metrics": {"scan_mints_per_sec": 100.0, "manage_cycle_p99_ms": 50.0, "memory_kib_per_1k_positions": 400.0}}
+        current = {"metrics": {"scan_mints_per_sec": 80.0, "manage_cycle_p99_ms": 40.0, "memory_kib_per_1k_positions": 420.0}}
+        rows = {name: bad for name, _, _, _, bad in bench.compare(current, baseline, threshold=0.10)}
+
+        self.assertTrue(rows["scan_mints_per_sec"])
+        self.assertFalse(rows["manage_cycle_p99_ms"])
+        self.assertFalse(rows["memory_kib_per_1k_positions"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import csv
+import sys
+import os
+import tempfile
+from unittest.mock import patch
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pathlib import Path
+from src.config.config import Config
+from src.utils.csv_logger import CSVLogger, TradeBinarySink
+from src.utils.trade_store import TradeStore
+
+class TestCSVLogger(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        data_dir = Path(self.tmp.name)
+        self.patches = [
+            patch.object(Config, "TRADES_LOG", data_dir / "trades.csv"),
+            patch.object(Config, "TRADES_BINARY_LOG", data_dir / "trades.bin"),
+            patch.object(Config, "TRADES_BINARY_SINK", True),
+            patch.object(Config, "TRADE_STORE_FILE", data_dir / "trades.db"),
+            patch.object(CSVLogger, "writer", None),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        CSVLogger.close()
+        for p in reversed(self.patches):
+            p.stop()
+        self.tmp.cleanup()
+
+    def test_rows_written_on_flush(self):
+        for i in range(5):
+            CSVLogger.log_trade("SELL", f"MINT_{i}", 10.0, 1.5, 15.0, 0.0, 2.5, "Tier 1 Profit")
+        CSVLogger.log_trade("BUY", "MINT_X", 10.0, None, 1.0)
+        CSVLogger.flush()
+
+        with open(Config.TRADES_LOG) as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], CSVLogger.HEADERS)
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(rows[1][1], rows[1][0][:10])
+        self.assertEqual(rows[3][3], "MINT_2")
+
+        records = list(TradeBinarySink.read(Config.TRADES_BINARY_LOG))
+        self.assertEqual(len(records), 6)
+        self.assertEqual(records[0][1:4], ("SELL", "MINT_0", 10.0))
+        self.assertEqual(records[0][8], "Tier 1 Profit")
+
+        summary = TradeStore(Config.TRADE_STORE_FILE).summary()
+        self.assertEqual((summary["sells"], summary["buys"]), (5, 1))
+        self.assertAlmostEqual(summary["realized_pnl"], 12.5)
+
+    def test_close_drains_queue(self):
+        CSVLogger.log_trade("TAX", "SOL", 0.2, 0, 0.2, 0, 0, "Tax Vault Deposit")
+        CSVLogger.close()
+        with open(Config.TRADES_LOG) as f:
+            self.assertEqual(len(list(csv.reader(f))), 2)
+
+if __name__ == '__main__':
+    unittest.main()
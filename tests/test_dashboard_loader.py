@@ -0,0 +1,93 @@
+import unittest
+import csv
+import sys
+import os
+import tempfile
+import asyncio
+from unittest.mock import patch
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config.config import Config
+from src.dashboard.data_loader import BalanceReader, TradeTail, positions_version
+from src.utils.csv_logger import CSVLogger
+
+def append_rows(path, rows, header=False):
+    with open(path, 'a', newline='') as f:
+        writer = csv.writer(f)
+        if header:
+            writer.writerow(CSVLogger.HEADERS)
+        for i, pnl in rows:
+            writer.writerow([f"2026-01-01T00:00:{i:02d}", "2026-01-01", "SELL", f"MINT_{i}", 1.0, 0.5, 0.5, 0, pnl, "Tier 1"])
+
+class TestTradeTail(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "trades.csv")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_only_appended_rows_are_parsed(self):
+        append_rows(self.path, [(i, 1.0) for i in range(5)], header=True)
+        tail = TradeTail(self.path, recent=3)
+        tail.refresh()
+        self.assertEqual(tail.rows, 5)
+        offset = tail.offset
+
+        # A half-written row is left for the next refresh
+        append_rows(self.path, [(5, 2.0)])
+        with open(self.path, 'a') as f:
+            f.write("2026-01-01T00:00:06,2026-01-01,SELL,MINT_6")
+        tail.refresh()
+        self.assertEqual(tail.rows, 6)
+        self.assertGreater(tail.offset, offset)
+
+        with open(self.path, 'a') as f:
+            f.write(",1.0,0.5,0.5,0,-1.0,Stop\n")
+        tail.refresh()
+        self.assertEqual(tail.rows, 7)
+        self.assertAlmostEqual(tail.total_pnl, 6.0)
+        self.assertEqual(list(tail.curve()), [1, 2, 3, 4, 5, 7, 6])
+        self.assertEqual(list(tail.recent_frame()["Token"]), ["MINT_4", "MINT_5", "MINT_6"])
+        self.assertEqual(len(tail.curve(points=3)), 3)
+
+    def test_rewritten_file_is_reread(self):
+        append_rows(self.path, [(i, 1.0) for i in range(5)], header=True)
+        tail = TradeTail(self.path)
+        tail.refresh()
+        os.remove(self.path)
+        append_rows(self.path, [(0, 3.0)], header=True)
+        tail.refresh()
+        self.assertEqual(tail.rows, 1)
+        self.assertAlmostEqual(tail.total_pnl, 3.0)
+
+    def test_positions_version_tracks_journal(self):
+        snapshot = os.path.join(self.tmp.name, "positions.json")
+        before = positions_version(snapshot)
+        with open(os.path.join(self.tmp.name, "positions.journal"), 'w') as f:
+            f.write("{}\n")
+        self.assertNotEqual(positions_version(snapshot), before)
+
+class TestBalanceReader(unittest.TestCase):
+
+    def test_slow_rpc_returns_last_known_balance(self):
+        class SlowClient:
+            delay = 0.0
+
+            async def get_sol_balance(self):
+                await asyncio.sleep(self.delay)
+                return 1.5
+
+        reader = BalanceReader()
+        reader.client = SlowClient()
+        with patch.object(Config, "RPC_TIMEOUT", 0.2):
+            self.assertEqual(reader.get_balance(), 1.5)
+            reader.client.delay = 5.0
+            self.assertEqual(reader.get_balance(), 1.5)
+        reader.loop.call_soon_threadsafe(reader.loop.stop)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import unittest
+import itertools
+import json
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config.config import Config
+from src.engine.exit_ladder import ExitLadders, default_ladders
+from src.engine.position_book import Tier
+from src.engine.strategy import Strategy, SellReason
+
+class TestExitLadder(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch.multiple(Config, USOR_ADDRESS="USOR_MINT", EXIT_LADDERS={}, EXIT_LADDER_ASSIGNMENTS={},
+                                 EXIT_LADDER_DEFAULT="standard", EXIT_LADDERS_FILE=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_default_ladders_match_strategy(self):
+        ladders = ExitLadders.from_config()
+        prices = [0.5, 0.9, 1.0, 1.2, 1.25, 1.5, 2.0, 3.0, 6.0, 7.0]
+        highs = [1.0, 2.0, 8.0]
+        rows = list(itertools.product(["USOR_MINT", "STD_MINT"], prices, highs, [False, True], [False, True], [False, True]))
+
+        for day in (datetime(2026, 1, 26), datetime(2026, 2, 5, 23), datetime(2026, 2, 6), datetime(2026, 3, 1)):
+            expected = [Strategy.get_sell_action(mint, cur, 1.0, max(high, cur), t1, t2, t3, now=day)
+                        for mint, cur, high, t1, t2, t3 in rows]
+            sell, pct, reason, sold = ladders.evaluate(
+                [ladders.resolve(r[0]) for r in rows], [r[1] for r in rows], [1.0] * len(rows),
+                [max(r[2], r[1]) for r in rows],
+                [Tier.TIER_1 * r[3] | Tier.TIER_2 * r[4] | Tier.TIER_3 * r[5] for r in rows],
+                [0.0] * len(rows), day.timestamp()
+            )
+            for i, (exp_sell, exp_pct, exp_reason) in enumerate(expected):
+                self.assertEqual(bool(sell[i]), exp_sell, (day, rows[i]))
+                self.assertAlmostEqual(float(pct[i]), exp_pct)
+                self.assertEqual(SellReason(reason[i]).label, exp_reason, (day, rows[i]))
+                self.assertEqual(int(sold[i]), Tier.for_reason(SellReason(reason[i])))
+
+    def test_custom_ladder_from_config(self):
+        now = datetime(2026, 12, 30).timestamp()
+        ladders = {
+            "fast": {
+                "rules": [
+                    {"type": "trailing_stop", "at": 0.5, "sell": 1.0},
+                    # Wraps the new year
+                    {"type": "lockdown", "windows": [["12-24", "01-02"]]},
+                    {"type": "time", "at": 3600, "sell": 1.0},
+                ] + [{"type": "gain", "at": 0.1 * n, "sell": 0.1, "tier": n} for n in range(1, 6)],
+            }
+        }
+        with patch.multiple(Config, EXIT_LADDERS=ladders, EXIT_LADDER_ASSIGNMENTS={"FAST": "fast"}):
+            compiled = ExitLadders.from_config()
+        fast = compiled.resolve("FAST")
+        self.assertEqual(compiled.resolve("OTHER"), compiled.ids["standard"])
+
+        def decide(price, high, tiers, opened_at, at):
+            sell, pct, reason, sold = compiled.evaluate([fast], [price], [1.0], [high], [tiers], [opened_at], at)
+            return bool(sell[0]), float(pct[0]), SellReason(reason[0]), int(sold[0])
+
+        # Inside the window only the stop in front of the lockdown can sell
+        self.assertEqual(decide(1.45, 1.45, 0, now - 7200, now), (False, 0.0, SellReason.USOR_LOCKDOWN, 0))
+        self.assertEqual(decide(1.0, 2.5, 0, now - 7200, now)[2], SellReason.TRAILING_STOP)
+
+        later = datetime(2027, 1, 3).timestamp()
+        self.assertEqual(decide(1.0, 1.0, 0, later - 7200, later), (True, 1.0, SellReason.TIME_EXIT, 0))
+        # Tiers beyond 3 fire in order and skip the ones already sold
+        self.assertEqual(decide(1.45, 1.45, 0b111, later - 60, later), (True, 0.1, SellReason.TAKE_PROFIT, 0b1000))
+        self.assertEqual(decide(1.45, 1.45, 0b1111, later - 60, later), (False, 0.0, SellReason.HOLDING_STANDARD, 0))
+
+    def test_ladders_file_adds_and_assigns(self):
+        spec = {"ladders": {"flat": {"rules": [{"type": "gain", "at": 0.1, "sell": 1.0, "reason": "TAKE_PROFIT"}]}},
+                "assignments": {"MINT": "flat"}}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ladders.json")
+            with open(path, 'w') as f:
+                json.dump(spec, f)
+            with patch.object(Config, "EXIT_LADDERS_FILE", path):
+                compiled = ExitLadders.from_config()
+        sell, pct, reason, _ = compiled.evaluate([compiled.resolve("MINT")], [1.2], [1.0], [1.2], [0], [0.0], 0.0)
+        self.assertTrue(sell[0])
+        self.assertEqual(reason[0], SellReason.TAKE_PROFIT)
+
+    def test_bad_config_fails_at_compile(self):
+        for ladder in ({"rules": [{"type": "moon", "at": 1}]},
+                       {"rules": [{"type": "gain", "at": 1, "sell": 2.0}]},
+                       {"rules": [{"type": "gain", "at": 1, "tier": 9}]},
+                       {"rules": [{"type": "gain", "at": 1, "reason": "NOPE"}]},
+                       {"rules": [{"type": "lockdown", "windows": [["02-30", "03-01"]]}]}):
+            with self.assertRaises(ValueError):
+                ExitLadders(dict(default_ladders(), bad=ladder))
+        with self.assertRaises(ValueError):
+            ExitLadders(default_ladders(), assignments={"MINT": "missing"})
+
+    def lockdown(self, window, now):
+        return ExitLadders({"standard": {"rules": [{"type": "lockdown", "windows": [window]}]}},
+                           now=now)
+
+    def test_leap_day_window_compiles_every_year(self):
+        compiled = self.lockdown(["02-29", "02-29"], datetime(2026, 6, 1).timestamp())
+        # Feb 28 stands in for Feb 29 in non-leap years
+        for day, locked in ((datetime(2027, 2, 28, 12), True), (datetime(2027, 3, 1, 12), False),
+                            (datetime(2028, 2, 28, 12), False), (datetime(2028, 2, 29, 12), True)):
+            self.assertEqual(bool(compiled.locked(day.timestamp())[0, 0]), locked, day)
+
+    def test_window_end_is_local_midnight_across_dst(self):
+        old_tz = os.environ.get("TZ")
+        os.environ["TZ"] = "America/New_York"
+        time.tzset()
+        try:
+            # Clocks spring forward on 2027-03-14, the last day of the window
+            compiled = self.lockdown(["03-10", "03-14"], datetime(2027, 1, 1).timestamp())
+            self.assertTrue(compiled.locked(datetime(2027, 3, 14, 23, 30).timestamp())[0, 0])
+            self.assertFalse(compiled.locked(datetime(2027, 3, 15, 0, 30).timestamp())[0, 0])
+        finally:
+            if old_tz is None:
+                os.environ.pop("TZ", None)
+            else:
+                os.environ["TZ"] = old_tz
+            time.tzset()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import asyncio
+import json
+import sys
+import os
+import tempfile
+
+import httpx
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.clients.jupiter_client import JupiterClient
+from src.utils.json_stream import JsonKeyStream
+from src.utils.mint_index import MintIndex
+
+MINT_A = "So11111111111111111111111111111111111111112"
+MINT_B = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+MINT_C = "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB"
+
+def token_list(*mints):
+    return json.dumps([
+        {"address": m, "name": 'has "address": "x" in it', "extensions": {"coingeckoId": "c"}, "decimals": 6}
+        for m in mints
+    ]).encode()
+
+class TestJsonKeyStream(unittest.TestCase):
+
+    def test_values_split_across_chunks(self):
+        raw = token_list(MINT_A, MINT_B, MINT_C)
+        for size in (1, 5, 33, len(raw)):
+            parser = JsonKeyStream("address")
+            found = []
+            for i in range(0, len(raw), size):
+                found += parser.feed(raw[i:i + size])
+            self.assertEqual(found, [MINT_A, MINT_B, MINT_C])
+
+class TestScanNewTokens(unittest.TestCase):
+
+    def setUp(self):
+        self.responses = []
+        self.requests = []
+
+        def handler(request):
+            self.requests.append(request)
+            return self.responses.pop(0)
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.jupiter = JupiterClient()
+        self.jupiter.known_tokens = MintIndex(os.path.join(self.tmp.name, "known_mints.idx"))
+        self.jupiter.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    def tearDown(self):
+        asyncio.run(self.jupiter.close())
+        self.tmp.cleanup()
+
+    def scan(self):
+        return asyncio.run(self.jupiter.scan_new_tokens())
+
+    def test_conditional_scan(self):
+        self.responses = [
+            httpx.Response(200, content=token_list(MINT_A), headers={"ETag": '"v1"'}),
+            httpx.Response(304),
+            httpx.Response(200, content=token_list(MINT_A, MINT_B), headers={"ETag": '"v2"'}),
+        ]
+        self.assertEqual(self.scan(), [])  # First scan seeds the known set
+        self.assertEqual(self.scan(), [])
+        self.assertEqual(self.requests[1].headers.get("If-None-Match"), '"v1"')
+        self.assertEqual(self.scan(), [MINT_B])
+        self.assertEqual(self.jupiter.etag, '"v2"')
+
+    def test_failed_fetch_keeps_validators(self):
+        self.responses = [
+            httpx.Response(200, content=token_list(MINT_A), headers={"ETag": '"v1"'}),
+            httpx.Response(500),
+        ]
+        self.scan()
+        self.assertEqual(self.scan(), [])
+        self.assertEqual(self.jupiter.etag, '"v1"')
+
+    def test_known_tokens_survive_restart(self):
+        self.responses = [httpx.Response(200, content=token_list(MINT_A))]
+        self.scan()
+        self.jupiter.known_tokens.close()
+
+        # A fresh client on the same index detects new mints on its first scan
+        restarted = JupiterClient()
+        restarted.known_tokens = MintIndex(self.jupiter.known_tokens.path)
+        restarted.client = self.jupiter.client
+        self.responses = [httpx.Response(200, content=token_list(MINT_A, MINT_C))]
+        self.assertEqual(asyncio.run(restarted.scan_new_tokens()), [MINT_C])
+        restarted.known_tokens.close()
+
+if __name__ == '__main__':
+    unittest.main()
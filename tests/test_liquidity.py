@@ -0,0 +1,86 @@
+import unittest
+import asyncio
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.clients.liquidity import LiquidityEstimator, fit_reserve
+from src.clients.jupiter_client import JupiterClient
+from src.config.config import Config
+
+class FakeJupiter:
+    """Quotes a constant-product pool with `reserves[mint]` USD on the USDC side."""
+    USDC_MINT = JupiterClient.USDC_MINT
+    USDC_DECIMALS = JupiterClient.USDC_DECIMALS
+
+    def __init__(self, reserves):
+        self.reserves = reserves
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    async def get_quote(self, input_mint, output_mint, amount, slippage_bps=50):
+        self.calls.append((output_mint, amount))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        reserve = self.reserves.get(output_mint)
+        if reserve is None:
+            return None
+        size = amount / 10 ** self.USDC_DECIMALS
+        # Rounded like the API's string, so small impacts lose precision
+        return {"outAmount": str(amount * 1000), "priceImpactPct": f"{size / (size + reserve):.4f}"}
+
+class TestFitReserve(unittest.TestCase):
+
+    def test_recovers_reserve_from_rounded_impacts(self):
+        sizes = (1_000, 5_000, 25_000)
+        for reserve in (20_000, 80_000, 2_000_000):
+            impacts = [round(x / (x + reserve), 4) for x in sizes]
+            self.assertAlmostEqual(fit_reserve(sizes, impacts) / reserve, 1.0, delta=0.01)
+
+    def test_unmeasurable_impacts_bound_from_below(self):
+        self.assertEqual(fit_reserve([1_000, 5_000], [0.0, 0.0], min_impact=0.0001), 5_000 * 0.9999 / 0.0001)
+        self.assertIsNone(fit_reserve([1_000], [None]))
+
+class TestLiquidityEstimator(unittest.TestCase):
+
+    def test_concurrent_probes_cache_and_single_flight(self):
+        jupiter = FakeJupiter({"DEEP": 500_000, "THIN": 10_000})
+
+        async def run():
+            estimator = LiquidityEstimator(jupiter)
+            deep = await asyncio.gather(*(estimator.get_depth("DEEP") for _ in range(5)))
+            thin = await estimator.get_depth("THIN")
+            again = await estimator.get_depth("DEEP")
+            return deep, thin, again
+
+        deep, thin, again = asyncio.run(run())
+        self.assertAlmostEqual(deep[0] / 1_000_000, 1.0, delta=0.01)
+        self.assertEqual(len(set(deep)), 1)
+        self.assertEqual(again, deep[0])
+        self.assertLess(thin, Config.MIN_LIQUIDITY_USD)
+        # One probe per size per mint, all in flight together
+        self.assertEqual(len(jupiter.calls), 2 * len(Config.LIQUIDITY_PROBE_SIZES_USD))
+        self.assertEqual(jupiter.max_active, len(Config.LIQUIDITY_PROBE_SIZES_USD))
+        self.assertEqual(jupiter.calls[0], ("DEEP", 1_000 * 10 ** 6))
+
+    def test_failed_probes_expire_on_error_ttl(self):
+        jupiter = FakeJupiter({})
+
+        async def run():
+            estimator = LiquidityEstimator(jupiter)
+            first = await estimator.get_depth("NOROUTE")
+            await estimator.get_depth("NOROUTE")
+            estimator.cache["NOROUTE"].fetched_at -= Config.LIQUIDITY_ERROR_TTL + 1
+            await estimator.get_depth("NOROUTE")
+            return first
+
+        self.assertIsNone(asyncio.run(run()))
+        self.assertEqual(len(jupiter.calls), 2 * len(Config.LIQUIDITY_PROBE_SIZES_USD))
+
+if __name__ == '__main__':
+    unittest.main()
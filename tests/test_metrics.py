@@ -0,0 +1,92 @@
+import unittest
+import asyncio
+import sys
+import os
+import httpx
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.metrics import Registry, MetricsServer, track_upstream, upstream_requests, upstream_seconds
+
+class TestMetrics(unittest.TestCase):
+
+    def test_render_counter_gauge_and_histogram(self):
+        registry = Registry()
+        calls = registry.counter("calls_total", "Calls.", ("upstream",))
+        depth = registry.gauge("depth", "Depth.", ("queue",))
+        latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+
+        calls.labels("jupiter").inc()
+        calls.labels("jupiter").inc(2)
+        depth.labels("screen").set_function(lambda: 7)
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value)
+
+        text = registry.render()
+        self.assertIn("# TYPE calls_total counter", text)
+        self.assertIn('calls_total{upstream="jupiter"} 3', text)
+        self.assertIn('depth{queue="screen"} 7', text)
+        # Buckets are cumulative and inclusive of their upper bound
+        self.assertIn('latency_seconds_bucket{le="0.1"} 2', text)
+        self.assertIn('latency_seconds_bucket{le="1.0"} 3', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 4', text)
+        self.assertIn("latency_seconds_count 4", text)
+        self.assertIn("latency_seconds_sum 3.65", text)
+
+    def test_label_count_is_checked(self):
+        registry = Registry()
+        calls = registry.counter("calls_total", "Calls.", ("upstream", "op"))
+        with self.assertRaises(ValueError):
+            calls.labels("jupiter")
+        with self.assertRaises(ValueError):
+            registry.counter("calls_total", "Again.")
+
+    def test_track_upstream_counts_outcomes(self):
+        def count(outcome):
+            return upstream_requests.labels("test", "op", outcome).value
+
+        with track_upstream("test", "op"):
+            pass
+        with track_upstream("test", "op") as call:
+            call.fail()
+        with self.assertRaises(RuntimeError):
+            with track_upstream("test", "op"):
+                raise RuntimeError("boom")
+        with self.assertRaises(RuntimeError):
+            # Timeouts wrapped by a client library still count as timeouts
+            with track_upstream("test", "op"):
+                try:
+                    raise httpx.ReadTimeout("slow")
+                except httpx.ReadTimeout as e:
+                    raise RuntimeError("rpc failed") from e
+
+        self.assertEqual(count("success"), 1)
+        self.assertEqual(count("failure"), 2)
+        self.assertEqual(count("timeout"), 1)
+        self.assertEqual(upstream_seconds.labels("test", "op").count, 4)
+
+    def test_server_serves_metrics(self):
+        registry = Registry()
+        registry.counter("scrapes_total", "Scrapes.").inc()
+
+        async def scrape(path):
+            server = MetricsServer(registry, host="127.0.0.1", port=0)
+            await server.start()
+            try:
+                reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+                writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+                response = await reader.read()
+                writer.close()
+                return response.decode()
+            finally:
+                await server.close()
+
+        response = asyncio.run(scrape("/metrics"))
+        self.assertTrue(response.startswith("HTTP/1.1 200 OK"))
+        self.assertIn("text/plain; version=0.0.4", response)
+        self.assertIn("scrapes_total 1", response)
+        self.assertTrue(asyncio.run(scrape("/nope")).startswith("HTTP/1.1 404"))
+
+if __name__ == '__main__':
+    unittest.main()
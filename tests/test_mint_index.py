@@ -0,0 +1,56 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from solders.pubkey import Pubkey
+from src.utils.mint_index import MintIndex
+
+def random_mints(n):
+    return [str(Pubkey.from_bytes(os.urandom(32))) for _ in range(n)]
+
+class TestMintIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "known_mints.idx")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_membership_after_batches(self):
+        index = MintIndex(self.path)
+        first, second, absent = random_mints(500), random_mints(50), random_mints(50)
+        index.update(first)
+        index.update(second + first[:10])  # Duplicates are ignored
+        self.assertEqual(len(index), 550)
+        self.assertTrue(all(m in index for m in first + second))
+        self.assertFalse(any(m in index for m in absent))
+        index.close()
+
+    def test_lazy_reload(self):
+        mints = random_mints(100)
+        index = MintIndex(self.path)
+        index.update(mints)
+        index.close()
+
+        reopened = MintIndex(self.path)
+        self.assertFalse(reopened.loaded)
+        self.assertIn(mints[42], reopened)
+        self.assertEqual(len(reopened), 100)
+        reopened.close()
+
+    def test_corrupt_file_is_ignored(self):
+        with open(self.path, 'wb') as f:
+            f.write(b"garbage")
+        index = MintIndex(self.path)
+        self.assertEqual(len(index), 0)
+        index.add(random_mints(1)[0])
+        self.assertEqual(len(index), 1)
+        index.close()
+
+if __name__ == '__main__':
+    unittest.main()
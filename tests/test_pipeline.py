@@ -0,0 +1,113 @@
+import unittest
+import asyncio
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.engine.pipeline import ScanPipeline
+from src.engine.money_manager import PositionAllocator
+from src.config.config import Config
+
+class FakeEngine:
+    def __init__(self, balance=10.0, delay=0.01):
+        self.balance = balance
+        self.delay = delay
+        self.allocator = PositionAllocator()
+        self.active = 0
+        self.peak = 0
+        self.bought = {}
+
+    async def screen_token(self, mint):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return not mint.startswith("RUG")
+
+    async def quote_token(self, mint):
+        size = self.allocator.reserve(self.balance)
+        if size < Config.MIN_TRADE_SOL:
+            return None
+        await asyncio.sleep(self.delay)
+        return {"mint": mint}, size
+
+    async def execute_trade(self, mint, quote, position_size):
+        try:
+            await asyncio.sleep(self.delay)
+            self.bought[mint] = position_size
+            # Simulate the swap spending the SOL before the reservation is released
+            self.balance -= position_size
+        finally:
+            self.allocator.release(position_size)
+
+    def cancel_order(self, mint, quote, position_size):
+        self.allocator.release(position_size)
+
+class TestScanPipeline(unittest.TestCase):
+
+    def test_burst_is_screened_concurrently(self):
+        engine = FakeEngine()
+        mints = [f"MINT_{i}" for i in range(20)] + ["RUG_1", "RUG_2"]
+
+        async def run():
+            pipeline = ScanPipeline(engine, screen_workers=8, quote_workers=4, execute_workers=2, queue_size=4)
+            await pipeline.run(mints)
+            self.assertEqual(pipeline.in_flight, set())
+            await pipeline.close()
+
+        asyncio.run(run())
+        self.assertGreater(engine.peak, 1)
+        self.assertEqual(set(engine.bought), {f"MINT_{i}" for i in range(20)})
+
+    def test_concurrent_reservations_do_not_oversize(self):
+        engine = FakeEngine(balance=1.0)
+        mints = [f"MINT_{i}" for i in range(10)]
+
+        async def run():
+            pipeline = ScanPipeline(engine, screen_workers=10, quote_workers=10, execute_workers=10)
+            await pipeline.run(mints)
+            await pipeline.close()
+
+        asyncio.run(run())
+        # Every buy is sized off the balance left after the ones before it
+        self.assertLessEqual(sum(engine.bought.values()), 1.0)
+        self.assertAlmostEqual(engine.allocator.reserved, 0.0)
+
+    def test_allocator_reserves_against_remaining_balance(self):
+        allocator = PositionAllocator()
+        first = allocator.reserve(1.0)
+        second = allocator.reserve(1.0)
+        self.assertAlmostEqual(first, 1.0 * Config.POSITION_SIZE_PCT)
+        self.assertAlmostEqual(second, (1.0 - first) * Config.POSITION_SIZE_PCT)
+        allocator.release(first)
+        allocator.release(second)
+        self.assertEqual(allocator.reserved, 0.0)
+        self.assertEqual(allocator.reserve(0.05), 0.0)
+
+    def test_close_releases_queued_reservations(self):
+        class StuckEngine(FakeEngine):
+            async def execute_trade(self, mint, quote, position_size):
+                try:
+                    await asyncio.Event().wait()  # A swap that never lands
+                finally:
+                    self.allocator.release(position_size)
+
+        engine = StuckEngine(balance=100.0, delay=0.0)
+
+        async def run():
+            pipeline = ScanPipeline(engine, screen_workers=4, quote_workers=4, execute_workers=1, queue_size=2)
+            for i in range(12):
+                await pipeline.submit(f"MINT_{i}")
+            await asyncio.sleep(0.05)
+            # One order executing, some queued for execute, some held by quote workers blocked on the queue
+            self.assertEqual(pipeline.queues[2].qsize(), 2)
+            self.assertGreater(engine.allocator.reserved, 0.0)
+            await pipeline.close()
+
+        asyncio.run(run())
+        self.assertAlmostEqual(engine.allocator.reserved, 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
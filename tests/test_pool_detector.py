@@ -0,0 +1,146 @@
+import unittest
+import sys
+import os
+import json
+import asyncio
+import tempfile
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from types import SimpleNamespace
+
+import base58
+import websockets
+from solders.pubkey import Pubkey
+from src.clients.pool_detector import PoolDetector
+from src.clients.solana_client import SolanaClient
+from src.config.config import Config
+from src.utils.mint_index import MintIndex
+
+PROGRAM = "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8"
+CPMM = "CPMMoo8L3F4NbTegBCKVNunggL7H1ZpdTHKxQB5qKP1C"
+SOL = "So11111111111111111111111111111111111111112"
+INIT_LOG = "Program log: initialize2: InitializeInstruction2 { nonce: 254, open_time: 0 }"
+
+def random_key() -> str:
+    return str(Pubkey.from_bytes(os.urandom(32)))
+
+def notification(sub_id, signature, logs, err=None):
+    return json.dumps({
+        "jsonrpc": "2.0",
+        "method": "logsNotification",
+        "params": {
+            "subscription": sub_id,
+            "result": {"context": {"slot": 1}, "value": {"signature": signature, "err": err, "logs": logs}}
+        }
+    })
+
+class TestPoolDetector(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index = MintIndex(os.path.join(self.tmp.name, "known_mints.idx"))
+
+    def tearDown(self):
+        self.index.close()
+        self.tmp.cleanup()
+
+    def test_emits_new_mints_once_and_reconnects(self):
+        mint_a, mint_b, known = (random_key() for _ in range(3))
+        self.index.update([known])
+        pools = {"sig-a": [mint_a, SOL], "sig-b": [known, SOL], "sig-c": [SOL, mint_b]}
+        connections = []
+
+        async def server(ws, *_):
+            connections.append(ws)
+            request = json.loads(await ws.recv())
+            self.assertEqual(request["method"], "logsSubscribe")
+            self.assertEqual(request["params"][0], {"mentions": [PROGRAM]})
+            await ws.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": 7}))
+            if len(connections) == 1:
+                log = ["Program log: Instruction: InitializeAccount3", INIT_LOG]
+                await ws.send(notification(7, "sig-a", log))
+                await ws.send(notification(7, "sig-a", log))  # Duplicate signature
+                await ws.send(notification(7, "sig-x", ["Program log: swap"]))  # Not a pool creation
+                # Marker as a prefix of another log line is not a pool creation either
+                await ws.send(notification(7, "sig-z", ["Program log: initialize2: InitializeInstruction2Extra"]))
+                await ws.send(notification(7, "sig-y", log, err={"InstructionError": [0, "Custom"]}))
+                await ws.send(notification(7, "sig-b", log))  # Mint already known
+                await asyncio.sleep(0.1)
+                return  # Drop the connection
+            await ws.send(notification(7, "sig-c", [INIT_LOG]))
+            await asyncio.sleep(5)
+
+        async def resolve(signature, program_id, discriminator, mint_indices):
+            self.assertEqual((program_id, discriminator, mint_indices), (PROGRAM, bytes([1]), (8, 9)))
+            return pools[signature]
+
+        async def run():
+            emitted, resolved = [], []
+
+            async def on_mint(mint):
+                emitted.append(mint)
+
+            async def tracked(signature, program_id, discriminator, mint_indices):
+                resolved.append(signature)
+                return await resolve(signature, program_id, discriminator, mint_indices)
+
+            async with websockets.serve(server, "127.0.0.1", 0) as srv:
+                port = srv.sockets[0].getsockname()[1]
+                detector = PoolDetector(None, self.index, on_mint, ws_url=f"ws://127.0.0.1:{port}",
+                                        programs={PROGRAM: Config.POOL_PROGRAMS[PROGRAM]}, resolve=tracked)
+                detector.start()
+                for _ in range(100):
+                    if len(emitted) >= 2:
+                        break
+                    await asyncio.sleep(0.05)
+                # Batched: nothing is written to the index until the flush
+                self.assertNotIn(mint_a, self.index)
+                await detector.close()
+            return emitted, resolved
+
+        emitted, resolved = asyncio.run(run())
+        self.assertEqual(emitted, [mint_a, mint_b])
+        self.assertEqual(resolved, ["sig-a", "sig-b", "sig-c"])
+        self.assertEqual(len(connections), 2)
+        self.assertIn(mint_a, self.index)
+        self.assertIn(mint_b, self.index)
+
+class TestGetPoolMints(unittest.TestCase):
+    """get_pool_mints only reads mint slots from the program's initialize instruction."""
+
+    def resolve(self, instructions, inner=()):
+        tx = SimpleNamespace(
+            transaction=SimpleNamespace(message=SimpleNamespace(instructions=list(instructions))),
+            meta=SimpleNamespace(inner_instructions=[SimpleNamespace(instructions=list(inner))] if inner else None),
+        )
+
+        class FakeRpc:
+            async def get_transaction(self, *args, **kwargs):
+                return SimpleNamespace(value=SimpleNamespace(transaction=tx))
+
+        client = SolanaClient.__new__(SolanaClient)
+        client.client = FakeRpc()
+        _, discriminator, indices = Config.POOL_PROGRAMS[CPMM]
+        signature = base58.b58encode(os.urandom(64)).decode()
+        return asyncio.run(client.get_pool_mints(signature, CPMM, discriminator, indices))
+
+    def instruction(self, data: bytes, accounts):
+        return SimpleNamespace(program_id=Pubkey.from_string(CPMM), accounts=accounts, data=base58.b58encode(data).decode())
+
+    def test_swap_yields_nothing(self):
+        accounts = [Pubkey.from_string(random_key()) for _ in range(13)]
+        # Anchor discriminator of CPMM swap_base_input; slots 4 and 5 are token accounts here
+        swap = self.instruction(bytes([143, 190, 90, 218, 196, 30, 51, 222]) + bytes(16), accounts)
+        self.assertEqual(self.resolve([swap], inner=[swap]), [])
+
+    def test_initialize_yields_mints(self):
+        accounts = [Pubkey.from_string(random_key()) for _ in range(20)]
+        _, discriminator, _ = Config.POOL_PROGRAMS[CPMM]
+        swap = self.instruction(bytes([143, 190, 90, 218, 196, 30, 51, 222]) + bytes(16), accounts[::-1])
+        init = self.instruction(discriminator + bytes(24), accounts)
+        self.assertEqual(self.resolve([swap], inner=[init]), [str(accounts[4]), str(accounts[5])])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import unittest
+import asyncio
+import sys
+import os
+import tempfile
+import numpy as np
+from unittest.mock import patch
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config.config import Config
+from src.clients.price_feed import PriceQuote
+from src.engine.bot import BotEngine
+from src.engine.exit_ladder import ExitLadders
+from src.engine.position_book import PositionBook, Tier
+from src.engine.position_store import PositionStore
+from src.engine.strategy import SellReason
+
+def position(price=1.0, **fields):
+    data = {"entry_price": price, "amount": 100.0, "highest_price": price,
+            "sold_tier_1": False, "sold_tier_2": False, "sold_tier_3": False, "timestamp": 0.0}
+    data.update(fields)
+    return data
+
+class FakePrices:
+    def __init__(self, prices):
+        self.prices = prices
+        self.forgotten = []
+
+    async def get_prices(self, mints, max_age=None):
+        return {m: PriceQuote(self.prices[m], 1e18) for m in mints if m in self.prices}
+
+    def forget(self, mint):
+        self.forgotten.append(mint)
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args))
+
+class TestPositionBook(unittest.TestCase):
+
+    def test_close_keeps_rows_dense(self):
+        book = PositionBook(capacity=2)
+        for i, mint in enumerate("ABCD"):
+            book.open(mint, float(i + 1), 10.0 * (i + 1))
+        book.close("B")
+
+        self.assertEqual(len(book), 3)
+        self.assertEqual(book.mints, ["A", "D", "C"])
+        self.assertEqual(book.index["D"], 1)
+        np.testing.assert_array_equal(book.columns()["amount"], [10.0, 40.0, 30.0])
+        self.assertEqual(book["D"]["entry_price"], 4.0)
+
+    def test_columns_are_views(self):
+        book = PositionBook()
+        book.open("A", 1.0, 10.0)
+        book.columns()["highest_price"][0] = 3.0
+        self.assertEqual(book["A"]["highest_price"], 3.0)
+
+    def test_snapshot_format_round_trips(self):
+        positions = {"A": position(sold_tier_1=True, sold_tier_3=True), "B": position(None, highest_price=None)}
+        book = PositionBook.from_dict(positions)
+
+        self.assertEqual(int(book.tiers[book.index["A"]]), Tier.TIER_1 | Tier.TIER_3)
+        self.assertEqual(book.to_dict(), positions)
+
+    def test_tier_for_reason(self):
+        self.assertEqual(Tier.for_reason(SellReason.TIER_2_PROFIT), Tier.TIER_2)
+        self.assertEqual(Tier.for_reason(SellReason.MOONBAG_TRAILING_STOP), Tier.NONE)
+
+class TestPositionStoreBook(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "positions.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_tier_mask_is_journaled_as_flags(self):
+        store = PositionStore(self.path)
+        store.load()
+        store.open("A", position())
+        store.update("A", amount=50.0, tiers=Tier.TIER_1 | Tier.TIER_2)
+        store.flush()
+
+        recovered = PositionStore.read(self.path)["A"]
+        self.assertEqual(recovered["amount"], 50.0)
+        self.assertEqual((recovered["sold_tier_1"], recovered["sold_tier_2"], recovered["sold_tier_3"]), (True, True, False))
+        store.shutdown()
+
+    def test_manage_cycle_sells_from_the_book(self):
+        store = PositionStore(self.path)
+        store.load()
+        store.open("TIER", position(1.0))
+        store.open("MOON", position(1.0, highest_price=4.0, sold_tier_1=True, sold_tier_2=True, sold_tier_3=True))
+        store.open("HOLD", position(1.0))
+        store.open("NEW", position(None, highest_price=None))
+
+        engine = BotEngine.__new__(BotEngine)
+        engine.store = store
+        engine.positions = store.positions
+        engine.ladders = ExitLadders.from_config()
+        engine.prices = FakePrices({"TIER": 1.3, "MOON": 2.0, "HOLD": 1.05, "NEW": 0.5})
+        engine.tax = Recorder()
+        engine.ledger = Recorder()
+        engine.telegram = Recorder()
+        engine.reclaim_due = False
+        engine.pending_buys = {"NEW": 0.1}  # Bought before the price feed knew the mint
+
+        with patch("src.engine.bot.CSVLogger.log_trade") as log_trade:
+            asyncio.run(engine.manage_positions_cycle())
+
+        book = engine.positions
+        self.assertNotIn("MOON", book)
+        self.assertTrue(engine.reclaim_due)
+        self.assertEqual(engine.prices.forgotten, ["MOON"])
+        tier = book["TIER"]
+        self.assertTrue(tier["sold_tier_1"])
+        self.assertAlmostEqual(tier["amount"], 100.0 * (1 - Config.TIER_1_PCT))
+        self.assertEqual(book["HOLD"]["highest_price"], 1.05)
+        self.assertEqual(book["NEW"]["entry_price"], 0.5)
+        reasons = sorted(call.args[-1] for call in log_trade.call_args_list)
+        self.assertEqual(reasons, ["Initial Entry", "Moonbag Trailing Stop", "Tier 1 Profit"])
+        # The deferred BUY row carries the entry the first priced tick set
+        buy = next(call.args for call in log_trade.call_args_list if call.args[0] == "BUY")
+        self.assertEqual(buy[:5], ("BUY", "NEW", 100.0, 0.5, 0.1))
+        self.assertIn(("notify_buy", ("NEW", 0.1, 0.5)), engine.telegram.calls)
+        self.assertEqual(engine.pending_buys, {})
+
+        store.flush()
+        self.assertEqual(PositionStore.read(self.path), book.to_dict())
+        store.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()
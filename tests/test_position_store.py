@@ -0,0 +1,63 @@
+import unittest
+import json
+import sys
+import os
+import tempfile
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.engine.position_store import PositionStore
+
+def position(price=1.0):
+    return {"entry_price": price, "amount": 100.0, "highest_price": price,
+            "sold_tier_1": False, "sold_tier_2": False, "sold_tier_3": False, "timestamp": 0}
+
+class TestPositionStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "positions.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_journal_replay(self):
+        store = PositionStore(self.path)
+        store.load()
+        store.open("A", position())
+        store.open("B", position(2.0))
+        store.update("A", amount=80.0, sold_tier_1=True)
+        store.close("B")
+        store.flush()
+
+        # Recovery without a clean shutdown: snapshot is empty, journal has the deltas
+        recovered = PositionStore.read(self.path)
+        self.assertEqual(set(recovered), {"A"})
+        self.assertEqual(recovered["A"]["amount"], 80.0)
+        self.assertTrue(recovered["A"]["sold_tier_1"])
+        store.shutdown()
+
+    def test_shutdown_compacts(self):
+        store = PositionStore(self.path)
+        store.load()
+        store.open("A", position())
+        store.shutdown()
+
+        with open(self.path) as f:
+            self.assertEqual(set(json.load(f)), {"A"})
+        self.assertEqual(os.path.getsize(store.journal_path), 0)
+
+    def test_torn_tail_is_skipped(self):
+        store = PositionStore(self.path)
+        store.load()
+        store.open("A", position())
+        store.flush()
+        store.writer.close()
+        with open(store.journal_path, 'a') as f:
+            f.write('{"op": "update", "mint": "A", "fie')
+
+        self.assertEqual(PositionStore.read(self.path)["A"]["amount"], 100.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import asyncio
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.clients.price_feed import PriceFeed
+from src.config.config import Config
+
+class FakeJupiter:
+    def __init__(self):
+        self.calls = []
+        self.fail = False
+
+    async def get_prices(self, mints):
+        self.calls.append(list(mints))
+        if self.fail:
+            return None
+        return {m: float(i + 1) for i, m in enumerate(mints)}
+
+class TestPriceFeed(unittest.TestCase):
+
+    def setUp(self):
+        self.jupiter = FakeJupiter()
+        self.feed = PriceFeed(self.jupiter)
+
+    def test_batches_and_cache(self):
+        mints = [f"MINT_{i}" for i in range(250)]
+        prices = asyncio.run(self.feed.get_prices(mints))
+        self.assertEqual(len(prices), 250)
+        self.assertEqual([len(c) for c in self.jupiter.calls], [100, 100, 50])
+
+        # Second pass inside the TTL is served from cache
+        asyncio.run(self.feed.get_prices(mints))
+        self.assertEqual(len(self.jupiter.calls), 3)
+
+    def test_failed_refresh_serves_stale(self):
+        asyncio.run(self.feed.get_prices(["MINT_A"]))
+        self.feed.cache["MINT_A"].fetched_at -= Config.PRICE_STALE_AFTER + 1
+        self.jupiter.fail = True
+
+        prices = asyncio.run(self.feed.get_prices(["MINT_A", "MINT_B"]))
+        self.assertEqual(list(prices), ["MINT_A"])
+        self.assertTrue(prices["MINT_A"].stale)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import asyncio
+import sys
+import os
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from solders.hash import Hash
+from solders.keypair import Keypair
+from src.config.config import Config
+from src.clients.solana_client import SolanaClient
+from src.clients.tx_prefetch import BlockhashCache
+
+def token_account(mint, amount="0", state="initialized"):
+    parsed = {"type": "account", "info": {"mint": mint, "state": state, "tokenAmount": {"amount": amount}}}
+    return SimpleNamespace(
+        pubkey=Keypair().pubkey(),
+        account=SimpleNamespace(lamports=2_039_280, data=SimpleNamespace(parsed=parsed))
+    )
+
+class FakeRpc:
+    def __init__(self, accounts):
+        self.accounts = accounts
+        self.scans = 0
+        self.sent = []
+
+    async def get_token_accounts_by_owner_json_parsed(self, owner, opts):
+        self.scans += 1
+        return SimpleNamespace(value=self.accounts)
+
+    async def get_latest_blockhash(self, commitment=None):
+        return SimpleNamespace(value=SimpleNamespace(blockhash=Hash.new_unique(), last_valid_block_height=1))
+
+    async def send_transaction(self, txn):
+        self.sent.append(txn)
+        return SimpleNamespace(value=txn.signatures[0])
+
+class TestRentReclaim(unittest.TestCase):
+
+    def test_empty_accounts_are_closed_in_packed_batches(self):
+        empty = [token_account(f"EMPTY_{i}") for i in range(60)]
+        others = [token_account("HELD"), token_account("FULL", amount="5"), token_account("FROZEN", state="frozen")]
+
+        async def run():
+            solana = SolanaClient()
+            solana.client = rpc = FakeRpc(empty + others)
+            solana.blockhashes = BlockhashCache(rpc)
+            solana.keypair = Keypair()
+            closed = await solana.close_empty_accounts(exclude_mints={"HELD"})
+            return closed, rpc, solana
+
+        closed, rpc, solana = asyncio.run(run())
+        self.assertEqual(closed, 60)
+        self.assertEqual(rpc.scans, 1)
+        self.assertEqual(len(rpc.sent), 3)
+
+        closed_accounts = []
+        for txn in rpc.sent:
+            self.assertLessEqual(len(bytes(txn)), Config.TX_MAX_SIZE)
+            txn.verify()
+            keys = txn.message.account_keys
+            # Skip the two compute-budget instructions
+            closed_accounts += [keys[ix.accounts[0]] for ix in txn.message.instructions[2:]]
+        self.assertEqual(set(closed_accounts), {acc.pubkey for acc in empty})
+
+        reclaimed = sum(entry.amount for entry in solana.ledger.entries)
+        self.assertAlmostEqual(reclaimed, 60 * 0.00203928 - 3 * Config.TX_BASE_FEE_SOL, places=4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+import asyncio
+import sys
+import os
+import tempfile
+import time
+
+import httpx
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.clients.rugcheck_client import RugCheckClient
+from src.clients.report_cache import ReportCache
+from src.config.config import Config
+
+class TestRugCheckCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp.name, "rugcheck_cache.json")
+        self.calls = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_client(self):
+        async def handler(request):
+            mint = request.url.path.split("/")[3]
+            self.calls.append(mint)
+            await asyncio.sleep(0.01)
+            if mint == "MISSING":
+                return httpx.Response(404)
+            return httpx.Response(200, json={"score": 50 if mint == "GOOD" else 5000, "risks": []})
+
+        client = RugCheckClient(self.cache_path)
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return client
+
+    def test_single_flight_and_negative_cache(self):
+        async def run():
+            client = self.make_client()
+            reports = await asyncio.gather(*(client.get_token_report("GOOD") for _ in range(5)))
+            missing = [await client.get_token_report("MISSING") for _ in range(3)]
+            await client.close()
+            return reports, missing
+
+        reports, missing = asyncio.run(run())
+        self.assertEqual([r["score"] for r in reports], [50] * 5)
+        self.assertEqual(missing, [None, None, None])
+        self.assertEqual(self.calls, ["GOOD", "MISSING"])
+
+    def test_cache_survives_restart(self):
+        async def run():
+            client = self.make_client()
+            await client.get_token_report("BAD")
+            await client.close()
+
+            restarted = self.make_client()
+            report = await restarted.get_token_report("BAD")
+            await restarted.close()
+            return report
+
+        self.assertEqual(asyncio.run(run())["score"], 5000)
+        self.assertEqual(self.calls, ["BAD"])
+
+    def test_saves_are_serialized(self):
+        client = self.make_client()
+        active, overlaps = [], []
+
+        def write(rows):
+            active.append(1)
+            overlaps.append(len(active))
+            time.sleep(0.02)
+            active.pop()
+
+        client.cache.write = write
+
+        async def run():
+            async def save_after_put(mint):
+                client.cache.put(mint, ReportCache.PASS, {"score": 1})
+                await client.save()
+
+            await asyncio.gather(*(save_after_put(m) for m in "ABC"), client.close())
+
+        asyncio.run(run())
+        self.assertTrue(overlaps)
+        self.assertEqual(max(overlaps), 1)
+
+    def test_lookup_does_not_wait_for_the_save(self):
+        client = self.make_client()
+        saved = []
+
+        def write(rows):
+            time.sleep(0.3)
+            saved.append(len(rows))
+
+        client.cache.write = write
+        client.cache.last_saved -= Config.RUGCHECK_CACHE_SAVE_INTERVAL + 1
+
+        async def run():
+            started = time.perf_counter()
+            report = await client.get_token_report("GOOD")
+            elapsed = time.perf_counter() - started
+            self.assertIsNotNone(client.save_task)
+            await client.close()
+            return report, elapsed
+
+        report, elapsed = asyncio.run(run())
+        self.assertEqual(report["score"], 50)
+        self.assertLess(elapsed, 0.2)
+        self.assertEqual(saved, [1])
+
+    def test_lru_eviction(self):
+        cache = ReportCache(entry_limit=2)
+        cache.put("A", ReportCache.PASS, {"score": 1})
+        cache.put("B", ReportCache.PASS, {"score": 2})
+        cache.get("A")
+        cache.put("C", ReportCache.PASS, {"score": 3})
+        self.assertEqual(list(cache.entries), ["A", "C"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import asyncio
+import sys
+import os
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.engine.scheduler import Scheduler, Job
+from src.engine.bot import BotEngine
+
+class TestScheduler(unittest.TestCase):
+
+    def run_for(self, scheduler, seconds):
+        async def run():
+            task = asyncio.create_task(scheduler.run())
+            await asyncio.sleep(seconds)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        asyncio.run(run())
+
+    def test_slow_job_does_not_delay_fast_job(self):
+        fast_runs = []
+
+        async def slow():
+            await asyncio.sleep(10)
+
+        async def fast():
+            fast_runs.append(1)
+
+        scheduler = Scheduler()
+        scheduler.add(Job("slow", slow, 60))
+        scheduler.add(Job("fast", fast, 0.05))
+        self.run_for(scheduler, 0.5)
+        self.assertGreaterEqual(len(fast_runs), 8)
+
+    def test_deadline_and_overrun(self):
+        async def stuck():
+            await asyncio.sleep(10)
+
+        scheduler = Scheduler()
+        job = scheduler.add(Job("stuck", stuck, 0.05, deadline=0.12, overrun=Job.SKIP))
+        self.run_for(scheduler, 0.5)
+        self.assertGreaterEqual(job.timeouts, 2)
+        self.assertEqual(job.timeouts, job.overruns)
+        # Missed ticks are skipped, not queued up
+        self.assertLessEqual(job.runs, 4)
+
+    def test_paused_jobs_skip(self):
+        runs = {"trade": 0, "housekeeping": 0}
+
+        def counter(name):
+            async def run():
+                runs[name] += 1
+            return run
+
+        scheduler = Scheduler(is_paused=lambda: True)
+        scheduler.add(Job("trade", counter("trade"), 0.05))
+        scheduler.add(Job("housekeeping", counter("housekeeping"), 0.05, paused_ok=True))
+        self.run_for(scheduler, 0.2)
+        self.assertEqual(runs["trade"], 0)
+        self.assertGreater(runs["housekeeping"], 0)
+
+    def test_prefetch_jobs_need_a_keypair(self):
+        def job_names(keypair):
+            engine = BotEngine.__new__(BotEngine)
+            engine.running = True
+            engine.solana = SimpleNamespace(keypair=keypair, blockhashes=SimpleNamespace(refresh=None),
+                                            fees=SimpleNamespace(sample=lambda accounts: None), fee_accounts=list)
+            return {job.name for job in engine.build_scheduler().jobs}
+
+        self.assertFalse({"blockhash", "priority_fees"} & job_names(None))
+        self.assertTrue({"blockhash", "priority_fees"} <= job_names(object()))
+
+if __name__ == '__main__':
+    unittest.main()
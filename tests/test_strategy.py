@@ -1,13 +1,14 @@
 import unittest
 from unittest.mock import patch, MagicMock
 from datetime import datetime
+import itertools
 import sys
 import os
 
 # Add src to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.engine.strategy import Strategy
+from src.engine.strategy import Strategy, SellReason
 from src.config.config import Config
 
 class TestStrategy(unittest.TestCase):
@@ -39,5 +40,33 @@ class TestStrategy(unittest.TestCase):
         self.assertTrue(should_sell)
         self.assertEqual(pct, Config.TIER_1_PCT)
 
+    def test_lockdown_window(self):
+        self.assertTrue(Strategy.in_lockdown(datetime(2026, 1, 25)))
+        self.assertTrue(Strategy.in_lockdown(datetime(2026, 2, 5)))
+        self.assertFalse(Strategy.in_lockdown(datetime(2026, 1, 24)))
+        self.assertFalse(Strategy.in_lockdown(datetime(2026, 2, 6)))
+
+    def test_batch_matches_scalar(self):
+        Config.USOR_ADDRESS = "USOR_MINT"
+        prices = [0.5, 0.9, 1.0, 1.2, 1.25, 1.5, 2.0, 3.0, 6.0, 7.0]
+        highs = [1.0, 2.0, 8.0]
+        rows = list(itertools.product(["USOR_MINT", "STD_MINT"], prices, highs, [False, True], [False, True], [False, True]))
+
+        for day in (datetime(2026, 1, 26), datetime(2026, 3, 1)):
+            with patch('src.engine.strategy.datetime') as mock_datetime:
+                mock_datetime.now.return_value = day
+                expected = [Strategy.get_sell_action(mint, cur, 1.0, max(high, cur), t1, t2, t3) for mint, cur, high, t1, t2, t3 in rows]
+                lockdown = Strategy.in_lockdown()
+
+            should_sell, pct, reason = Strategy.get_sell_actions(
+                [r[1] for r in rows], [1.0] * len(rows), [max(r[2], r[1]) for r in rows],
+                [r[3] for r in rows], [r[4] for r in rows], [r[5] for r in rows],
+                [r[0] == "USOR_MINT" for r in rows], lockdown
+            )
+            for i, (exp_sell, exp_pct, exp_reason) in enumerate(expected):
+                self.assertEqual(bool(should_sell[i]), exp_sell, rows[i])
+                self.assertAlmostEqual(float(pct[i]), exp_pct)
+                self.assertEqual(SellReason(reason[i]).label, exp_reason, rows[i])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import asyncio
+import sys
+import os
+import tempfile
+from unittest.mock import patch
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config.config import Config
+from src.engine.tax_ledger import TaxLedger
+
+class TestTaxLedger(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "tax_ledger.json")
+        self.rows = []
+        patcher = patch("src.engine.tax_ledger.CSVLogger.log_trade", side_effect=lambda *row: self.rows.append(row))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.multiple(Config, TAX_SETTLE_THRESHOLD=1.0, TAX_SETTLE_INTERVAL=3600)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_accruals_settle_as_one_transfer_at_threshold(self):
+        ledger = TaxLedger(self.path)
+        sent = []
+
+        async def send(amount):
+            sent.append(amount)
+            return True
+
+        async def run():
+            for i in range(4):
+                ledger.accrue(f"MINT_{i}", 0.2, 1.0)
+                self.assertEqual(await ledger.settle(send), 0.0)  # Below threshold
+            ledger.accrue("MINT_4", 0.2, 1.0)
+            return await ledger.settle(send)
+
+        paid = asyncio.run(run())
+        self.assertAlmostEqual(paid, 1.0)
+        self.assertEqual(len(sent), 1)
+        self.assertAlmostEqual(ledger.accrued, 0.0)
+        self.assertEqual([row[0] for row in self.rows], ["TAX_ACCRUE"] * 5 + ["TAX"])
+        self.assertIn("5 accruals", self.rows[-1][-1])
+
+        state = TaxLedger.read(self.path)
+        self.assertAlmostEqual(state["total_paid"], 1.0)
+        self.assertAlmostEqual(state["accrued"], 0.0)
+
+    def test_failed_transfer_keeps_the_debt(self):
+        ledger = TaxLedger(self.path)
+        ledger.accrue("MINT", 0.3, 1.5)
+
+        async def send(amount):
+            # A sell accrues more while the transfer is in flight
+            ledger.accrue("OTHER", 0.1, 0.5)
+            return False
+
+        self.assertEqual(asyncio.run(ledger.settle(send, force=True)), 0.0)
+        self.assertAlmostEqual(ledger.accrued, 0.4)
+        self.assertEqual(ledger.accruals, 2)
+        self.assertNotIn("TAX", [row[0] for row in self.rows])
+
+    def test_interrupted_transfer_is_reaccrued_on_load(self):
+        ledger = TaxLedger(self.path)
+        ledger.accrue("MINT", 0.3, 1.5)
+        ledger.settling, ledger.accrued = 0.3, 0.0
+        ledger._save()
+
+        reloaded = TaxLedger(self.path)
+        reloaded.load()
+        self.assertAlmostEqual(reloaded.accrued, 0.3)
+        self.assertEqual(reloaded.settling, 0.0)
+
+    def test_accruals_are_saved_by_flush(self):
+        ledger = TaxLedger(self.path)
+        ledger.accrue("MINT", 0.3, 1.5)
+        self.assertTrue(ledger.dirty)
+        self.assertEqual(TaxLedger.read(self.path), {})  # No file I/O in the sell loop
+
+        asyncio.run(ledger.flush())
+        self.assertFalse(ledger.dirty)
+        self.assertAlmostEqual(TaxLedger.read(self.path)["accrued"], 0.3)
+
+if __name__ == '__main__':
+    unittest.main()
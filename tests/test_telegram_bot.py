@@ -0,0 +1,124 @@
+import unittest
+import asyncio
+import json
+import time
+import sys
+import os
+from unittest.mock import patch
+
+import httpx
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config.config import Config
+from src.clients.balance_ledger import BalanceLedger
+from src.dashboard.telegram_bot import NotificationQueue, ChatRateLimiter, TelegramBot
+
+class TestNotificationQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.sent = []
+        patcher = patch.multiple(Config, TELEGRAM_COALESCE_LINGER=0.05, TELEGRAM_DIGEST_THRESHOLD=3)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def send(self, text):
+        await asyncio.sleep(0.01)
+        self.sent.append(text)
+        return None
+
+    def test_burst_becomes_digest(self):
+        async def run():
+            queue = NotificationQueue(self.send, ChatRateLimiter(min_interval=0.0))
+            for i in range(12):
+                queue.push("sell", f"sell {i}")
+            queue.push("buy", "buy 0")
+            await asyncio.sleep(0.2)
+            await queue.close()
+
+        asyncio.run(run())
+        self.assertEqual(len(self.sent), 2)
+        self.assertIn("12 sells", self.sent[0])
+        self.assertIn("and 9 more", self.sent[0])
+        self.assertEqual(self.sent[1], "buy 0")
+
+    def test_push_does_not_wait_for_send(self):
+        async def slow_send(text):
+            await asyncio.sleep(1)
+
+        async def run():
+            queue = NotificationQueue(slow_send, ChatRateLimiter(min_interval=0.0))
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            for i in range(100):
+                queue.push("sell", f"sell {i}")
+            elapsed = loop.time() - start
+            queue.task.cancel()
+            await asyncio.gather(queue.task, return_exceptions=True)
+            return elapsed
+
+        self.assertLess(asyncio.run(run()), 0.05)
+
+    def test_rate_limit(self):
+        limiter = ChatRateLimiter(min_interval=0.0, max_per_minute=2)
+
+        async def run():
+            await limiter.acquire()
+            await limiter.acquire()
+            return limiter.delay()
+
+        self.assertGreater(asyncio.run(run()), 59)
+
+class FakeSolana:
+    def __init__(self):
+        self.ledger = BalanceLedger()
+
+    async def reconcile_balance(self):
+        await asyncio.sleep(0.3)
+        self.ledger.reconcile(1.5, time.time())
+        return True
+
+class FakeEngine:
+    running = True
+    positions = {"A": {}}
+    def __init__(self):
+        self.solana = FakeSolana()
+
+class TestTelegramCommands(unittest.TestCase):
+
+    def test_slow_command_does_not_block_others(self):
+        sent = []
+        updates = [
+            {"update_id": 1, "message": {"text": "/balance", "chat": {"id": 42}}},
+            {"update_id": 2, "message": {"text": "/status", "chat": {"id": 42}}},
+        ]
+
+        async def handler(request):
+            if request.url.path.endswith("/getUpdates"):
+                batch = updates[:]
+                updates.clear()
+                if not batch:
+                    await asyncio.sleep(0.05)  # Stand-in for the long-poll wait
+                return httpx.Response(200, json={"ok": True, "result": batch})
+            sent.append(json.loads(request.content)["text"])
+            return httpx.Response(200, json={"ok": True})
+
+        async def run():
+            with patch.multiple(Config, TELEGRAM_BOT_TOKEN="token", CHAT_ID="42"):
+                bot = TelegramBot()
+            bot.set_engine(FakeEngine())
+            bot.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            bot.start()
+            await asyncio.sleep(0.1)
+            replies_before_balance = list(sent)
+            await bot.close()
+            return replies_before_balance
+
+        replies_before_balance = asyncio.run(run())
+        self.assertEqual(len(replies_before_balance), 1)
+        self.assertIn("Bot Status", replies_before_balance[0])
+        self.assertIn("1.5000 SOL", sent[-1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import csv
+import random
+import sys
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config.config import Config
+from src.utils.csv_logger import CSVLogger
+from src.utils.trade_store import TradeStore
+
+DAY = 86400
+
+def random_trades(n, start=1_767_000_000):
+    rng = random.Random(7)
+    rows = []
+    for i in range(n):
+        ts = start + i * 3600
+        kind = rng.choice(["BUY", "SELL", "SELL", "TAX_ACCRUE", "TAX"])
+        token = "SOL" if kind == "TAX" else f"MINT_{rng.randrange(5)}"
+        pnl = rng.uniform(-1, 1) if kind == "SELL" else 0.0
+        rows.append((ts, kind, token, 10.0, 0.1, rng.uniform(0.1, 2), 0.001, pnl, "r"))
+    return rows
+
+class TestTradeStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "trades.db"
+        patcher = patch.object(Config, "TRADES_LOG", Path(self.tmp.name) / "trades.csv")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_rollups_match_a_full_scan(self):
+        rows = random_trades(200)
+        store = TradeStore(self.path)
+        for i in range(0, len(rows), 37):  # Arbitrary batch boundaries
+            store.write(rows[i:i + 37])
+        store.close()
+
+        sells = [r for r in rows if r[1] == "SELL"]
+        summary = store.summary()
+        self.assertEqual(summary["buys"], sum(r[1] == "BUY" for r in rows))
+        self.assertEqual(summary["sells"], len(sells))
+        self.assertAlmostEqual(summary["realized_pnl"], sum(r[7] for r in sells))
+        self.assertAlmostEqual(summary["tax_paid"], sum(r[5] for r in rows if r[1] == "TAX"))
+        self.assertAlmostEqual(summary["win_rate"], sum(r[7] > 0 for r in sells) / len(sells))
+
+        daily = store.daily()
+        self.assertEqual(len(daily), len({datetime.fromtimestamp(r[0]).date() for r in rows}))
+        self.assertAlmostEqual(daily[-1]["cumulative_pnl"], summary["realized_pnl"])
+
+        for token in store.tokens(limit=10):
+            token_sells = [r for r in sells if r[2] == token["token"]]
+            self.assertAlmostEqual(token["realized_pnl"], sum(r[7] for r in token_sells))
+            self.assertEqual(token["first_ts"], min(r[0] for r in rows if r[2] == token["token"] and r[1] != "TAX"))
+        self.assertNotIn("SOL", [t["token"] for t in store.tokens(limit=10)])
+        self.assertEqual(store.recent(3)[-1]["ts"], rows[-1][0])
+
+    def test_new_store_backfills_from_csv(self):
+        with open(Config.TRADES_LOG, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(CSVLogger.HEADERS)
+            writer.writerow(["2026-01-01T10:00:00", "2026-01-01", "SELL", "MINT", 1, 0.5, 0.5, 0, 0.25, "Tier 1"])
+            writer.writerow(["2026-01-02T10:00:00", "2026-01-02", "SELL", "MINT", 1, 0.5, 0.5, 0, -0.05, "Stop"])
+
+        store = TradeStore(self.path)
+        store.write([(datetime(2026, 1, 3, 10).timestamp(), "BUY", "OTHER", 1, 0.5, 0.5, 0, 0, "Entry")])
+        store.close()
+        summary = store.summary()
+        self.assertEqual((summary["sells"], summary["buys"]), (2, 1))
+        self.assertAlmostEqual(summary["realized_pnl"], 0.2)
+        self.assertEqual([d["date"] for d in store.daily(days=2)], ["2026-01-02", "2026-01-03"])
+
+    def test_pnl_report(self):
+        from src.dashboard.telegram_bot import TelegramBot
+        store = TradeStore(self.path)
+        store.write(random_trades(50))
+        store.close()
+        with patch.object(Config, "TRADE_STORE_FILE", self.path):
+            report = TelegramBot.format_pnl()
+        self.assertIn("Realized:", report)
+        self.assertIn("Top tokens", report)
+
+if __name__ == '__main__':
+    unittest.main()
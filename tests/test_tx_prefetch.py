@@ -0,0 +1,127 @@
+import unittest
+import asyncio
+import json
+import sys
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from solders.hash import Hash
+from solders.keypair import Keypair
+from src.config.config import Config
+from src.clients.solana_client import SolanaClient
+from src.clients.tx_prefetch import BlockhashCache, PriorityFeeEstimator
+from src.engine.bot import BotEngine
+
+class FakeRpc:
+    def __init__(self):
+        self.blockhash_calls = 0
+        self.sent = []
+
+    async def get_latest_blockhash(self, commitment=None):
+        self.blockhash_calls += 1
+        return SimpleNamespace(value=SimpleNamespace(blockhash=Hash.new_unique(), last_valid_block_height=1000 + self.blockhash_calls))
+
+    async def send_transaction(self, txn):
+        self.sent.append(txn)
+        return SimpleNamespace(value=txn.signatures[0])
+
+def fee_transport(batches):
+    async def handler(request):
+        body = json.loads(request.content)
+        assert body["method"] == "getRecentPrioritizationFees"
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": 1, "result": batches.pop(0)})
+    return httpx.MockTransport(handler)
+
+class TestPriorityFeeEstimator(unittest.TestCase):
+
+    def test_percentile_window_and_strategies(self):
+        estimator = PriorityFeeEstimator("http://rpc", strategy=PriorityFeeEstimator.PERCENTILE, percentile=50)
+        self.assertEqual(estimator.estimate(), Config.PRIORITY_FEE_DEFAULT)
+
+        old = [{"slot": s, "prioritizationFee": 1} for s in range(0, 100)]
+        new = [{"slot": s, "prioritizationFee": 50_000} for s in range(1000, 1100)]
+
+        async def run():
+            estimator.client = httpx.AsyncClient(transport=fee_transport([old, new]))
+            await estimator.sample()
+            await estimator.sample()
+            await estimator.close()
+
+        with patch.object(Config, "PRIORITY_FEE_WINDOW_SLOTS", 450):
+            asyncio.run(run())
+        # Slots that fell out of the window are dropped
+        self.assertEqual(min(estimator.fees), 1000)
+        self.assertEqual(estimator.estimate(), 50_000)
+
+        with patch.object(Config, "PRIORITY_FEE_MAX", 10_000):
+            self.assertEqual(estimator.estimate(), 10_000)
+        estimator.strategy = PriorityFeeEstimator.CAP
+        self.assertEqual(estimator.estimate(), Config.PRIORITY_FEE_MAX)
+
+    def test_scheduled_sample_filters_on_our_writable_accounts(self):
+        params = []
+
+        async def handler(request):
+            params.append(json.loads(request.content)["params"])
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": 1, "result": []})
+
+        vault = str(Keypair().pubkey())
+        with patch.object(Config, "TAX_VAULT_ADDRESS", vault):
+            engine = BotEngine.__new__(BotEngine)
+            engine.running = True
+            engine.solana = SolanaClient()
+            engine.solana.keypair = Keypair()
+            job = next(job for job in engine.build_scheduler().jobs if job.name == "priority_fees")
+
+        async def run():
+            engine.solana.fees.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            await job.func()
+            await engine.solana.fees.close()
+
+        asyncio.run(run())
+        accounts = params[0][0]
+        self.assertEqual(accounts[:2], [str(engine.solana.keypair.pubkey()), vault])
+        self.assertTrue(set(Config.PRIORITY_FEE_ACCOUNTS) <= set(accounts))
+
+class TestBlockhashCache(unittest.TestCase):
+
+    def test_signing_uses_prefetched_blockhash(self):
+        async def run():
+            solana = SolanaClient()
+            solana.client = rpc = FakeRpc()
+            solana.blockhashes = BlockhashCache(rpc)
+            solana.keypair = Keypair()
+            await solana.blockhashes.refresh()
+            ok = await solana.transfer_sol(str(Keypair().pubkey()), 0.5)
+            return ok, rpc, solana
+
+        ok, rpc, solana = asyncio.run(run())
+        self.assertTrue(ok)
+        self.assertEqual(rpc.blockhash_calls, 1)
+        txn = rpc.sent[0]
+        self.assertEqual(txn.message.recent_blockhash, solana.blockhashes.blockhash)
+        txn.verify()
+        self.assertEqual(len(txn.message.instructions), 3)
+        self.assertAlmostEqual(solana.ledger.entries[0].amount, -(0.5 + Config.TX_BASE_FEE_SOL), places=6)
+
+    def test_stale_blockhash_is_fetched_inline(self):
+        cache = BlockhashCache(FakeRpc())
+
+        async def run():
+            first = await cache.get()
+            cache.fetched_at -= Config.BLOCKHASH_MAX_AGE + 1
+            second = await cache.get()
+            return first, second
+
+        first, second = asyncio.run(run())
+        self.assertNotEqual(first[0], second[0])
+        self.assertEqual(second[1], 1002)
+
+if __name__ == '__main__':
+    unittest.main()